@@ -0,0 +1,129 @@
+#! /usr/bin/env python3
+"""Benchmark the computation of the passing density.
+
+Compares the prefix sum based computation of the passing density with the
+former implementation iterating over all pedestrians and scanning all frames.
+
+Run from the repository root with:
+
+    python -m benchmarks.benchmark_passing_density --peds 5000 --frames 50000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from pedpy.column_identifier import (
+    DENSITY_COL,
+    FIRST_FRAME_COL,
+    FRAME_COL,
+    ID_COL,
+    LAST_FRAME_COL,
+)
+from pedpy.methods.density_calculator import compute_passing_density
+
+
+def setup_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--peds",
+        type=int,
+        default=1000,
+        help="number of pedestrians passing the measurement area",
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=10000,
+        help="number of frames with a density",
+    )
+    parser.add_argument(
+        "--max-passing-frames",
+        type=int,
+        default=500,
+        help="maximal number of frames a pedestrian needs to pass the area",
+    )
+    parser.add_argument(
+        "--missing-frames",
+        type=float,
+        default=0.01,
+        help="fraction of frames missing in the density per frame",
+    )
+    return parser
+
+
+def compute_passing_density_iterrows(
+    *, density_per_frame: pd.DataFrame, frames: pd.DataFrame
+) -> pd.DataFrame:
+    """Former implementation of compute_passing_density."""
+    density = pd.DataFrame(frames.id, columns=[ID_COL, DENSITY_COL])
+
+    densities = []
+    for _, row in frames.iterrows():
+        densities.append(
+            density_per_frame[
+                density_per_frame.index.to_series().between(
+                    int(row.entering_frame),
+                    int(row.leaving_frame),
+                    inclusive="left",
+                )
+            ].mean()
+        )
+    density.density = np.array(densities)
+    return density
+
+
+def main() -> None:
+    args = setup_arg_parser().parse_args()
+    rng = np.random.default_rng(0)
+
+    frame_values = np.arange(args.frames)
+    frame_values = frame_values[
+        rng.uniform(size=args.frames) >= args.missing_frames
+    ]
+    density_per_frame = pd.DataFrame(
+        {
+            FRAME_COL: frame_values,
+            DENSITY_COL: rng.uniform(0.0, 4.0, size=len(frame_values)),
+        }
+    ).set_index(FRAME_COL)
+
+    entering_frames = rng.integers(0, args.frames, size=args.peds)
+    frames = pd.DataFrame(
+        {
+            ID_COL: np.arange(args.peds),
+            FIRST_FRAME_COL: entering_frames,
+            LAST_FRAME_COL: entering_frames
+            + rng.integers(1, args.max_passing_frames, size=args.peds),
+        }
+    )
+
+    print(f"{'method':>10} {'time (s)':>10} {'speedup':>8}")
+    results = {}
+    durations = {}
+    for name, method in [
+        ("iterrows", compute_passing_density_iterrows),
+        ("prefix sum", compute_passing_density),
+    ]:
+        start = time.perf_counter()
+        results[name] = method(
+            density_per_frame=density_per_frame, frames=frames
+        )
+        durations[name] = time.perf_counter() - start
+        print(
+            f"{name:>10} {durations[name]:>10.2f} "
+            f"{durations['iterrows'] / durations[name]:>8.2f}"
+        )
+
+    if not np.allclose(
+        results["iterrows"][DENSITY_COL].to_numpy(dtype=np.float64),
+        results["prefix sum"][DENSITY_COL],
+        equal_nan=True,
+    ):
+        raise RuntimeError("Results of the methods differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#! /usr/bin/env python3
+"""Benchmark the parallel computation of the individual Voronoi polygons.
+
+Run from the repository root with:
+
+    python -m benchmarks.benchmark_voronoi --workers 1 2 4 8
+"""
+
+import argparse
+import time
+
+import numpy as np
+import shapely
+
+from helper.create_trajectories import get_grid_trajectory
+from pedpy.data.geometry import WalkableArea
+from pedpy.data.trajectory_data import TrajectoryData
+from pedpy.methods.method_utils import compute_individual_voronoi_polygons
+
+
+def setup_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--shape",
+        nargs=2,
+        type=int,
+        default=[10, 20],
+        help="shape of the pedestrian grid [#rows #cols]",
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=1000,
+        help="number of frames in the trajectory",
+    )
+    parser.add_argument(
+        "--workers",
+        nargs="+",
+        type=int,
+        default=[1, 2, 4, 8],
+        help="number of worker processes to benchmark",
+    )
+    return parser
+
+
+def main() -> None:
+    args = setup_arg_parser().parse_args()
+
+    traj_data = TrajectoryData(
+        data=get_grid_trajectory(
+            shape=args.shape,
+            start_position=np.array([-10.0, -5.0]),
+            movement_direction=np.array([0.01, 0.0]),
+            ped_distance=0.8,
+            random_ids=False,
+            number_frames=args.frames,
+        ),
+        frame_rate=25.0,
+    )
+    walkable_area = WalkableArea(
+        [(-20.0, -20.0), (40.0, -20.0), (40.0, 40.0), (-20.0, 40.0)]
+    )
+
+    reference = None
+    reference_time = None
+    print(f"{'workers':>8} {'time (s)':>10} {'speedup':>8}")
+    for n_workers in args.workers:
+        start = time.perf_counter()
+        result = compute_individual_voronoi_polygons(
+            traj_data=traj_data,
+            walkable_area=walkable_area,
+            n_workers=n_workers,
+        )
+        duration = time.perf_counter() - start
+
+        if reference is None:
+            reference = result
+            reference_time = duration
+        elif not shapely.equals_exact(
+            reference.polygon.values, result.polygon.values, tolerance=0
+        ).all():
+            raise RuntimeError(f"Result differs for n_workers={n_workers}")
+
+        print(
+            f"{n_workers:>8} {duration:>10.2f} {reference_time / duration:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,29 +2,56 @@
 """Top level imports, for easier usage."""
 from . import _version
 from .data.geometry import MeasurementArea, MeasurementLine, WalkableArea
-from .data.trajectory_data import TrajectoryData
-from .io.trajectory_loader import TrajectoryUnit, load_trajectory
+from .data.trajectory_data import TrajectoryChunk, TrajectoryData
+from .io.binary_trajectory_loader import (
+    load_trajectory_from_binary,
+    write_trajectory_to_binary,
+)
+from .io.hdf5_trajectory_loader import load_trajectory_from_hdf5
+from .io.trajectory_loader import load_trajectory, load_trajectory_chunks
+from .io.trajectory_meta_data import TrajectoryUnit
+from .methods.analysis_cache import AnalysisCache
 from .methods.density_calculator import (
+    OnlineVoronoiDensity,
     compute_classic_density,
+    compute_classic_density_chunked,
+    compute_classic_density_multi,
     compute_passing_density,
     compute_voronoi_density,
+    compute_voronoi_density_multi,
+)
+from .methods.flow_calculator import (
+    compute_flow,
+    compute_n_t,
+    compute_n_t_chunked,
+    compute_n_t_multi,
 )
-from .methods.flow_calculator import compute_flow, compute_n_t
 from .methods.method_utils import (
     Cutoff,
+    NeighborList,
     compute_frame_range_in_area,
     compute_individual_voronoi_polygons,
     compute_intersecting_polygons,
+    compute_neighbor_list,
     compute_neighbors,
     compute_time_distance_line,
     get_invalid_trajectory,
     is_trajectory_valid,
 )
-from .methods.profile_calculator import SpeedMethod, compute_profiles
+from .methods.profile_calculator import (
+    GridIntersectionMethod,
+    ProfileAccumulator,
+    ProfileGrid,
+    ProfileStatistics,
+    SpeedMethod,
+    compute_profile_statistics,
+    compute_profiles,
+)
 from .methods.speed_calculator import (
     SpeedCalculation,
     compute_individual_speed,
     compute_mean_speed_per_frame,
+    compute_mean_speed_per_frame_multi,
     compute_passing_speed,
     compute_voronoi_speed,
 )
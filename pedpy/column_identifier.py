@@ -25,8 +25,16 @@ MEAN_SPEED_COL: Final = "mean_speed"
 FIRST_FRAME_COL: Final = "entering_frame"
 LAST_FRAME_COL: Final = "leaving_frame"
 NEIGHBORS_COL: Final = "neighbors"
+MEAN_NEIGHBORS_COL: Final = "mean_neighbors"
+MIN_NEIGHBORS_COL: Final = "min_neighbors"
+MAX_NEIGHBORS_COL: Final = "max_neighbors"
 DISTANCE_COL: Final = "distance"
 CROSSING_FRAME_COL: Final = "crossing_frame"
-START_POSITION_COL: Final = "start_position"
-END_POSITION_COL: Final = "end_position"
+LINE_COL: Final = "line"
+AREA_COL: Final = "area"
+DIRECTION_COL: Final = "direction"
+START_X_COL: Final = "start_x"
+START_Y_COL: Final = "start_y"
+END_X_COL: Final = "end_x"
+END_Y_COL: Final = "end_y"
 WINDOW_SIZE_COL: Final = "window_size"
@@ -3,6 +3,8 @@
 from dataclasses import dataclass
 from typing import Any, List, Optional
 
+import numpy as np
+import numpy.typing as npt
 import shapely
 
 
@@ -123,9 +125,16 @@ class MeasurementArea:
 
     A measurement area is defined as an area, which is convex, simple, and
     covers a non-zero area.
+
+    As the area is convex, it is the intersection of the half-planes left of
+    its edges in counter-clockwise order. This representation is computed on
+    construction and allows to check whether positions are inside the area
+    without creating geometry objects.
     """
 
     _polygon: shapely.Polygon
+    _half_planes: npt.NDArray[np.float64]
+    _is_rectangle: bool
     _frozen = False
 
     def __init__(self, coordinates: Any):
@@ -162,6 +171,17 @@ class MeasurementArea:
             raise GeometryError("Measurement areas needs to be convex.")
 
         shapely.prepare(self._polygon)
+
+        vertices = np.asarray(
+            shapely.geometry.polygon.orient(self._polygon).exterior.coords
+        )
+        edges = np.concatenate((vertices[:-1], vertices[1:]), axis=1)
+        edges = edges[(edges[:, :2] != edges[:, 2:]).any(axis=1)]
+        edges.flags.writeable = False
+        self._half_planes = edges
+        self._is_rectangle = bool(
+            ((edges[:, 0] == edges[:, 2]) | (edges[:, 1] == edges[:, 3])).all()
+        )
         self._frozen = True
 
     def __setattr__(self, attr, value):
@@ -204,6 +224,30 @@ class MeasurementArea:
         """
         return self._polygon
 
+    @property
+    def half_planes(self) -> npt.NDArray[np.float64]:
+        """Edges of the measurement area in counter-clockwise order.
+
+        The measurement area is the intersection of the half-planes left of
+        these edges.
+
+        Returns:
+            Read-only array of shape (N, 4) containing the start and end point
+            of each edge as (start_x, start_y, end_x, end_y)
+        """
+        return self._half_planes
+
+    @property
+    def is_rectangle(self) -> bool:
+        """Whether the measurement area is an axis-aligned rectangle.
+
+        In this case, the measurement area is given by its bounds.
+
+        Returns:
+            True if the measurement area is an axis-aligned rectangle
+        """
+        return self._is_rectangle
+
 
 ###############################################################################
 # Measurement Line
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+from dataclasses import dataclass, field
+from typing import Optional
 
+import numpy as np
+import numpy.typing as npt
 import pandas
 import shapely
 
-from pedpy.column_identifier import POINT_COL
+from pedpy.column_identifier import FRAME_COL, ID_COL, POINT_COL, X_COL, Y_COL
 
 
 @dataclass(frozen=True)
@@ -19,43 +23,161 @@ class TrajectoryData:
     Note:
         The coordinate data is stored in meter ('m')!
 
+    By default, the current position of each pedestrian is added as
+    :class:`shapely.Point` in the column "point" to :attr:`data`. For large
+    data sets these objects need a multiple of the memory of the actual
+    coordinates. When creating the trajectory data with
+    :code:`lazy_points=True`, :attr:`data` only consists of the columns "id",
+    "frame" (as int64), "x", and "y" (as float64), each backed by a contiguous
+    NumPy array. Columns which already have the correct type are not copied.
+    The points are then only created when accessing :attr:`points`. All
+    analysis methods work directly on the coordinates and do not need the
+    points.
+
     Args:
         data (pandas.DataFrame): data frame containing the data in the form:
             "id", "frame", "x", "y"
         frame_rate (float): frame rate of the trajectory file
+        lazy_points (bool): if True, only store the columns "id", "frame",
+            "x", "y", and create the points only on demand (default: False)
 
     Attributes:
         data (pandas.DataFrame): data frame containing the trajectory data with the
-            columns: "id", "frame", "x", "y", "point"
+            columns: "id", "frame", "x", "y", "point" ("point" only if
+            :attr:`lazy_points` is False)
         frame_rate (float): frame rate of the trajectory data
+        lazy_points (bool): whether the points are only created on demand
     """
 
     data: pandas.DataFrame
     frame_rate: float
+    lazy_points: bool = False
+    _points: Optional[npt.NDArray[np.object_]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _content_hash: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         """Adds a column with the position to :attr:`data`.
 
         The current position of the pedestrian in the row is added as a
         :class:`shapely.Point` to :attr:`data`, allowing easier geometrical
-        computations directly.
+        computations directly. If :attr:`lazy_points` is set, :attr:`data` is
+        reduced to the coordinate columns instead.
         """
-        data = self.data.copy(deep=True)
-        data.loc[:, POINT_COL] = shapely.points(data.x, data.y)
+        if self.lazy_points:
+            data = pandas.DataFrame(
+                {
+                    ID_COL: np.ascontiguousarray(
+                        self.data[ID_COL], dtype=np.int64
+                    ),
+                    FRAME_COL: np.ascontiguousarray(
+                        self.data[FRAME_COL], dtype=np.int64
+                    ),
+                    X_COL: np.ascontiguousarray(
+                        self.data[X_COL], dtype=np.float64
+                    ),
+                    Y_COL: np.ascontiguousarray(
+                        self.data[Y_COL], dtype=np.float64
+                    ),
+                },
+                index=self.data.index,
+                copy=False,
+            )
+        else:
+            data = self.data.copy(deep=True)
+            data.loc[:, POINT_COL] = shapely.points(data.x, data.y)
         object.__setattr__(self, "data", data)
 
+    @property
+    def points(self) -> npt.NDArray[np.object_]:
+        """Position of the pedestrian in each row as :class:`shapely.Point`.
+
+        If :attr:`lazy_points` is set, the points are created on the first
+        access.
+
+        Returns:
+            Array of :class:`shapely.Point` in the same order as :attr:`data`
+        """
+        if not self.lazy_points:
+            return self.data[POINT_COL].values
+
+        points = self._points
+        if points is None:
+            points = shapely.points(self.data[X_COL], self.data[Y_COL])
+            object.__setattr__(self, "_points", points)
+        return points
+
+    @property
+    def content_hash(self) -> str:
+        """Hash of the frame rate and the columns "id", "frame", "x", and "y".
+
+        Identifies the content of the trajectory data, e.g., for caching
+        results computed from it. The hash is computed on the first access,
+        later modifications of :attr:`data` are not reflected.
+
+        Returns:
+            Hexadecimal digest of the hash
+        """
+        content_hash = self._content_hash
+        if content_hash is None:
+            hash_object = hashlib.blake2b(digest_size=20)
+            hash_object.update(np.float64(self.frame_rate).tobytes())
+            for column, dtype in [
+                (ID_COL, np.int64),
+                (FRAME_COL, np.int64),
+                (X_COL, np.float64),
+                (Y_COL, np.float64),
+            ]:
+                hash_object.update(
+                    np.ascontiguousarray(self.data[column], dtype=dtype).data
+                )
+            content_hash = hash_object.hexdigest()
+            object.__setattr__(self, "_content_hash", content_hash)
+        return content_hash
+
     def __repr__(self):
         """String representation for TrajectoryData object.
 
         Returns:
             string representation for TrajectoryData object
         """
+        bounds = (
+            self.data.x.min(),
+            self.data.y.min(),
+            self.data.x.max(),
+            self.data.y.max(),
+        )
         message = f"""TrajectoryData:
         frame rate: {self.frame_rate}
         frames: [{self.data.frame.min(), self.data.frame.max()}]
         number pedestrians: {self.data.id.unique().size}
-        bounding box: {shapely.MultiPoint(self.data.point).bounds}
+        bounding box: {bounds}
         data: 
         {self.data.head(10)}
         """
         return message
+
+
+@dataclass(frozen=True)
+class TrajectoryChunk:
+    """Block of trajectory data covering a contiguous range of frames.
+
+    Chunks are created by :func:`load_trajectory_chunks`. Each chunk is
+    responsible for the frames from :attr:`first_frame` to :attr:`last_frame`
+    (both inclusive). Besides these frames, :attr:`traj_data` may contain
+    overlapping frames before and after, which are needed to compute
+    windowed quantities, e.g., speeds, exactly at the edges of the chunk.
+
+    Attributes:
+        traj_data (TrajectoryData): trajectory data of the chunk including the
+            overlapping frames
+        first_frame (int): first frame the chunk is responsible for
+        last_frame (int): last frame the chunk is responsible for
+    """
+
+    traj_data: TrajectoryData
+    first_frame: int
+    last_frame: int
@@ -0,0 +1,239 @@
+"""Load and write trajectories in the binary trajectory format."""
+
+import pathlib
+import struct
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from pedpy.column_identifier import FRAME_COL, ID_COL, X_COL, Y_COL
+from pedpy.data.trajectory_data import TrajectoryChunk, TrajectoryData
+from pedpy.io.trajectory_meta_data import TrajectoryUnit
+
+# Layout of the binary trajectory format (little endian):
+#   header: magic, version, unit, frame rate, bounds (min x, min y, max x,
+#           max y), number of rows, number of frames
+#   data:   id (int64), frame (int64), x (float64), y (float64), one value
+#           per row, the rows are sorted by frame
+#   index:  frames (int64), one value per frame, and offsets (int64) of the
+#           first row of each frame, with one additional value for the end
+_BINARY_MAGIC = b"PEDPYTRJ"
+_BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct("<8sIiddddd2Q")
+# the coordinates are always written in meter, identified by the value of
+# TrajectoryUnit.METER
+_BINARY_UNIT = 1
+
+
+def load_trajectory_from_binary(
+    *,
+    trajectory_file: pathlib.Path,
+    frame_range: Optional[Tuple[int, int]] = None,
+) -> TrajectoryData:
+    """Loads a binary trajectory file in the :class:`TrajectoryData` format.
+
+    The file needs to be written by :func:`write_trajectory_to_binary`. It
+    contains the frame rate and unit in its header, followed by the raw
+    id/frame/x/y arrays sorted by frame and a table with the offset of each
+    frame. The arrays are memory mapped instead of read, hence opening the
+    file is independent of its size. Only the parts of the file which are
+    actually accessed are loaded into memory. With :code:`frame_range` only
+    the rows of the given frames are selected via the offset table.
+
+    The returned :class:`TrajectoryData` is created with
+    :code:`lazy_points=True`, such that the coordinates are not copied from
+    the memory mapped file.
+
+    Args:
+        trajectory_file (pathlib.Path): binary file containing the trajectory
+        frame_range (Tuple[int, int]): first and last frame (both inclusive)
+            which should be loaded, None if all frames should be loaded
+
+    Returns:
+        :class:`TrajectoryData` representation of the file data
+    """
+    header = _read_binary_header(trajectory_file=trajectory_file)
+    num_rows = header["num_rows"]
+    num_frames = header["num_frames"]
+
+    def memmap(dtype: str, offset: int, shape: int) -> npt.NDArray[Any]:
+        if shape == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(
+            trajectory_file, dtype=dtype, mode="r", offset=offset, shape=shape
+        )
+
+    column_offsets = _BINARY_HEADER.size + 8 * num_rows * np.arange(4)
+    index_offset = _BINARY_HEADER.size + 8 * num_rows * 4
+    frames = memmap("<i8", index_offset, num_frames)
+    frame_offsets = memmap("<i8", index_offset + 8 * num_frames, num_frames + 1)
+
+    rows = slice(0, num_rows)
+    if frame_range is not None:
+        rows = slice(
+            int(frame_offsets[np.searchsorted(frames, frame_range[0])]),
+            int(
+                frame_offsets[
+                    np.searchsorted(frames, frame_range[1], side="right")
+                ]
+            ),
+        )
+
+    data = pd.DataFrame(
+        {
+            column: memmap(dtype, int(offset), num_rows)[rows]
+            for column, dtype, offset in zip(
+                (ID_COL, FRAME_COL, X_COL, Y_COL),
+                ("<i8", "<i8", "<f8", "<f8"),
+                column_offsets,
+            )
+        },
+        copy=False,
+    )
+
+    if header["unit"] == TrajectoryUnit.CENTIMETER:
+        data.x = data.x.div(100)
+        data.y = data.y.div(100)
+
+    return TrajectoryData(
+        data=data, frame_rate=header["frame_rate"], lazy_points=True
+    )
+
+
+def write_trajectory_to_binary(
+    *, traj_data: TrajectoryData, trajectory_file: pathlib.Path
+) -> None:
+    """Writes the trajectory data to a binary trajectory file.
+
+    The file can be loaded again with
+    :func:`~trajectory_loader.load_trajectory` or
+    :func:`load_trajectory_from_binary`. Loading binary files is considerably
+    faster than parsing text files, hence it is suggested to convert large
+    trajectory files once and use the binary file in further analyses.
+
+    Args:
+        traj_data (TrajectoryData): trajectory data to write
+        trajectory_file (pathlib.Path): file the trajectory data is written to
+    """
+    data = traj_data.data
+    order = np.argsort(data.frame.values, kind="stable")
+    frames, frame_offsets = np.unique(
+        data.frame.values[order], return_index=True
+    )
+
+    header = _BINARY_HEADER.pack(
+        _BINARY_MAGIC,
+        _BINARY_VERSION,
+        _BINARY_UNIT,
+        traj_data.frame_rate,
+        data.x.min(),
+        data.y.min(),
+        data.x.max(),
+        data.y.max(),
+        len(data.index),
+        len(frames),
+    )
+
+    with open(trajectory_file, "wb") as binary_file:
+        binary_file.write(header)
+        for values, dtype in (
+            (data.id.values[order], "<i8"),
+            (data.frame.values[order], "<i8"),
+            (data.x.values[order], "<f8"),
+            (data.y.values[order], "<f8"),
+            (frames, "<i8"),
+            (np.append(frame_offsets, len(data.index)), "<i8"),
+        ):
+            np.ascontiguousarray(values, dtype=dtype).tofile(binary_file)
+
+
+def _read_binary_header(*, trajectory_file: pathlib.Path) -> Dict[str, Any]:
+    """Read the header of a binary trajectory file.
+
+    Args:
+        trajectory_file (pathlib.Path): binary file containing the trajectory
+
+    Returns:
+        Dictionary containing the 'frame_rate', 'unit', 'bounds', 'num_rows',
+        and 'num_frames' of the file
+    """
+    with open(trajectory_file, "rb") as file_content:
+        header = file_content.read(_BINARY_HEADER.size)
+
+    if (
+        len(header) != _BINARY_HEADER.size
+        or header[: len(_BINARY_MAGIC)] != _BINARY_MAGIC
+    ):
+        raise ValueError(
+            "The given trajectory file is not a valid binary trajectory file. "
+            f"Please check your trajectory file: {trajectory_file}."
+        )
+
+    (
+        _,
+        version,
+        unit,
+        frame_rate,
+        min_x,
+        min_y,
+        max_x,
+        max_y,
+        num_rows,
+        num_frames,
+    ) = _BINARY_HEADER.unpack(header)
+
+    if version != _BINARY_VERSION:
+        raise ValueError(
+            f"The binary trajectory file has the version {version}, but only "
+            f"version {_BINARY_VERSION} is supported. "
+            f"Please check your trajectory file: {trajectory_file}."
+        )
+
+    return {
+        "frame_rate": frame_rate,
+        "unit": TrajectoryUnit(unit),
+        "bounds": (min_x, min_y, max_x, max_y),
+        "num_rows": num_rows,
+        "num_frames": num_frames,
+    }
+
+
+def _iter_binary_trajectory_chunks(
+    *,
+    trajectory_file: pathlib.Path,
+    frames_per_chunk: int,
+    overlap_frames: int,
+) -> Iterator[TrajectoryChunk]:
+    """Create the chunks of a binary trajectory file.
+
+    Args:
+        trajectory_file (pathlib.Path): binary file containing the trajectory
+        frames_per_chunk (int): number of frames each chunk is responsible for
+        overlap_frames (int): number of frames added before and after each
+            chunk
+
+    Returns:
+        Iterator over the :class:`TrajectoryChunk` of the file
+    """
+    traj_data = load_trajectory_from_binary(trajectory_file=trajectory_file)
+    frames = traj_data.data[FRAME_COL].values
+    if frames.size == 0:
+        return
+
+    for chunk_start in range(frames[0], frames[-1] + 1, frames_per_chunk):
+        chunk_end = min(chunk_start + frames_per_chunk - 1, frames[-1])
+        first_row = np.searchsorted(frames, chunk_start - overlap_frames)
+        last_row = np.searchsorted(
+            frames, chunk_end + overlap_frames, side="right"
+        )
+        yield TrajectoryChunk(
+            traj_data=TrajectoryData(
+                data=traj_data.data.iloc[first_row:last_row],
+                frame_rate=traj_data.frame_rate,
+                lazy_points=True,
+            ),
+            first_frame=int(chunk_start),
+            last_frame=int(chunk_end),
+        )
@@ -0,0 +1,275 @@
+"""Load trajectories from HDF5 files."""
+
+import pathlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from pedpy.column_identifier import FRAME_COL, ID_COL, X_COL, Y_COL
+from pedpy.data.trajectory_data import TrajectoryData
+from pedpy.io.trajectory_meta_data import (
+    TrajectoryUnit,
+    _validate_trajectory_meta_data,
+)
+
+_HDF5_SIGNATURE = b"\x89HDF\r\n\x1a\n"
+_HDF5_DATASET = "trajectory"
+_HDF5_FRAME_RATE_ATTRIBUTES = ("fps", "frame_rate", "framerate")
+
+
+def load_trajectory_from_hdf5(  # pylint: disable=too-many-arguments
+    *,
+    trajectory_file: pathlib.Path,
+    frame_range: Optional[Tuple[int, int]] = None,
+    ids: Optional[npt.ArrayLike] = None,
+    default_frame_rate: Optional[float] = None,
+    default_unit: Optional[TrajectoryUnit] = None,
+    chunk_size: int = 100_000,
+) -> TrajectoryData:
+    """Loads an HDF5 trajectory file in the :class:`TrajectoryData` format.
+
+    The trajectory is either stored in a compound dataset "trajectory" with
+    the fields "id", "frame", "x", "y" (and optionally further fields, which
+    are ignored), or in the one-dimensional datasets "id", "frame", "x", "y"
+    in the root of the file.
+
+    The frame rate is taken from the attribute "fps" (or "frame_rate",
+    "framerate") of the dataset or the file. The unit is taken from the
+    attribute "unit" or from the description of the x-coordinate, e.g.,
+    "pedestrian x-coordinate (meter [m])". If the file does not contain
+    these data, defaults can be submitted.
+
+    The file is read in chunks of :code:`chunk_size` rows. If a
+    :code:`frame_range` or :code:`ids` are given, only the frame and id
+    columns are read completely, the coordinates are only read for the rows
+    matching the selection. Hence, analysing a time window of a large
+    recording does not require loading the whole recording.
+
+    Note:
+        This function requires the optional dependency :code:`h5py`.
+
+    Args:
+        trajectory_file (pathlib.Path): HDF5 file containing the trajectory
+        frame_range (Tuple[int, int]): first and last frame (both inclusive)
+            which should be loaded, None if all frames should be loaded
+        ids (npt.ArrayLike): ids of the pedestrians which should be loaded,
+            None if all pedestrians should be loaded
+        default_frame_rate (float): frame rate of the file, None if frame rate
+            from file is used
+        default_unit (TrajectoryUnit): unit in which the coordinates are stored
+                in the file, None if unit should be parsed from the file
+        chunk_size (int): number of rows read at once
+
+    Returns:
+        :class:`TrajectoryData` representation of the file data
+    """
+    h5py = _import_h5py()
+
+    with h5py.File(trajectory_file, "r") as hdf5_file:
+        num_rows, columns, attributes, unit_descriptions = _get_hdf5_columns(
+            hdf5_file=hdf5_file, trajectory_file=trajectory_file
+        )
+
+        frame_rate, unit = _validate_trajectory_meta_data(
+            trajectory_file=trajectory_file,
+            parsed_frame_rate=_parse_hdf5_frame_rate(attributes=attributes),
+            parsed_unit=_parse_hdf5_unit(unit_descriptions=unit_descriptions),
+            default_frame_rate=default_frame_rate,
+            default_unit=default_unit,
+        )
+
+        data = _read_hdf5_rows(
+            columns=columns,
+            num_rows=num_rows,
+            frame_range=frame_range,
+            ids=ids,
+            chunk_size=chunk_size,
+        )
+
+    if unit == TrajectoryUnit.CENTIMETER:
+        data.x = data.x.div(100)
+        data.y = data.y.div(100)
+
+    return TrajectoryData(data=data, frame_rate=frame_rate)
+
+
+def _get_hdf5_columns(
+    *, hdf5_file: Any, trajectory_file: pathlib.Path
+) -> Tuple[int, Dict[str, Any], List[Any], List[Any]]:
+    """Get the trajectory columns and their metadata from the HDF5 file.
+
+    Args:
+        hdf5_file (Any): opened HDF5 file (:class:`h5py.File`)
+        trajectory_file (pathlib.Path): HDF5 file containing the trajectory
+
+    Returns:
+        Tuple containing the number of rows, sliceable objects for each
+        column, the attributes which may contain the frame rate, and the
+        descriptions of the unit, both in order of precedence
+    """
+    if _HDF5_DATASET in hdf5_file:
+        dataset: Any = hdf5_file[_HDF5_DATASET]
+        return (
+            dataset.shape[0],
+            {
+                column: dataset.fields(column)
+                for column in (ID_COL, FRAME_COL, X_COL, Y_COL)
+            },
+            [dataset.attrs, hdf5_file.attrs],
+            [dataset.attrs.get("unit"), dataset.attrs.get(X_COL)],
+        )
+
+    if all(column in hdf5_file for column in (ID_COL, FRAME_COL, X_COL, Y_COL)):
+        return (
+            hdf5_file[ID_COL].shape[0],
+            {
+                column: hdf5_file[column]
+                for column in (ID_COL, FRAME_COL, X_COL, Y_COL)
+            },
+            [hdf5_file.attrs],
+            [hdf5_file.attrs.get("unit"), hdf5_file[X_COL].attrs.get("unit")],
+        )
+
+    raise ValueError(
+        "The given HDF5 file does not contain trajectory data. It should "
+        f"contain either a compound dataset '{_HDF5_DATASET}' with the fields "
+        "id, frame, x, y, or the datasets id, frame, x, y. "
+        f"Please check your trajectory file: {trajectory_file}."
+    )
+
+
+def _import_h5py() -> Any:
+    """Import the optional dependency h5py.
+
+    Returns:
+        The h5py module
+    """
+    try:
+        import h5py  # type: ignore # pylint: disable=import-outside-toplevel
+    except ImportError as exc:
+        raise ImportError(
+            "Loading HDF5 trajectory files requires the optional dependency "
+            "'h5py'. Please install it, e.g., with 'pip install h5py'."
+        ) from exc
+    return h5py
+
+
+def _read_hdf5_rows(
+    *,
+    columns: Dict[str, Any],
+    num_rows: int,
+    frame_range: Optional[Tuple[int, int]],
+    ids: Optional[npt.ArrayLike],
+    chunk_size: int,
+) -> pd.DataFrame:
+    """Read the selected rows of the trajectory columns chunk wise.
+
+    For each chunk the frame and id columns are read if needed for the
+    selection, the remaining columns are only read from the first to the last
+    selected row of the chunk.
+
+    Args:
+        columns (Dict[str, Any]): sliceable objects for each column
+        num_rows (int): number of rows in the file
+        frame_range (Tuple[int, int]): first and last frame (both inclusive)
+            which should be loaded, None if all frames should be loaded
+        ids (npt.ArrayLike): ids of the pedestrians which should be loaded,
+            None if all pedestrians should be loaded
+        chunk_size (int): number of rows read at once
+
+    Returns:
+        DataFrame containing the selected rows
+    """
+    dtypes = {
+        ID_COL: np.int64,
+        FRAME_COL: np.int64,
+        X_COL: np.float64,
+        Y_COL: np.float64,
+    }
+    selected: Dict[str, List[npt.NDArray[Any]]] = {
+        column: [] for column in columns
+    }
+
+    for start in range(0, num_rows, chunk_size):
+        stop = min(start + chunk_size, num_rows)
+        chunk = {}
+        mask = np.ones(stop - start, dtype=bool)
+
+        if frame_range is not None:
+            chunk[FRAME_COL] = columns[FRAME_COL][start:stop]
+            mask &= (chunk[FRAME_COL] >= frame_range[0]) & (
+                chunk[FRAME_COL] <= frame_range[1]
+            )
+        if ids is not None:
+            chunk[ID_COL] = columns[ID_COL][start:stop]
+            mask &= np.isin(chunk[ID_COL], ids)
+
+        rows = np.flatnonzero(mask)
+        if rows.size == 0:
+            continue
+        first, last = rows[0], rows[-1] + 1
+
+        for column, values in columns.items():
+            if column in chunk:
+                chunk_values = chunk[column][first:last]
+            else:
+                chunk_values = values[start + first : start + last]
+            selected[column].append(chunk_values[mask[first:last]])
+
+    return pd.DataFrame(
+        {
+            column: np.concatenate(
+                [np.empty(0, dtype=dtypes[column])] + values
+            ).astype(dtypes[column], copy=False)
+            for column, values in selected.items()
+        }
+    )
+
+
+def _parse_hdf5_frame_rate(*, attributes: List[Any]) -> Optional[float]:
+    """Get the frame rate from the attributes of the HDF5 file.
+
+    Args:
+        attributes (List[Any]): attributes to check, in order of precedence
+
+    Returns:
+        The frame rate, None if no frame rate is found
+    """
+    for attribute in attributes:
+        for name in _HDF5_FRAME_RATE_ATTRIBUTES:
+            if name in attribute:
+                return float(attribute[name])
+    return None
+
+
+def _parse_hdf5_unit(*, unit_descriptions: List[Any]) -> Any:
+    """Get the unit from descriptions found in the HDF5 file.
+
+    Args:
+        unit_descriptions (List[Any]): descriptions of the unit, e.g., "m",
+            "centimeter", or "pedestrian x-coordinate (meter [m])", in order of
+            precedence
+
+    Returns:
+        The unit as :class:`TrajectoryUnit`, None if no unit is found
+    """
+    for description in unit_descriptions:
+        if description is None:
+            continue
+        if isinstance(description, bytes):
+            description = description.decode("utf-8")
+        description = str(description).lower()
+
+        if (
+            any(unit in description for unit in ("centimeter", "[cm]"))
+            or description.strip() == "cm"
+        ):
+            return TrajectoryUnit.CENTIMETER
+        if (
+            any(unit in description for unit in ("meter", "[m]"))
+            or description.strip() == "m"
+        ):
+            return TrajectoryUnit.METER
+    return None
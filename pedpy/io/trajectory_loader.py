@@ -1,21 +1,41 @@
 """Load trajectories to the internal trajectory data format."""
 
 import pathlib
-from typing import Any, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-from aenum import Enum
 
 from pedpy.column_identifier import FRAME_COL, ID_COL, X_COL, Y_COL
-from pedpy.data.trajectory_data import TrajectoryData
-
-
-class TrajectoryUnit(Enum):  # pylint: disable=too-few-public-methods
-    """Identifier of the unit of the trajectory coordinates."""
-
-    _init_ = "value __doc__"
-    METER = 1, "meter (m)"
-    CENTIMETER = 100, "centimeter (cm)"
+from pedpy.data.trajectory_data import TrajectoryChunk, TrajectoryData
+from pedpy.io.binary_trajectory_loader import (
+    _BINARY_MAGIC,
+    _iter_binary_trajectory_chunks,
+    _read_binary_header,
+    load_trajectory_from_binary,
+)
+from pedpy.io.hdf5_trajectory_loader import (
+    _HDF5_SIGNATURE,
+    load_trajectory_from_hdf5,
+)
+from pedpy.io.trajectory_meta_data import (
+    TrajectoryUnit,
+    _validate_trajectory_meta_data,
+)
+
+_TEXT_FILE_OPTIONS: Dict[str, Any] = {
+    "sep": r"\s+",
+    "comment": "#",
+    "header": None,
+    "names": [ID_COL, FRAME_COL, X_COL, Y_COL],
+    "usecols": [0, 1, 2, 3],
+    "dtype": {
+        ID_COL: "int64",
+        FRAME_COL: "int64",
+        X_COL: "float64",
+        Y_COL: "float64",
+    },
+}
 
 
 def load_trajectory(
@@ -30,6 +50,13 @@ def load_trajectory(
     trajectory from the given trajectory file. If the file does not contain
     some data, defaults can be submitted.
 
+    Besides whitespace separated text files, also HDF5 files (see
+    :func:`~hdf5_trajectory_loader.load_trajectory_from_hdf5`) and files in
+    the binary format written by
+    :func:`~binary_trajectory_loader.write_trajectory_to_binary` (see
+    :func:`~binary_trajectory_loader.load_trajectory_from_binary`) can be
+    loaded, the format is detected automatically.
+
     Args:
         trajectory_file (pathlib.Path): file containing the trajectory
         default_frame_rate (float): frame rate of the file, None if frame rate
@@ -46,6 +73,26 @@ def load_trajectory(
     if not trajectory_file.is_file():
         raise IOError(f"{trajectory_file} is not a file.")
 
+    file_signature = _read_file_signature(trajectory_file=trajectory_file)
+
+    if file_signature == _HDF5_SIGNATURE:
+        return load_trajectory_from_hdf5(
+            trajectory_file=trajectory_file,
+            default_frame_rate=default_frame_rate,
+            default_unit=default_unit,
+        )
+
+    if file_signature == _BINARY_MAGIC:
+        header = _read_binary_header(trajectory_file=trajectory_file)
+        _validate_trajectory_meta_data(
+            trajectory_file=trajectory_file,
+            parsed_frame_rate=header["frame_rate"],
+            parsed_unit=header["unit"],
+            default_frame_rate=default_frame_rate,
+            default_unit=default_unit,
+        )
+        return load_trajectory_from_binary(trajectory_file=trajectory_file)
+
     traj_frame_rate, traj_unit = _load_trajectory_meta_data(
         trajectory_file=trajectory_file,
         default_frame_rate=default_frame_rate,
@@ -73,20 +120,7 @@ def _load_trajectory_data(
         converted to meter (m).
     """
     try:
-        data = pd.read_csv(
-            trajectory_file,
-            sep=r"\s+",
-            comment="#",
-            header=None,
-            names=[ID_COL, FRAME_COL, X_COL, Y_COL],
-            usecols=[0, 1, 2, 3],
-            dtype={
-                ID_COL: "int64",
-                FRAME_COL: "int64",
-                X_COL: "float64",
-                Y_COL: "float64",
-            },
-        )
+        data = pd.read_csv(trajectory_file, **_TEXT_FILE_OPTIONS)
 
         if data.empty:
             raise ValueError(
@@ -112,7 +146,389 @@ def _load_trajectory_data(
         ) from exc
 
 
-def _load_trajectory_meta_data(  # pylint: disable=too-many-branches
+def load_trajectory_chunks(  # pylint: disable=too-many-arguments
+    *,
+    trajectory_file: pathlib.Path,
+    frames_per_chunk: int,
+    overlap_frames: int = 0,
+    default_frame_rate: Optional[float] = None,
+    default_unit: Optional[TrajectoryUnit] = None,
+    rows_per_read: int = 100_000,
+) -> Iterator[TrajectoryChunk]:
+    """Loads the trajectory file block wise as :class:`TrajectoryChunk`.
+
+    Instead of loading the whole trajectory file at once, the file is read
+    in blocks of :code:`frames_per_chunk` consecutive frames, starting at the
+    first frame of the file. The chunks cover all frames from the first to
+    the last frame of the file without gaps, chunks without any data are
+    yielded as well. Only the last chunk may contain fewer frames.
+
+    Each chunk additionally contains the :code:`overlap_frames` frames before
+    and after its frame range. When computing windowed quantities, like
+    speeds or movements with a given :code:`frame_step`, use
+    :code:`overlap_frames=frame_step`. Then the results for the frames of the
+    chunk are identical to the results computed on the complete trajectory.
+
+    Text files are read with :code:`rows_per_read` rows at once. The file is
+    scanned once for the frame range first. If the rows are sorted by frame,
+    the chunks are then created in a single pass over the file. Otherwise,
+    the file is scanned once per chunk, keeping only the rows of the chunk in
+    memory. For large files not sorted by frame, consider converting them
+    once with :func:`~binary_trajectory_loader.write_trajectory_to_binary`.
+    Binary files are sorted by frame and the chunks are directly selected
+    from the memory mapped file.
+
+    Args:
+        trajectory_file (pathlib.Path): file containing the trajectory
+        frames_per_chunk (int): number of frames each chunk is responsible for
+        overlap_frames (int): number of frames added before and after each
+            chunk
+        default_frame_rate (float): frame rate of the file, None if frame rate
+            from file is used
+        default_unit (TrajectoryUnit): unit in which the coordinates are stored
+                in the file, None if unit should be parsed from the file
+        rows_per_read (int): number of rows read at once from text files
+
+    Returns:
+        Iterator over the :class:`TrajectoryChunk` of the file. The arguments
+        and the metadata of the file are checked when calling this function,
+        the data is only read while iterating.
+    """
+    if not trajectory_file.exists():
+        raise IOError(f"{trajectory_file} does not exist.")
+
+    if not trajectory_file.is_file():
+        raise IOError(f"{trajectory_file} is not a file.")
+
+    if frames_per_chunk < 1:
+        raise ValueError(
+            "The number of frames per chunk needs to be positive, but is "
+            f"{frames_per_chunk}."
+        )
+
+    if overlap_frames < 0:
+        raise ValueError(
+            "The number of overlapping frames can not be negative, but is "
+            f"{overlap_frames}."
+        )
+
+    if _read_file_signature(trajectory_file=trajectory_file) == _BINARY_MAGIC:
+        header = _read_binary_header(trajectory_file=trajectory_file)
+        _validate_trajectory_meta_data(
+            trajectory_file=trajectory_file,
+            parsed_frame_rate=header["frame_rate"],
+            parsed_unit=header["unit"],
+            default_frame_rate=default_frame_rate,
+            default_unit=default_unit,
+        )
+        return _iter_binary_trajectory_chunks(
+            trajectory_file=trajectory_file,
+            frames_per_chunk=frames_per_chunk,
+            overlap_frames=overlap_frames,
+        )
+
+    frame_rate, unit = _load_trajectory_meta_data(
+        trajectory_file=trajectory_file,
+        default_frame_rate=default_frame_rate,
+        default_unit=default_unit,
+    )
+    return _iter_text_trajectory_chunks(
+        trajectory_file=trajectory_file,
+        frames_per_chunk=frames_per_chunk,
+        overlap_frames=overlap_frames,
+        frame_rate=frame_rate,
+        unit=unit,
+        rows_per_read=rows_per_read,
+    )
+
+
+def _iter_text_trajectory_chunks(  # pylint: disable=too-many-arguments
+    *,
+    trajectory_file: pathlib.Path,
+    frames_per_chunk: int,
+    overlap_frames: int,
+    frame_rate: float,
+    unit: TrajectoryUnit,
+    rows_per_read: int,
+) -> Iterator[TrajectoryChunk]:
+    """Create the chunks of a trajectory text file.
+
+    Args:
+        trajectory_file (pathlib.Path): file containing the trajectory
+        frames_per_chunk (int): number of frames each chunk is responsible for
+        overlap_frames (int): number of frames added before and after each
+            chunk
+        frame_rate (float): frame rate of the file
+        unit (TrajectoryUnit): unit in which the coordinates are stored
+            in the file
+        rows_per_read (int): number of rows read at once
+
+    Returns:
+        Iterator over the :class:`TrajectoryChunk` of the file
+    """
+    first_frame, last_frame, is_sorted = _scan_trajectory_frames(
+        trajectory_file=trajectory_file, rows_per_read=rows_per_read
+    )
+    chunk_frames = [
+        (chunk_start, min(chunk_start + frames_per_chunk - 1, last_frame))
+        for chunk_start in range(first_frame, last_frame + 1, frames_per_chunk)
+    ]
+
+    if is_sorted:
+        chunk_data = _iter_sorted_text_chunk_data(
+            trajectory_file=trajectory_file,
+            unit=unit,
+            chunk_frames=chunk_frames,
+            overlap_frames=overlap_frames,
+            rows_per_read=rows_per_read,
+        )
+    else:
+        chunk_data = (
+            _read_text_frame_range(
+                trajectory_file=trajectory_file,
+                unit=unit,
+                frame_range=(
+                    chunk_start - overlap_frames,
+                    chunk_end + overlap_frames,
+                ),
+                rows_per_read=rows_per_read,
+            )
+            for chunk_start, chunk_end in chunk_frames
+        )
+
+    for (chunk_start, chunk_end), data in zip(chunk_frames, chunk_data):
+        yield TrajectoryChunk(
+            traj_data=TrajectoryData(data=data, frame_rate=frame_rate),
+            first_frame=chunk_start,
+            last_frame=chunk_end,
+        )
+
+
+def _read_text_chunks(
+    *, trajectory_file: pathlib.Path, rows_per_read: int, **kwargs: Any
+) -> Iterator[pd.DataFrame]:
+    """Read the trajectory text file in chunks of rows.
+
+    Args:
+        trajectory_file (pathlib.Path): file containing the trajectory
+        rows_per_read (int): number of rows read at once
+        kwargs (Any): options overwriting the default options for reading
+            trajectory text files
+
+    Returns:
+        Iterator over the chunks of the file
+    """
+    try:
+        with pd.read_csv(
+            trajectory_file,
+            chunksize=rows_per_read,
+            **(_TEXT_FILE_OPTIONS | kwargs),
+        ) as reader:
+            yield from reader
+    except pd.errors.ParserError as exc:
+        raise ValueError(
+            "The given trajectory file could not be parsed. It should "
+            "contain at least 5 columns: ID, frame, X, Y, Z. The values "
+            "should be separated by any white space. Comment line may start "
+            "with a '#' and will be ignored. "
+            f"Please check your trajectory file: {trajectory_file}."
+        ) from exc
+
+
+def _scan_trajectory_frames(
+    *, trajectory_file: pathlib.Path, rows_per_read: int
+) -> Tuple[int, int, bool]:
+    """Get the frame range of the trajectory text file.
+
+    Only the frame column of the file is read.
+
+    Args:
+        trajectory_file (pathlib.Path): file containing the trajectory
+        rows_per_read (int): number of rows read at once
+
+    Returns:
+        Tuple containing the first frame, the last frame, and whether the
+        rows are sorted by frame
+    """
+    first_frame: Optional[int] = None
+    last_frame: Optional[int] = None
+    is_sorted = True
+
+    for chunk in _read_text_chunks(
+        trajectory_file=trajectory_file,
+        rows_per_read=rows_per_read,
+        names=[FRAME_COL],
+        usecols=[1],
+        dtype={FRAME_COL: "int64"},
+    ):
+        frames = chunk[FRAME_COL].to_numpy()
+        if frames.size == 0:
+            continue
+
+        is_sorted = (
+            is_sorted
+            and bool(np.all(np.diff(frames) >= 0))
+            and (last_frame is None or frames[0] >= last_frame)
+        )
+        first_frame = int(
+            frames.min()
+            if first_frame is None
+            else min(first_frame, frames.min())
+        )
+        last_frame = int(
+            frames.max()
+            if last_frame is None
+            else max(last_frame, frames.max())
+        )
+
+    if first_frame is None or last_frame is None:
+        raise ValueError(
+            "The given trajectory file seem to be empty. It should "
+            "contain at least 5 columns: ID, frame, X, Y, Z. The values "
+            "should be separated by any white space. Comment line may "
+            "start with a '#' and will be ignored. "
+            f"Please check your trajectory file: {trajectory_file}."
+        )
+
+    return first_frame, last_frame, is_sorted
+
+
+def _iter_sorted_text_chunk_data(
+    *,
+    trajectory_file: pathlib.Path,
+    unit: TrajectoryUnit,
+    chunk_frames: List[Tuple[int, int]],
+    overlap_frames: int,
+    rows_per_read: int,
+) -> Iterator[pd.DataFrame]:
+    """Create the data of the chunks in a single pass over the file.
+
+    Requires that the rows of the file are sorted by frame. Only the rows
+    needed for the current and following chunks are kept in memory.
+
+    Args:
+        trajectory_file (pathlib.Path): file containing the trajectory
+        unit (TrajectoryUnit): unit in which the coordinates are stored
+            in the file
+        chunk_frames (List[Tuple[int, int]]): first and last frame of each
+            chunk
+        overlap_frames (int): number of frames added before and after each
+            chunk
+        rows_per_read (int): number of rows read at once
+
+    Returns:
+        Iterator over the data of each chunk
+    """
+    buffer = pd.DataFrame(
+        {
+            column: pd.Series(dtype=dtype)
+            for column, dtype in _TEXT_FILE_OPTIONS["dtype"].items()
+        }
+    )
+    chunk_index = 0
+
+    for rows in _read_text_chunks(
+        trajectory_file=trajectory_file, rows_per_read=rows_per_read
+    ):
+        buffer = pd.concat([buffer, _convert_to_meter(data=rows, unit=unit)])
+
+        # all rows of a chunk are read, as soon as a later frame is read
+        while (
+            chunk_index < len(chunk_frames)
+            and not buffer.empty
+            and buffer[FRAME_COL].iloc[-1]
+            > chunk_frames[chunk_index][1] + overlap_frames
+        ):
+            yield _get_chunk_rows(
+                data=buffer,
+                chunk_frame=chunk_frames[chunk_index],
+                overlap_frames=overlap_frames,
+            )
+            chunk_index += 1
+            if chunk_index < len(chunk_frames):
+                buffer = buffer[
+                    buffer[FRAME_COL]
+                    >= chunk_frames[chunk_index][0] - overlap_frames
+                ]
+
+    for chunk_frame in chunk_frames[chunk_index:]:
+        yield _get_chunk_rows(
+            data=buffer, chunk_frame=chunk_frame, overlap_frames=overlap_frames
+        )
+
+
+def _read_text_frame_range(
+    *,
+    trajectory_file: pathlib.Path,
+    unit: TrajectoryUnit,
+    frame_range: Tuple[int, int],
+    rows_per_read: int,
+) -> pd.DataFrame:
+    """Read all rows of the given frame range in a pass over the file.
+
+    Args:
+        trajectory_file (pathlib.Path): file containing the trajectory
+        unit (TrajectoryUnit): unit in which the coordinates are stored
+            in the file
+        frame_range (Tuple[int, int]): first and last frame (both inclusive)
+        rows_per_read (int): number of rows read at once
+
+    Returns:
+        DataFrame containing the rows of the frame range
+    """
+    return pd.concat(
+        [
+            _convert_to_meter(
+                data=rows[rows[FRAME_COL].between(*frame_range)], unit=unit
+            )
+            for rows in _read_text_chunks(
+                trajectory_file=trajectory_file, rows_per_read=rows_per_read
+            )
+        ]
+    )
+
+
+def _get_chunk_rows(
+    *, data: pd.DataFrame, chunk_frame: Tuple[int, int], overlap_frames: int
+) -> pd.DataFrame:
+    """Get the rows of the chunk including the overlapping frames.
+
+    Args:
+        data (pd.DataFrame): data containing the chunk
+        chunk_frame (Tuple[int, int]): first and last frame of the chunk
+        overlap_frames (int): number of frames added before and after the
+            chunk
+
+    Returns:
+        DataFrame containing the rows of the chunk
+    """
+    return data[
+        data[FRAME_COL].between(
+            chunk_frame[0] - overlap_frames, chunk_frame[1] + overlap_frames
+        )
+    ]
+
+
+def _convert_to_meter(
+    *, data: pd.DataFrame, unit: TrajectoryUnit
+) -> pd.DataFrame:
+    """Convert the coordinates of the data to meter.
+
+    Args:
+        data (pd.DataFrame): data with coordinates in the given unit
+        unit (TrajectoryUnit): unit of the coordinates
+
+    Returns:
+        DataFrame with coordinates in meter (m)
+    """
+    if unit == TrajectoryUnit.CENTIMETER:
+        data = data.assign(
+            **{X_COL: data[X_COL].div(100), Y_COL: data[Y_COL].div(100)}
+        )
+    return data
+
+
+def _load_trajectory_meta_data(
     *,
     trajectory_file: pathlib.Path,
     default_frame_rate: Optional[float],
@@ -159,56 +575,23 @@ def _load_trajectory_meta_data(  # pylint: disable=too-many-branches
             if "x/m" in line.lower() or "in m" in line.lower():
                 parsed_unit = TrajectoryUnit.METER
 
-    frame_rate = parsed_frame_rate
-    if parsed_frame_rate is None and default_frame_rate is not None:
-        if default_frame_rate <= 0:
-            raise ValueError(
-                f"Default frame needs to be positive but is "
-                f"{default_frame_rate}"
-            )
-
-        frame_rate = default_frame_rate
-
-    if parsed_frame_rate is None and default_frame_rate is None:
-        raise ValueError(
-            "Frame rate is needed, but none could be found in the trajectory "
-            "file. "
-            f"Please check your trajectory file: {trajectory_file} or provide "
-            "a default frame rate."
-        )
-
-    if parsed_frame_rate is not None and default_frame_rate is None:
-        if parsed_frame_rate <= 0:
-            raise ValueError(
-                "Frame rate needs to be a positive value, but is "
-                f"{parsed_frame_rate}. "
-                "Please check your trajectory file: {trajectory_file}."
-            )
-    if parsed_frame_rate is not None and default_frame_rate is not None:
-        if parsed_frame_rate != default_frame_rate:
-            raise ValueError(
-                "The given default frame rate seems to differ from the frame "
-                "rate given in the trajectory file: "
-                f"{default_frame_rate} != {parsed_frame_rate}"
-            )
+    return _validate_trajectory_meta_data(
+        trajectory_file=trajectory_file,
+        parsed_frame_rate=parsed_frame_rate,
+        parsed_unit=parsed_unit,
+        default_frame_rate=default_frame_rate,
+        default_unit=default_unit,
+    )
 
-    unit = parsed_unit
-    if parsed_unit is None and default_unit is not None:
-        unit = default_unit
 
-    if parsed_unit is None and default_unit is None:
-        raise ValueError(
-            "Unit is needed, but none could be found in the trajectory file. "
-            f"Please check your trajectory file: {trajectory_file} or provide "
-            "a default unit."
-        )
+def _read_file_signature(*, trajectory_file: pathlib.Path) -> bytes:
+    """Read the first bytes of the file, used to identify the file format.
 
-    if parsed_unit is not None and default_unit is not None:
-        if parsed_unit != default_unit:
-            raise ValueError(
-                "The given default unit seems to differ from the unit given "
-                "in the trajectory file: "
-                f"{default_unit} != {parsed_unit}"
-            )
+    Args:
+        trajectory_file (pathlib.Path): file containing the trajectory
 
-    return frame_rate, unit
+    Returns:
+        The first 8 bytes of the file
+    """
+    with open(trajectory_file, "rb") as file_content:
+        return file_content.read(len(_BINARY_MAGIC))
@@ -0,0 +1,93 @@
+"""Metadata of trajectory files, shared by the trajectory loaders."""
+
+import pathlib
+from typing import Any, Optional, Tuple
+
+from aenum import Enum
+
+
+class TrajectoryUnit(Enum):  # pylint: disable=too-few-public-methods
+    """Identifier of the unit of the trajectory coordinates."""
+
+    _init_ = "value __doc__"
+    METER = 1, "meter (m)"
+    CENTIMETER = 100, "centimeter (cm)"
+
+
+def _validate_trajectory_meta_data(  # pylint: disable=too-many-branches
+    *,
+    trajectory_file: pathlib.Path,
+    parsed_frame_rate: Optional[float],
+    parsed_unit: Optional[TrajectoryUnit],
+    default_frame_rate: Optional[float],
+    default_unit: Optional[TrajectoryUnit],
+) -> Tuple[float, TrajectoryUnit]:
+    """Combine the metadata found in the file with the given defaults.
+
+    Args:
+        trajectory_file (pathlib.Path): file containing the trajectory
+        parsed_frame_rate (float): frame rate found in the file, None if no
+            frame rate was found
+        parsed_unit (TrajectoryUnit): unit found in the file, None if no unit
+            was found
+        default_frame_rate (float): frame rate of the file, None if frame rate
+            from file is used
+        default_unit (TrajectoryUnit): unit in which the coordinates are stored
+                in the file, None if unit should be parsed from the file
+
+    Returns:
+        Tuple containing the frame-rate and used unit.
+    """
+    frame_rate: Any = parsed_frame_rate
+    if parsed_frame_rate is None and default_frame_rate is not None:
+        if default_frame_rate <= 0:
+            raise ValueError(
+                f"Default frame needs to be positive but is "
+                f"{default_frame_rate}"
+            )
+
+        frame_rate = default_frame_rate
+
+    if parsed_frame_rate is None and default_frame_rate is None:
+        raise ValueError(
+            "Frame rate is needed, but none could be found in the trajectory "
+            "file. "
+            f"Please check your trajectory file: {trajectory_file} or provide "
+            "a default frame rate."
+        )
+
+    if parsed_frame_rate is not None and default_frame_rate is None:
+        if parsed_frame_rate <= 0:
+            raise ValueError(
+                "Frame rate needs to be a positive value, but is "
+                f"{parsed_frame_rate}. "
+                "Please check your trajectory file: {trajectory_file}."
+            )
+    if parsed_frame_rate is not None and default_frame_rate is not None:
+        if parsed_frame_rate != default_frame_rate:
+            raise ValueError(
+                "The given default frame rate seems to differ from the frame "
+                "rate given in the trajectory file: "
+                f"{default_frame_rate} != {parsed_frame_rate}"
+            )
+
+    unit: Any = parsed_unit
+    if parsed_unit is None and default_unit is not None:
+        unit = default_unit
+
+    if parsed_unit is None and default_unit is None:
+        raise ValueError(
+            "Unit is needed, but none could be found in the trajectory file. "
+            f"Please check your trajectory file: {trajectory_file} or provide "
+            "a default unit."
+        )
+
+    if parsed_unit is not None and default_unit is not None:
+        if parsed_unit != default_unit:
+            raise ValueError(
+                "The given default unit seems to differ from the unit given "
+                "in the trajectory file: "
+                f"{default_unit} != {parsed_unit}"
+            )
+
+    return frame_rate, unit
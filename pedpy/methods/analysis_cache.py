@@ -0,0 +1,436 @@
+"""Module containing a cache for expensive intermediate analysis results."""
+import contextvars
+import dataclasses
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import pathlib
+import pickle
+import sys
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+import numpy as np
+import pandas as pd
+import shapely
+from aenum import Enum
+
+from pedpy import _version
+from pedpy.data.geometry import MeasurementArea, MeasurementLine, WalkableArea
+from pedpy.data.trajectory_data import TrajectoryData
+
+_log = logging.getLogger(__name__)
+
+_ACTIVE_CACHE: contextvars.ContextVar[
+    Optional["AnalysisCache"]
+] = contextvars.ContextVar("active_analysis_cache", default=None)
+
+ResultT = TypeVar("ResultT")
+
+
+@dataclass(kw_only=True)
+class AnalysisCache:
+    """Opt-in cache for expensive intermediate results of the analysis.
+
+    Many analysis methods need the same intermediate results, e.g., the
+    individual Voronoi polygons, the individual speed, or the frames in which
+    the pedestrians cross a measurement line. While the cache is active,
+    these are computed only once for the same input. The cache is activated
+    by using it as context manager:
+
+    .. code:: python
+
+        with AnalysisCache(max_bytes=2**30) as cache:
+            n_t, crossing_frames = compute_n_t(
+                traj_data=traj_data, measurement_line=measurement_line
+            )
+            ...
+
+    The results are identified by the name of the function, a hash of the
+    content of the trajectory data (see :attr:`TrajectoryData.content_hash`),
+    the WKB of the geometries, the remaining arguments, and the version of
+    PedPy. The least recently used results are evicted when the estimated
+    memory of all results in the cache exceeds :attr:`max_bytes`.
+
+    If a :attr:`directory` is given, the results are additionally stored
+    there, and can be reused in later sessions. Results in the directory are
+    not evicted.
+
+    Results are returned as copy, modifying them does not change the cached
+    results.
+
+    Args:
+        max_bytes (int): maximum estimated memory of the results kept in
+            memory (default: 1 GiB)
+        directory (Optional[pathlib.Path]): directory in which the results
+            are stored persistently (default: None, results are only kept in
+            memory)
+
+    Attributes:
+        hits (int): number of results taken from the cache
+        misses (int): number of results which needed to be computed
+    """
+
+    max_bytes: int = 2**30
+    directory: Optional[pathlib.Path] = None
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _entries: "OrderedDict[str, Tuple[Any, int]]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _num_bytes: int = field(default=0, init=False, repr=False)
+    _tokens: List[contextvars.Token[Optional["AnalysisCache"]]] = field(
+        default_factory=list, init=False, repr=False
+    )
+
+    def __post_init__(self):
+        """Validates the parameters and creates the cache directory.
+
+        Raises:
+            ValueError: if max_bytes is negative
+        """
+        if self.max_bytes < 0:
+            raise ValueError(
+                f"max_bytes needs to be non-negative, got {self.max_bytes}."
+            )
+        if self.directory is not None:
+            self.directory = pathlib.Path(self.directory)
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def __enter__(self) -> "AnalysisCache":
+        """Activates the cache for the analysis methods.
+
+        Returns:
+            the activated cache
+        """
+        self._tokens.append(_ACTIVE_CACHE.set(self))
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Deactivates the cache, the cached results are kept."""
+        _ACTIVE_CACHE.reset(self._tokens.pop())
+
+    @property
+    def num_bytes(self) -> int:
+        """Estimated memory of the results kept in memory.
+
+        Returns:
+            Estimated memory in bytes
+        """
+        return self._num_bytes
+
+    @property
+    def num_entries(self) -> int:
+        """Number of results kept in memory.
+
+        Returns:
+            Number of results kept in memory
+        """
+        return len(self._entries)
+
+    def get_or_compute(
+        self, *, key: str, compute: Callable[[], ResultT]
+    ) -> ResultT:
+        """Returns the cached result for the key, or computes and caches it.
+
+        Args:
+            key (str): identifier of the result
+            compute (Callable[[], ResultT]): function computing the result
+
+        Returns:
+            Copy of the result
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _copy_result(self._entries[key][0])
+
+        result = self._load(key=key)
+        if result is None:
+            self.misses += 1
+            result = compute()
+            self._store(key=key, result=result)
+        else:
+            self.hits += 1
+
+        self._add_entry(key=key, result=result)
+        return _copy_result(result)
+
+    def clear(self) -> None:
+        """Removes all results kept in memory.
+
+        Results stored in :attr:`directory` are kept.
+        """
+        self._entries.clear()
+        self._num_bytes = 0
+
+    def _add_entry(self, *, key: str, result: Any) -> None:
+        """Adds the result to memory and evicts least recently used results.
+
+        Args:
+            key (str): identifier of the result
+            result (Any): result to add
+        """
+        num_bytes = _estimate_num_bytes(result)
+        if num_bytes > self.max_bytes:
+            return
+
+        self._entries[key] = (result, num_bytes)
+        self._num_bytes += num_bytes
+        while self._num_bytes > self.max_bytes:
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self._num_bytes -= evicted_bytes
+
+    def _load(self, *, key: str) -> Optional[Any]:
+        """Loads the result from the cache directory.
+
+        Args:
+            key (str): identifier of the result
+
+        Returns:
+            the stored result, or None if not available
+        """
+        if self.directory is None:
+            return None
+
+        path = self.directory / f"{key}.pickle"
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "rb") as cache_file:
+                return pickle.load(cache_file)
+        except (OSError, pickle.UnpicklingError, EOFError) as exc:
+            _log.warning(f"Could not load cached result from {path}: {exc}")
+            return None
+
+    def _store(self, *, key: str, result: Any) -> None:
+        """Stores the result in the cache directory.
+
+        The result is written to a temporary file first, which is then
+        renamed, such that no partially written results are loaded.
+
+        Args:
+            key (str): identifier of the result
+            result (Any): result to store
+        """
+        if self.directory is None:
+            return
+
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, suffix=".tmp", delete=False
+        ) as cache_file:
+            pickle.dump(result, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(cache_file.name, self.directory / f"{key}.pickle")
+
+
+def cached(
+    *, ignore: Sequence[str] = ()
+) -> Callable[[Callable[..., ResultT]], Callable[..., ResultT]]:
+    """Caches the results of the function in the active analysis cache.
+
+    If no :class:`AnalysisCache` is active, or not all arguments of the
+    function can be hashed, the function is called directly.
+
+    Args:
+        ignore (Sequence[str]): names of the arguments, which do not change
+            the result, e.g., the number of workers, and are not used to
+            identify the result
+
+    Returns:
+        decorator for the function to cache
+    """
+
+    def decorator(function: Callable[..., ResultT]) -> Callable[..., ResultT]:
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> ResultT:
+            if _ACTIVE_CACHE.get() is None:
+                return function(*args, **kwargs)
+
+            return get_or_compute_cached(
+                function=wrapper,
+                compute=lambda: function(*args, **kwargs),
+                arguments=signature.bind(*args, **kwargs).arguments,
+            )
+
+        setattr(wrapper, "_ignored_arguments", frozenset(ignore))
+        return wrapper
+
+    return decorator
+
+
+def get_or_compute_cached(
+    *,
+    function: Callable[..., ResultT],
+    compute: Callable[[], ResultT],
+    arguments: Dict[str, Any],
+) -> ResultT:
+    """Returns the result of a cached function from the active analysis cache.
+
+    The result is identified in the same way as when calling the function
+    decorated with :func:`cached` with the given arguments. If it is not
+    cached, it is computed with :code:`compute`, which needs to give the same
+    result as the function. This allows to compute the results of multiple
+    calls together, while sharing them with single calls of the function.
+
+    Args:
+        function (Callable[..., ResultT]): function decorated with
+            :func:`cached`
+        compute (Callable[[], ResultT]): computes the result, if it is not
+            cached
+        arguments (Dict[str, Any]): arguments of the function call by name
+
+    Returns:
+        Copy of the cached result, or the computed result if no
+        :class:`AnalysisCache` is active
+    """
+    cache = _ACTIVE_CACHE.get()
+    if cache is None:
+        return compute()
+
+    bound_arguments = inspect.signature(function).bind(**arguments)
+    bound_arguments.apply_defaults()
+    ignored_arguments: FrozenSet[str] = getattr(
+        function, "_ignored_arguments", frozenset()
+    )
+    key = _compute_key(
+        name=f"{function.__module__}.{function.__qualname__}",
+        arguments={
+            name: value
+            for name, value in bound_arguments.arguments.items()
+            if name not in ignored_arguments
+        },
+    )
+    if key is None:
+        return compute()
+
+    return cache.get_or_compute(key=key, compute=compute)
+
+
+def _compute_key(*, name: str, arguments: Dict[str, Any]) -> Optional[str]:
+    """Computes the key identifying the result of a function call.
+
+    Args:
+        name (str): name of the function
+        arguments (Dict[str, Any]): arguments of the function call
+
+    Returns:
+        Hash of the function name, the arguments, and the PedPy version, or
+        None if one of the arguments can not be hashed
+    """
+    key = hashlib.blake2b(digest_size=20)
+    key.update(_get_pedpy_version().encode())
+    key.update(name.encode())
+    for argument_name, value in arguments.items():
+        value_hash = _hash_argument(value)
+        if value_hash is None:
+            return None
+        key.update(argument_name.encode())
+        key.update(value_hash)
+    return key.hexdigest()
+
+
+def _hash_argument(value: Any) -> Optional[bytes]:
+    """Computes the hash of an argument.
+
+    Args:
+        value (Any): argument
+
+    Returns:
+        Hash of the argument, or None if the argument can not be hashed
+    """
+    if isinstance(value, TrajectoryData):
+        content = value.content_hash.encode()
+    elif isinstance(value, (WalkableArea, MeasurementArea)):
+        content = shapely.to_wkb(value.polygon)
+    elif isinstance(value, MeasurementLine):
+        content = shapely.to_wkb(value.line)
+    elif isinstance(value, np.ndarray) and value.dtype != np.object_:
+        content = (
+            f"{value.dtype.str}{value.shape}".encode()
+            + np.ascontiguousarray(value).tobytes()
+        )
+    elif (
+        value is None
+        or isinstance(value, (bool, int, float, str, Enum))
+        or (dataclasses.is_dataclass(value) and not isinstance(value, type))
+    ):
+        content = repr(value).encode()
+    else:
+        return None
+
+    return type(value).__qualname__.encode() + content
+
+
+def _estimate_num_bytes(result: Any) -> int:
+    """Estimates the memory used by the result.
+
+    For geometries in data frames, the memory of the coordinates is added.
+
+    Args:
+        result (Any): result
+
+    Returns:
+        Estimated memory in bytes
+    """
+    if isinstance(result, pd.DataFrame):
+        num_bytes = int(result.memory_usage(deep=True).sum())
+        for _, column in result.select_dtypes(include=object).items():
+            is_geometry = shapely.is_geometry(column.to_numpy())
+            num_bytes += 16 * int(
+                shapely.get_num_coordinates(
+                    column.to_numpy()[is_geometry]
+                ).sum()
+            )
+        return num_bytes
+    if isinstance(result, pd.Series):
+        return _estimate_num_bytes(result.to_frame())
+    if isinstance(result, np.ndarray):
+        return result.nbytes
+    if isinstance(result, (tuple, list)):
+        return sum(_estimate_num_bytes(value) for value in result)
+    return sys.getsizeof(result)
+
+
+def _copy_result(result: ResultT) -> ResultT:
+    """Copies the result, such that modifications do not change the cache.
+
+    The geometries in data frames are not copied, as they are immutable.
+
+    Args:
+        result (ResultT): result
+
+    Returns:
+        copy of the result
+    """
+    if isinstance(result, (pd.DataFrame, pd.Series, np.ndarray)):
+        return result.copy()  # type: ignore[return-value]
+    if isinstance(result, tuple):
+        return tuple(_copy_result(value) for value in result)
+    return result
+
+
+@functools.lru_cache(maxsize=None)
+def _get_pedpy_version() -> str:
+    """Version of PedPy, to invalidate stored results of other versions.
+
+    Returns:
+        Version of PedPy
+    """
+    return str(_version.get_versions()["version"])  # type: ignore[attr-defined]
@@ -1,14 +1,42 @@
 """Module containing functions to compute densities."""
-from typing import Tuple
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 import pandas as pd
 import shapely
 
-from pedpy.column_identifier import COUNT_COL, DENSITY_COL, FRAME_COL, ID_COL
-from pedpy.data.geometry import MeasurementArea
-from pedpy.data.trajectory_data import TrajectoryData
-from pedpy.methods.method_utils import compute_intersecting_polygons
+from pedpy.column_identifier import (
+    AREA_COL,
+    COUNT_COL,
+    DENSITY_COL,
+    FIRST_FRAME_COL,
+    FRAME_COL,
+    ID_COL,
+    INTERSECTION_COL,
+    LAST_FRAME_COL,
+    POLYGON_COL,
+)
+from pedpy.data.geometry import MeasurementArea, WalkableArea
+from pedpy.data.trajectory_data import TrajectoryChunk, TrajectoryData
+from pedpy.methods.method_utils import (
+    Cutoff,
+    _compute_is_inside_area,
+    _compute_points_in_areas,
+    _compute_polygons_in_areas,
+    compute_individual_voronoi_polygons,
+    compute_intersecting_polygons,
+)
 
 
 def compute_classic_density(
@@ -38,14 +66,135 @@ def compute_classic_density(
         measurement_area (MeasurementArea): area for which the density is
             computed
 
+    Returns:
+        DataFrame containing the columns 'frame' and 'density' in :math:`1/m^2`
+    """
+    return _compute_classic_density_in_frames(
+        traj_data=traj_data,
+        measurement_area=measurement_area,
+        frames=range(
+            traj_data.data.frame.min(), traj_data.data.frame.max() + 1
+        ),
+    )
+
+
+def compute_classic_density_multi(
+    *,
+    traj_data: TrajectoryData,
+    measurement_areas: Sequence[MeasurementArea],
+) -> pd.DataFrame:
+    """Compute the classic density per frame inside multiple measurement areas.
+
+    Computes the same results as :func:`compute_classic_density` for each of
+    the given measurement areas in a single pass over the trajectory data.
+    The positions are sorted once into a coarse uniform grid, and for each
+    area only the positions in the grid cells overlapping its bounds are
+    checked. Hence, the effort grows with the number of positions and the
+    number of positions near each area, and not with the number of positions
+    times the number of areas.
+
+    The result is returned in long form, with the index of the measurement
+    area in :code:`measurement_areas` as additional level 'area'. The result
+    of :func:`compute_classic_density` for the i-th area is given by
+    :code:`density.loc[i]`.
+
+    Args:
+        traj_data (TrajectoryData): trajectory data to analyze
+        measurement_areas (Sequence[MeasurementArea]): areas for which the
+            density is computed
+
+    Returns:
+        DataFrame indexed by 'area' and 'frame' containing the column
+        'density' in :math:`1/m^2`
+    """
+    if len(measurement_areas) == 0:
+        raise ValueError("At least one measurement area is needed.")
+
+    rows, areas = _compute_points_in_areas(
+        traj_data=traj_data, measurement_areas=measurement_areas
+    )
+    frames = range(traj_data.data.frame.min(), traj_data.data.frame.max() + 1)
+
+    num_peds = np.bincount(
+        areas * len(frames)
+        + (traj_data.data[FRAME_COL].to_numpy()[rows] - frames.start),
+        minlength=len(measurement_areas) * len(frames),
+    ).reshape(len(measurement_areas), len(frames))
+    density = num_peds / np.array(
+        [measurement_area.area for measurement_area in measurement_areas]
+    ).reshape(-1, 1)
+
+    return pd.DataFrame(
+        {DENSITY_COL: density.ravel()},
+        index=pd.MultiIndex.from_product(
+            [range(len(measurement_areas)), frames],
+            names=[AREA_COL, FRAME_COL],
+        ),
+    )
+
+
+def compute_classic_density_chunked(
+    *,
+    traj_chunks: Iterable[TrajectoryChunk],
+    measurement_area: MeasurementArea,
+) -> Iterator[pd.DataFrame]:
+    """Compute the classic density per frame chunk wise.
+
+    Incremental counterpart of :func:`compute_classic_density`, which
+    processes the trajectory chunk by chunk, e.g., as created by
+    :func:`~trajectory_loader.load_trajectory_chunks`. Only the current chunk
+    needs to be kept in memory.
+
+    For each chunk the density in the frames of the chunk is returned, in the
+    same format as :func:`compute_classic_density`. Concatenating the results
+    of all chunks gives the same result as :func:`compute_classic_density`
+    for the complete trajectory.
+
+    Args:
+        traj_chunks (Iterable[TrajectoryChunk]): trajectory chunks to analyze
+        measurement_area (MeasurementArea): area for which the density is
+            computed
+
+    Returns:
+        Iterator over the DataFrames containing the columns 'frame' and
+        'density' in :math:`1/m^2` for the frames of each chunk
+    """
+    for chunk in traj_chunks:
+        yield _compute_classic_density_in_frames(
+            traj_data=chunk.traj_data,
+            measurement_area=measurement_area,
+            frames=range(chunk.first_frame, chunk.last_frame + 1),
+        )
+
+
+def _compute_classic_density_in_frames(
+    *,
+    traj_data: TrajectoryData,
+    measurement_area: MeasurementArea,
+    frames: range,
+) -> pd.DataFrame:
+    """Compute the classic density inside the measurement area in the frames.
+
+    Args:
+        traj_data (TrajectoryData): trajectory data to analyze
+        measurement_area (MeasurementArea): area for which the density is
+            computed
+        frames (range): frames for which the density is computed
+
     Returns:
         DataFrame containing the columns 'frame' and 'density' in :math:`1/m^2`
     """
     peds_in_area = TrajectoryData(
         traj_data.data[
-            shapely.contains(measurement_area.polygon, traj_data.data.point)
+            _compute_is_inside_area(
+                measurement_area=measurement_area,
+                x=traj_data.data.x,
+                y=traj_data.data.y,
+            )
+            & traj_data.data.frame.between(frames.start, frames.stop - 1)
         ],
         traj_data.frame_rate,
+        lazy_points=True,
     )
     peds_in_area_per_frame = _get_num_peds_per_frame(peds_in_area)
 
@@ -53,10 +202,8 @@ def compute_classic_density(
 
     # Rename column and add missing zero values
     density.columns = [DENSITY_COL]
-    density = density.reindex(
-        list(range(traj_data.data.frame.min(), traj_data.data.frame.max() + 1)),
-        fill_value=0.0,
-    )
+    density = density.reindex(list(frames), fill_value=0.0)
+    density.index.name = FRAME_COL
 
     return density
 
@@ -143,6 +290,278 @@ def compute_voronoi_density(
     )
 
 
+def compute_voronoi_density_multi(
+    *,
+    individual_voronoi_data: pd.DataFrame,
+    measurement_areas: Sequence[MeasurementArea],
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Compute the Voronoi density per frame inside multiple measurement areas.
+
+    Computes the same results as :func:`compute_voronoi_density` for each of
+    the given measurement areas in a single pass over the Voronoi polygons.
+    The candidate areas of each polygon are found with a spatial index over
+    the areas, and the intersection is only computed for polygons
+    intersecting an area. Hence, the effort grows with the number of polygons
+    and intersections, not with the number of polygons times the number of
+    areas.
+
+    The results are returned in long form, with the index of the measurement
+    area in :code:`measurement_areas` as additional level or column 'area'.
+    The density of :func:`compute_voronoi_density` for the i-th area is given
+    by :code:`density.loc[i]`.
+
+    Args:
+        individual_voronoi_data (pd.DataFrame): individual voronoi data per
+            frame, result from
+            :func:`method_utils.compute_individual_voronoi_polygon`
+        measurement_areas (Sequence[MeasurementArea]): areas for which the
+            density is computed
+
+    Returns:
+        DataFrame indexed by 'area' and 'frame' containing the column
+        'density' in :math:`1/m^2`, DataFrame containing the columns: 'area',
+        'id', 'frame', 'polygon' which contains the Voronoi polygon of the
+        pedestrian, 'intersection' which contains the intersection area of
+        the Voronoi polygon and the measurement area. The latter only
+        contains the polygons intersecting the measurement area.
+    """
+    if len(measurement_areas) == 0:
+        raise ValueError("At least one measurement area is needed.")
+
+    rows, areas = _compute_polygons_in_areas(
+        individual_voronoi_data=individual_voronoi_data,
+        measurement_areas=measurement_areas,
+    )
+    area_polygons = np.array(
+        [measurement_area.polygon for measurement_area in measurement_areas]
+    )
+    polygons = individual_voronoi_data[POLYGON_COL].to_numpy()[rows]
+
+    df_intersecting = pd.DataFrame(
+        {
+            AREA_COL: areas,
+            ID_COL: individual_voronoi_data[ID_COL].to_numpy()[rows],
+            FRAME_COL: individual_voronoi_data[FRAME_COL].to_numpy()[rows],
+            POLYGON_COL: polygons,
+            INTERSECTION_COL: shapely.intersection(
+                polygons, area_polygons[areas]
+            ),
+        }
+    )
+
+    frames = range(
+        individual_voronoi_data.frame.min(),
+        individual_voronoi_data.frame.max() + 1,
+    )
+    relation = np.bincount(
+        areas * len(frames) + (df_intersecting[FRAME_COL] - frames.start),
+        weights=shapely.area(df_intersecting[INTERSECTION_COL])
+        / shapely.area(polygons),
+        minlength=len(measurement_areas) * len(frames),
+    ).reshape(len(measurement_areas), len(frames))
+    density = relation / np.array(
+        [measurement_area.area for measurement_area in measurement_areas]
+    ).reshape(-1, 1)
+
+    return (
+        pd.DataFrame(
+            {DENSITY_COL: density.ravel()},
+            index=pd.MultiIndex.from_product(
+                [range(len(measurement_areas)), frames],
+                names=[AREA_COL, FRAME_COL],
+            ),
+        ),
+        df_intersecting,
+    )
+
+
+@dataclass(kw_only=True)
+class OnlineVoronoiDensity:
+    """Voronoi density in a moving window of frames, updated online.
+
+    Instead of recomputing :func:`compute_voronoi_density` for the complete
+    history whenever new data arrive, only the newly added frames are
+    processed with :func:`~method_utils.compute_individual_voronoi_polygons`
+    and :func:`~method_utils.compute_intersecting_polygons`. As the Voronoi
+    tesselation of each frame is independent of all other frames, the results
+    are identical to the computation on the complete trajectory.
+
+    Only the last :attr:`window_size` frames (counted from the newest frame
+    added) are kept, older frames are removed. Hence, the time needed for an
+    update only depends on the number of new frames.
+
+    .. code-block:: python
+
+        online_density = OnlineVoronoiDensity(
+            walkable_area=walkable_area,
+            measurement_area=measurement_area,
+            window_size=250,
+        )
+        for chunk in load_trajectory_chunks(
+            trajectory_file=trajectory_file, frames_per_chunk=25
+        ):
+            online_density.update(traj_data=chunk.traj_data)
+            current_density = online_density.density
+
+    Attributes:
+        walkable_area (WalkableArea): bounding area, where pedestrian are
+                supposed to walk
+        measurement_area (MeasurementArea): area for which the density is
+            computed
+        window_size (int): number of frames kept
+        cut_off (Cutoff): cutoff information, which provide the largest
+                possible extend of a single Voronoi polygon
+        use_blind_points (bool): adds extra 4 points outside the walkable area
+                to also compute voronoi cells when less than 4 peds are in the
+                walkable area (default: on!)
+    """
+
+    walkable_area: WalkableArea
+    measurement_area: MeasurementArea
+    window_size: int
+    cut_off: Optional[Cutoff] = None
+    use_blind_points: bool = True
+    _last_frame: Optional[int] = field(default=None, init=False, repr=False)
+    # density and Voronoi data of each update in the window
+    _updates: Deque[Tuple[pd.DataFrame, pd.DataFrame]] = field(
+        default_factory=deque, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        """Checks the size of the window."""
+        if self.window_size < 1:
+            raise ValueError(
+                "The window size needs to be positive, but is "
+                f"{self.window_size}."
+            )
+
+    def update(self, *, traj_data: TrajectoryData) -> pd.DataFrame:
+        """Add new frames and compute their Voronoi density.
+
+        All frames in :code:`traj_data` need to be newer than the frames
+        added before. Frames outside the window are removed afterwards.
+
+        Args:
+            traj_data (TrajectoryData): trajectory data of the new frames
+
+        Returns:
+            DataFrame containing the columns 'frame' and 'density' in
+            :math:`1/m^2` for the new frames
+        """
+        if traj_data.data.empty:
+            return self._to_density_frame(frames=[], densities=[])
+
+        if (
+            self._last_frame is not None
+            and traj_data.data.frame.min() <= self._last_frame
+        ):
+            raise ValueError(
+                "The new frames need to be after the last frame added "
+                f"({self._last_frame}), but start at frame "
+                f"{traj_data.data.frame.min()}."
+            )
+
+        individual_voronoi_data = compute_individual_voronoi_polygons(
+            traj_data=traj_data,
+            walkable_area=self.walkable_area,
+            cut_off=self.cut_off,
+            use_blind_points=self.use_blind_points,
+        )
+
+        new_density = self._to_density_frame(frames=[], densities=[])
+        if not individual_voronoi_data.empty:
+            new_density, voronoi_data = compute_voronoi_density(
+                individual_voronoi_data=individual_voronoi_data,
+                measurement_area=self.measurement_area,
+            )
+
+            # new frames before the first one with data have no density
+            if self._last_frame is not None:
+                new_density = pd.concat(
+                    [
+                        self._to_density_frame(
+                            frames=range(
+                                self._last_frame + 1, new_density.index.min()
+                            ),
+                            densities=0.0,
+                        ),
+                        new_density,
+                    ]
+                )
+            self._updates.append((new_density, voronoi_data))
+
+        self._last_frame = int(traj_data.data.frame.max())
+        self._evict_frames(first_frame=self._last_frame - self.window_size + 1)
+
+        return new_density
+
+    @property
+    def density(self) -> pd.DataFrame:
+        """Voronoi density of the frames in the current window.
+
+        Returns:
+            DataFrame containing the columns 'frame' and 'density' in
+            :math:`1/m^2`, same as :func:`compute_voronoi_density`
+        """
+        if not self._updates:
+            return self._to_density_frame(frames=[], densities=[])
+        return pd.concat([density for density, _ in self._updates])
+
+    @property
+    def voronoi_data(self) -> pd.DataFrame:
+        """Voronoi data of the frames in the current window.
+
+        Returns:
+            DataFrame containing the columns: 'id', 'frame', 'polygon',
+            'density', and 'intersection', same as
+            :func:`compute_voronoi_density`
+        """
+        if not self._updates:
+            return pd.DataFrame()
+        return pd.concat(
+            [voronoi_data for _, voronoi_data in self._updates],
+            ignore_index=True,
+        )
+
+    def _evict_frames(self, *, first_frame: int) -> None:
+        """Remove all frames before the given frame.
+
+        Args:
+            first_frame (int): first frame, which is kept
+        """
+        while self._updates and self._updates[0][0].index.max() < first_frame:
+            self._updates.popleft()
+
+        if self._updates and self._updates[0][0].index.min() < first_frame:
+            density, voronoi_data = self._updates.popleft()
+            self._updates.appendleft(
+                (
+                    density[density.index >= first_frame],
+                    voronoi_data[voronoi_data.frame >= first_frame],
+                )
+            )
+
+    @staticmethod
+    def _to_density_frame(
+        *, frames: Iterable[int], densities: Union[float, List[float]]
+    ) -> pd.DataFrame:
+        """Create a DataFrame in the format of the Voronoi density.
+
+        Args:
+            frames (Iterable[int]): frames of the density
+            densities (Union[float, List[float]]): density values for each
+                frame, or one value used for all frames
+
+        Returns:
+            DataFrame containing the columns 'frame' and 'density'
+        """
+        return pd.DataFrame(
+            {DENSITY_COL: densities},
+            index=pd.Index(list(frames), dtype=np.int64, name=FRAME_COL),
+            dtype=np.float64,
+        )
+
+
 def compute_passing_density(
     *, density_per_frame: pd.DataFrame, frames: pd.DataFrame
 ) -> pd.DataFrame:
@@ -168,6 +587,12 @@ def compute_passing_density(
     respectively. And :math:`fps` is the
     :attr:`~trajectory_data.TrajectoryData.frame_rate` of the trajectory data.
 
+    The mean density of each pedestrian is computed from the cumulative sum
+    of the density per frame, so the effort per pedestrian does not depend on
+    the length of the interval. Frames missing in :code:`density_per_frame`
+    are not considered in the mean, if no frame of the interval is present,
+    the density is NaN.
+
     Args:
         density_per_frame (pd.DataFrame): density per frame, result from
             :func:`~density_calculator.compute_classic_density`
@@ -180,18 +605,33 @@ def compute_passing_density(
     """
     density = pd.DataFrame(frames.id, columns=[ID_COL, DENSITY_COL])
 
-    densities = []
-    for _, row in frames.iterrows():
-        densities.append(
-            density_per_frame[
-                density_per_frame.index.to_series().between(
-                    int(row.entering_frame),
-                    int(row.leaving_frame),
-                    inclusive="left",
-                )
-            ].mean()
-        )
-    density.density = np.array(densities)
+    density_per_frame = density_per_frame.sort_index(kind="stable")
+    frame_values = density_per_frame.index.to_numpy()
+    density_values = density_per_frame[DENSITY_COL].to_numpy(dtype=np.float64)
+    has_density = ~np.isnan(density_values)
+
+    # prefix sums with a leading zero, the sum over [lower, upper) is the
+    # difference of the entries upper and lower
+    cumulative_density = np.concatenate(
+        ([0.0], np.cumsum(np.where(has_density, density_values, 0.0)))
+    )
+    cumulative_count = np.concatenate(([0], np.cumsum(has_density)))
+
+    lower = np.searchsorted(
+        frame_values, frames[FIRST_FRAME_COL].to_numpy(), side="left"
+    )
+    upper = np.searchsorted(
+        frame_values, frames[LAST_FRAME_COL].to_numpy(), side="left"
+    )
+    upper = np.maximum(upper, lower)
+
+    num_frames = cumulative_count[upper] - cumulative_count[lower]
+    density[DENSITY_COL] = np.divide(
+        cumulative_density[upper] - cumulative_density[lower],
+        num_frames,
+        out=np.full(len(frames), np.nan),
+        where=num_frames > 0,
+    )
     return density
 
 
@@ -1,26 +1,34 @@
 """Module containing functions to compute flows."""
-from typing import Tuple
+from typing import Iterable, Iterator, Sequence, Set, Tuple
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
 from pedpy.column_identifier import (
     CUMULATED_COL,
+    DIRECTION_COL,
     FLOW_COL,
     FRAME_COL,
     ID_COL,
+    LINE_COL,
     MEAN_SPEED_COL,
     SPEED_COL,
     TIME_COL,
 )
 from pedpy.data.geometry import MeasurementLine
-from pedpy.data.trajectory_data import TrajectoryData
-from pedpy.methods.method_utils import compute_crossing_frames
+from pedpy.data.trajectory_data import TrajectoryChunk, TrajectoryData
+from pedpy.methods.method_utils import (
+    compute_crossing_frames,
+    compute_crossing_frames_multi,
+)
 
 
 def compute_n_t(
     *,
     traj_data: TrajectoryData,
     measurement_line: MeasurementLine,
+    by_direction: bool = False,
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """Compute the frame-wise cumulative number of pedestrians passing the line.
 
@@ -29,60 +37,296 @@ def compute_n_t(
     not end on it. Then the next frame when the movement starts on the line
     is counted as crossing frame.
 
+    With :code:`by_direction=True` the pedestrians are counted separately
+    for both directions of crossing (see
+    :func:`~method_utils.compute_crossing_frames`): 1 for crossing from the
+    left to the right of the line, seen from its first to its second point,
+    and -1 for the opposite direction. Movements along the line are not
+    counted. The results are returned in long form, with the direction as
+    additional level or column 'direction'. The result for one direction is
+    given by :code:`n_t.loc[direction]` and
+    :code:`crossing_frames[crossing_frames.direction == direction]`. Both
+    can also be passed directly to :func:`compute_flow`, which then computes
+    the flow for each direction. Stepping on the line and back to the side
+    the pedestrian came from is not counted in either direction (see
+    :code:`ignore_touching` in :func:`~method_utils.compute_crossing_frames`).
+
     .. warning::
 
         For each pedestrian only the first passing of the line is considered!
+        With :code:`by_direction=True`, this applies to each direction.
 
     Args:
         traj_data (TrajectoryData): trajectory data
         measurement_line (MeasurementLine): line for which n-t is computed
+        by_direction (bool): if True, count the pedestrians separately for
+            each direction of crossing (default: False)
 
     Returns:
         DataFrame containing the columns 'frame', 'cumulative_pedestrians',
         and 'time' since frame 0, and DataFrame containing the columns 'ID',
         and 'frame' which gives the frame the pedestrian crossed the
-        measurement line.
+        measurement line. With :code:`by_direction=True` the first DataFrame
+        is indexed by 'direction' and 'frame', and the second additionally
+        contains the column 'direction'.
 
     """
     crossing_frames = compute_crossing_frames(
-        traj_data=traj_data, measurement_line=measurement_line
+        traj_data=traj_data,
+        measurement_line=measurement_line,
+        ignore_touching=by_direction,
     )
+    frames = range(traj_data.data.frame.min(), traj_data.data.frame.max() + 1)
+
+    if by_direction:
+        crossing_frames = (
+            crossing_frames[crossing_frames[DIRECTION_COL] != 0]
+            .groupby(by=[DIRECTION_COL, ID_COL])[FRAME_COL]
+            .min()
+            .reset_index()
+            .sort_values(by=[DIRECTION_COL, FRAME_COL], kind="stable")
+            .reset_index(drop=True)
+        )
+        n_t = _compute_cumulative_count_per_group(
+            crossing_frames=crossing_frames,
+            group_col=DIRECTION_COL,
+            groups=[-1, 1],
+            frames=frames,
+            frame_rate=traj_data.frame_rate,
+        )
+        return n_t, crossing_frames
+
     crossing_frames = (
         crossing_frames.groupby(by=ID_COL)[FRAME_COL]
         .min()
-        .sort_values()
+        .sort_values(kind="stable")
+        .reset_index()
+    )
+
+    n_t = _compute_cumulative_count(
+        crossing_frames=crossing_frames,
+        frames=frames,
+        frame_rate=traj_data.frame_rate,
+        initial_count=0,
+    )
+    return n_t, crossing_frames
+
+
+def compute_n_t_multi(
+    *,
+    traj_data: TrajectoryData,
+    measurement_lines: Sequence[MeasurementLine],
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Compute the cumulative number of pedestrians passing multiple lines.
+
+    Computes the same results as :func:`compute_n_t` for each of the given
+    measurement lines, but the movement of the pedestrians is computed at most
+    once and shared by all lines, which are then tested one after another
+    (see :func:`~method_utils.compute_crossing_frames_multi`).
+
+    The results are returned in long form, with the index of the measurement
+    line in :code:`measurement_lines` as additional level or column 'line'.
+    The result of :func:`compute_n_t` for the i-th line is given by
+    :code:`n_t.loc[i]` and
+    :code:`crossing_frames[crossing_frames.line == i]`, which can also be
+    passed directly to :func:`compute_flow`.
+
+    .. warning::
+
+        For each pedestrian only the first passing of each line is considered!
+
+    Args:
+        traj_data (TrajectoryData): trajectory data
+        measurement_lines (Sequence[MeasurementLine]): lines for which n-t is
+            computed
+
+    Returns:
+        DataFrame indexed by 'line' and 'frame' containing the columns
+        'cumulative_pedestrians', and 'time' since frame 0, and DataFrame
+        containing the columns 'line', 'ID', and 'frame' which gives the
+        frame the pedestrian crossed the measurement line.
+    """
+    if len(measurement_lines) == 0:
+        raise ValueError("At least one measurement line is needed.")
+
+    crossing_frames = compute_crossing_frames_multi(
+        traj_data=traj_data, measurement_lines=measurement_lines
+    )
+    crossing_frames = (
+        crossing_frames.groupby(by=[LINE_COL, ID_COL])[FRAME_COL]
+        .min()
         .reset_index()
+        .sort_values(by=[LINE_COL, FRAME_COL], kind="stable")
+    )
+    n_t = _compute_cumulative_count_per_group(
+        crossing_frames=crossing_frames,
+        group_col=LINE_COL,
+        groups=range(len(measurement_lines)),
+        frames=range(
+            traj_data.data.frame.min(), traj_data.data.frame.max() + 1
+        ),
+        frame_rate=traj_data.frame_rate,
     )
 
+    return n_t, crossing_frames.reset_index(drop=True)
+
+
+def compute_n_t_chunked(
+    *,
+    traj_chunks: Iterable[TrajectoryChunk],
+    measurement_line: MeasurementLine,
+) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """Compute the cumulative number of pedestrians passing the line chunk wise.
+
+    Incremental counterpart of :func:`compute_n_t`, which processes the
+    trajectory chunk by chunk, e.g., as created by
+    :func:`~trajectory_loader.load_trajectory_chunks`. Only the current chunk
+    needs to be kept in memory, between the chunks only the ids of the
+    pedestrians who already passed the line and their number are kept.
+
+    For each chunk the results for the frames of the chunk are returned, in
+    the same format as :func:`compute_n_t`. Concatenating the results of all
+    chunks gives the same result as :func:`compute_n_t` for the complete
+    trajectory.
+
+    Note:
+        The crossing of the line is determined from the movement to the next
+        frame. Hence, the chunks need to overlap by at least one frame
+        (:code:`overlap_frames=1`).
+
+    Args:
+        traj_chunks (Iterable[TrajectoryChunk]): trajectory chunks in
+            ascending order of their frames
+        measurement_line (MeasurementLine): line for which n-t is computed
+
+    Returns:
+        Iterator over the results for each chunk. Each result contains a
+        DataFrame containing the columns 'frame', 'cumulative_pedestrians',
+        and 'time' since frame 0 for the frames of the chunk, and a DataFrame
+        containing the columns 'ID', and 'frame' for the pedestrians who
+        first crossed the line in the chunk.
+    """
+    crossed_ids: Set[int] = set()
+
+    for chunk in traj_chunks:
+        crossing_frames = compute_crossing_frames(
+            traj_data=chunk.traj_data, measurement_line=measurement_line
+        )
+        crossing_frames = crossing_frames[
+            crossing_frames[FRAME_COL].between(
+                chunk.first_frame, chunk.last_frame
+            )
+            & ~crossing_frames[ID_COL].isin(crossed_ids)
+        ]
+        crossing_frames = (
+            crossing_frames.groupby(by=ID_COL)[FRAME_COL]
+            .min()
+            .sort_values(kind="stable")
+            .reset_index()
+        )
+        crossing_frames.index = pd.RangeIndex(
+            len(crossed_ids), len(crossed_ids) + len(crossing_frames.index)
+        )
+
+        n_t = _compute_cumulative_count(
+            crossing_frames=crossing_frames,
+            frames=range(chunk.first_frame, chunk.last_frame + 1),
+            frame_rate=chunk.traj_data.frame_rate,
+            initial_count=len(crossed_ids),
+        )
+        crossed_ids.update(crossing_frames[ID_COL])
+
+        yield n_t, crossing_frames
+
+
+def _compute_cumulative_count(
+    *,
+    crossing_frames: pd.DataFrame,
+    frames: range,
+    frame_rate: float,
+    initial_count: int,
+) -> pd.DataFrame:
+    """Compute the cumulative number of crossing pedestrians for each frame.
+
+    Args:
+        crossing_frames (pd.DataFrame): DataFrame containing the columns 'ID'
+            and 'frame', with the first crossing for each pedestrian
+        frames (range): frames for which the cumulative number is computed
+        frame_rate (float): frame rate of the trajectory
+        initial_count (int): number of pedestrians crossed before the first
+            frame
+
+    Returns:
+        DataFrame containing the columns 'frame', 'cumulative_pedestrians',
+        and 'time' since frame 0
+    """
     n_t = (
         crossing_frames.groupby(by=FRAME_COL)[FRAME_COL]
         .size()
         .cumsum()
         .rename(CUMULATED_COL)
+        + initial_count
     )
 
     # add missing values, to get values for each frame. First fill everything
-    # with the previous valid value (fillna('ffill')). When this is done only
+    # with the previous valid value (ffill()). When this is done only
     # the frame at the beginning where no one has passed the line yet area
-    # missing (fillna(0)).
-    n_t = (
-        n_t.reindex(
-            list(
-                range(
-                    traj_data.data.frame.min(), traj_data.data.frame.max() + 1
-                )
-            )
-        )
-        .fillna(method="ffill")
-        .fillna(0)
-    )
+    # missing (fillna(initial_count)).
+    n_t = n_t.reindex(list(frames)).ffill().fillna(initial_count)
+    n_t.index.name = FRAME_COL
 
     n_t = n_t.to_frame()
     n_t.cumulative_pedestrians = n_t.cumulative_pedestrians.astype(int)
 
     # frame number is the index
-    n_t[TIME_COL] = n_t.index / traj_data.frame_rate
-    return n_t, crossing_frames
+    n_t[TIME_COL] = n_t.index / frame_rate
+    return n_t
+
+
+def _compute_cumulative_count_per_group(
+    *,
+    crossing_frames: pd.DataFrame,
+    group_col: str,
+    groups: Sequence[int],
+    frames: range,
+    frame_rate: float,
+) -> pd.DataFrame:
+    """Compute the cumulative number of crossing pedestrians for each group.
+
+    Args:
+        crossing_frames (pd.DataFrame): DataFrame containing the columns
+            :data:`group_col`, 'ID' and 'frame', with the first crossing for
+            each pedestrian in each group
+        group_col (str): column identifying the group, e.g., the line
+        groups (Sequence[int]): groups for which the cumulative number is
+            computed, groups without crossings are included as well
+        frames (range): frames for which the cumulative number is computed
+        frame_rate (float): frame rate of the trajectory
+
+    Returns:
+        DataFrame indexed by :data:`group_col` and 'frame' containing the
+        columns 'cumulative_pedestrians', and 'time' since frame 0
+    """
+    crossing_frames_per_group = dict(
+        list(crossing_frames.groupby(by=group_col)[[ID_COL, FRAME_COL]])
+    )
+    empty_crossing_frames = crossing_frames[[ID_COL, FRAME_COL]].iloc[:0]
+
+    return pd.concat(
+        [
+            _compute_cumulative_count(
+                crossing_frames=crossing_frames_per_group.get(
+                    group, empty_crossing_frames
+                ),
+                frames=frames,
+                frame_rate=frame_rate,
+                initial_count=0,
+            )
+            for group in groups
+        ],
+        keys=list(groups),
+        names=[group_col, FRAME_COL],
+    )
 
 
 def compute_flow(
@@ -140,6 +384,10 @@ def compute_flow(
 
         v_{crossing} = {1 \over N^{\Delta t} } \sum^{N^{\Delta t}}_{i=1} v_i(t)
 
+    If :data:`nt` and :data:`crossing_frames` were computed with
+    :code:`by_direction=True` (see :func:`~flow_calculator.compute_n_t`),
+    the flow is computed separately for each direction.
+
     Args:
         nt (pd.DataFrame): DataFrame containing the columns 'frame',
             'cumulative_pedestrians', and 'time' (see result from
@@ -154,39 +402,131 @@ def compute_flow(
 
     Returns:
         DataFrame containing the columns 'flow' in 1/s, and 'mean_speed' in m/s.
+        If computed by direction, the DataFrame additionally contains the
+        column 'direction'.
     """
+    if DIRECTION_COL in nt.index.names:
+        return pd.concat(
+            [
+                compute_flow(
+                    nt=nt.xs(direction, level=DIRECTION_COL),
+                    crossing_frames=crossing_frames[
+                        crossing_frames[DIRECTION_COL] == direction
+                    ][[ID_COL, FRAME_COL]],
+                    individual_speed=individual_speed,
+                    delta_frame=delta_frame,
+                    frame_rate=frame_rate,
+                ).assign(**{DIRECTION_COL: direction})[
+                    [DIRECTION_COL, FLOW_COL, MEAN_SPEED_COL]
+                ]
+                for direction in nt.index.unique(level=DIRECTION_COL)
+            ],
+            ignore_index=True,
+        )
+
     crossing_speeds = pd.merge(
         crossing_frames, individual_speed, on=[ID_COL, FRAME_COL]
     )
 
+    cumulated = nt[CUMULATED_COL].to_numpy()
+
     # Get frame where the first person passes the line
-    num_passed_before = 0
-    passed_frame_before = nt[nt[CUMULATED_COL] > 0].index.min()
+    first_passed_frame = nt[nt[CUMULATED_COL] > 0].index.min()
+    if pd.isna(first_passed_frame):
+        return pd.DataFrame(columns=[FLOW_COL, MEAN_SPEED_COL], dtype=float)
+
+    # The number of passed pedestrians is evaluated every delta_frame frames,
+    # a new interval ends, whenever this number changed since the last
+    # evaluation.
+    passed_num_peds = (
+        nt[CUMULATED_COL]
+        .loc[
+            np.arange(
+                first_passed_frame + delta_frame, nt.index.max(), delta_frame
+            )
+        ]
+        .to_numpy()
+    )
+    num_passing_peds = np.diff(passed_num_peds, prepend=0)
+    has_passing_peds = num_passing_peds != 0
+    passed_num_peds = passed_num_peds[has_passing_peds]
+    num_passing_peds = num_passing_peds[has_passing_peds]
+
+    # Each interval ends one frame after the first frame, when the number of
+    # passed pedestrians was reached, and the next interval starts there.
+    passed_frames = (
+        nt.index.to_numpy()[
+            np.searchsorted(cumulated, passed_num_peds, side="left")
+        ]
+        + 1
+    )
+    passed_frames_before = np.concatenate(
+        ([first_passed_frame], passed_frames)
+    )[:-1]
+    flow_rate = (
+        num_passing_peds / (passed_frames - passed_frames_before) * frame_rate
+    )
 
-    rows = []
+    mean_speed = _compute_mean_in_frame_ranges(
+        frames=crossing_speeds[FRAME_COL].to_numpy(),
+        values=crossing_speeds[SPEED_COL].to_numpy(dtype=np.float64),
+        first_frames=passed_frames_before,
+        last_frames=passed_frames,
+    )
 
-    for frame in range(
-        passed_frame_before + delta_frame, nt.index.max(), delta_frame
-    ):
-        passed_num_peds = nt.loc[frame][CUMULATED_COL]
-        passed_frame = nt[nt[CUMULATED_COL] == passed_num_peds].index.min() + 1
+    return pd.DataFrame({FLOW_COL: flow_rate, MEAN_SPEED_COL: mean_speed})
 
-        if passed_num_peds != num_passed_before:
-            num_passing_peds = passed_num_peds - num_passed_before
-            time_range = passed_frame - passed_frame_before
 
-            flow_rate = num_passing_peds / time_range * frame_rate
-            velocity = crossing_speeds[
-                crossing_speeds.frame.between(
-                    passed_frame_before, passed_frame, inclusive="both"
-                )
-            ][SPEED_COL].mean()
+def _compute_mean_in_frame_ranges(
+    *,
+    frames: npt.NDArray[np.int64],
+    values: npt.NDArray[np.float64],
+    first_frames: npt.NDArray[np.int64],
+    last_frames: npt.NDArray[np.int64],
+) -> npt.NDArray[np.float64]:
+    """Compute the mean of the values in each of the given frame ranges.
 
-            num_passed_before = passed_num_peds
-            passed_frame_before = passed_frame
+    The frame ranges may overlap, NaN values are ignored. If a frame range
+    does not contain any value, the mean is NaN.
 
-            rows.append(
-                {FLOW_COL: flow_rate, MEAN_SPEED_COL: velocity},
-            )
+    Args:
+        frames (npt.NDArray[np.int64]): frame of each value
+        values (npt.NDArray[np.float64]): values to average
+        first_frames (npt.NDArray[np.int64]): first frame of each range
+            (inclusive)
+        last_frames (npt.NDArray[np.int64]): last frame of each range
+            (inclusive)
 
-    return pd.DataFrame(rows)
+    Returns:
+        Mean value in each frame range
+    """
+    if len(first_frames) == 0:
+        return np.zeros(0)
+
+    order = np.argsort(frames, kind="stable")
+    frames = frames[order]
+    values = values[order]
+    is_valid = ~np.isnan(values)
+
+    # reduceat over the interleaved boundaries [start_0, end_0, start_1, ...]
+    # sums the values in each range at the even positions, the appended zero
+    # allows ranges ending at the last value
+    boundaries = np.stack(
+        [
+            np.searchsorted(frames, first_frames, side="left"),
+            np.searchsorted(frames, last_frames, side="right"),
+        ],
+        axis=1,
+    ).ravel()
+    sums = np.add.reduceat(
+        np.append(np.where(is_valid, values, 0.0), 0.0), boundaries
+    )[::2]
+    counts = np.add.reduceat(
+        np.append(is_valid, False).astype(int), boundaries
+    )[::2]
+
+    # reduceat returns the value at the start for empty ranges
+    counts[boundaries[::2] == boundaries[1::2]] = 0
+    return np.divide(
+        sums, counts, out=np.full(len(sums), np.nan), where=counts > 0
+    )
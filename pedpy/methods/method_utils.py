@@ -1,30 +1,41 @@
 """Helper functions for the analysis methods."""
+import concurrent.futures
+import fractions
+import functools
 import itertools
 import logging
 from collections import defaultdict
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple, Union
 
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
 import shapely
 from aenum import Enum, auto
 from scipy.spatial import Voronoi
 
 from pedpy.column_identifier import (
+    COUNT_COL,
     CROSSING_FRAME_COL,
     DENSITY_COL,
+    DIRECTION_COL,
     DISTANCE_COL,
-    END_POSITION_COL,
+    END_X_COL,
+    END_Y_COL,
     FIRST_FRAME_COL,
     FRAME_COL,
     ID_COL,
     INTERSECTION_COL,
     LAST_FRAME_COL,
+    LINE_COL,
+    MAX_NEIGHBORS_COL,
+    MEAN_NEIGHBORS_COL,
+    MIN_NEIGHBORS_COL,
     NEIGHBORS_COL,
-    POINT_COL,
     POLYGON_COL,
-    START_POSITION_COL,
+    START_X_COL,
+    START_Y_COL,
     TIME_COL,
     WINDOW_SIZE_COL,
     X_COL,
@@ -32,9 +43,20 @@ from pedpy.column_identifier import (
 )
 from pedpy.data.geometry import MeasurementArea, MeasurementLine, WalkableArea
 from pedpy.data.trajectory_data import TrajectoryData
+from pedpy.methods.analysis_cache import cached, get_or_compute_cached
 
 _log = logging.getLogger(__name__)
 
+_VORONOI_CHUNKS_PER_WORKER = 4
+
+# relative error bound of the floating point orientation determinant, below
+# it the orientation is computed exactly
+_ORIENTATION_ERROR_BOUND = 1e-15
+
+# maximum number of cells of the grid used to find positions in areas, such
+# that the cell indices fit into 16 bit
+_MAX_POSITION_GRID_CELLS = 2**14
+
 
 class SpeedCalculation(Enum):  # pylint: disable=too-few-public-methods
     """Identifier for the method used to compute the movement at traj borders."""
@@ -95,7 +117,9 @@ def get_invalid_trajectory(
         DataFrame showing all data points outside the given walkable area
     """
     return traj_data.data.loc[
-        ~shapely.within(traj_data.data.point, walkable_area.polygon)
+        ~shapely.contains_xy(
+            walkable_area.polygon, traj_data.data.x, traj_data.data.y
+        )
     ]
 
 
@@ -165,82 +189,140 @@ def compute_frame_range_in_area(
         traj_data=traj_data, measurement_area=measurement_area
     )
 
-    crossing_frames_first = compute_crossing_frames(
-        traj_data=traj_data, measurement_line=measurement_line
-    )
-    crossing_frames_second = compute_crossing_frames(
-        traj_data=traj_data, measurement_line=second_line
+    if inside_range.empty:
+        return inside_range, measurement_area
+
+    # crossings of both lines sharing the movement, line 0 is the given
+    # measurement line, line 1 the created second line
+    crossing_frames = compute_crossing_frames_multi(
+        traj_data=traj_data, measurement_lines=[measurement_line, second_line]
     )
 
-    start_crossed_1 = _check_crossing_in_frame_range(
-        inside_range=inside_range,
-        crossing_frames=crossing_frames_first,
-        check_column=FIRST_FRAME_COL,
-        column_name="start_crossed_1",
+    # the movements into and out of the area need to touch the lines, which
+    # includes the movements ending on a line
+    touching_frames = _compute_touching_frames(
+        traj_data=traj_data,
+        crossing_frames=crossing_frames,
+        measurement_lines=[measurement_line, second_line],
     )
-    end_crossed_1 = _check_crossing_in_frame_range(
-        inside_range=inside_range,
-        crossing_frames=crossing_frames_first,
-        check_column=LAST_FRAME_COL,
-        column_name="end_crossed_1",
+    touching_keys = _pack_frame_keys(
+        ids=touching_frames[ID_COL].to_numpy(),
+        frames=touching_frames[FRAME_COL].to_numpy(),
+        traj_data=traj_data,
     )
-    start_crossed_2 = _check_crossing_in_frame_range(
-        inside_range=inside_range,
-        crossing_frames=crossing_frames_second,
-        check_column=FIRST_FRAME_COL,
-        column_name="start_crossed_2",
+    is_first_line = touching_frames[LINE_COL].to_numpy() == 0
+
+    entering_keys = _pack_frame_keys(
+        ids=inside_range[ID_COL].to_numpy(),
+        frames=inside_range[FIRST_FRAME_COL].to_numpy(),
+        traj_data=traj_data,
     )
-    end_crossed_2 = _check_crossing_in_frame_range(
-        inside_range=inside_range,
-        crossing_frames=crossing_frames_second,
-        check_column=LAST_FRAME_COL,
-        column_name="end_crossed_2",
+    leaving_keys = _pack_frame_keys(
+        ids=inside_range[ID_COL].to_numpy(),
+        frames=inside_range[LAST_FRAME_COL].to_numpy(),
+        traj_data=traj_data,
     )
 
-    frame_range_between_lines = (
-        start_crossed_1.merge(
-            start_crossed_2,
-            how="outer",
-            on=[ID_COL, FIRST_FRAME_COL, LAST_FRAME_COL],
+    start_crossed_1 = np.isin(entering_keys, touching_keys[is_first_line])
+    end_crossed_1 = np.isin(leaving_keys, touching_keys[is_first_line])
+    start_crossed_2 = np.isin(entering_keys, touching_keys[~is_first_line])
+    end_crossed_2 = np.isin(leaving_keys, touching_keys[~is_first_line])
+
+    frame_range_between_lines = inside_range[
+        (start_crossed_1 & end_crossed_2) | (start_crossed_2 & end_crossed_1)
+    ]
+
+    return frame_range_between_lines.reset_index(drop=True), measurement_area
+
+
+def _compute_touching_frames(
+    *,
+    traj_data: TrajectoryData,
+    crossing_frames: pd.DataFrame,
+    measurement_lines: List[MeasurementLine],
+) -> pd.DataFrame:
+    """Compute the frames in which the movements touch the measurement lines.
+
+    Unlike crossings, this includes the movements ending on a line. The
+    movement in a frame is the movement from the previous frame, which is
+    shortened at the borders of the trajectory. Hence, a position on a line
+    only touches it, if it is neither the first nor the last frame of the
+    pedestrian.
+
+    Args:
+        traj_data (TrajectoryData): trajectory data
+        crossing_frames (pd.DataFrame): crossings of the measurement lines as
+            returned by :func:`compute_crossing_frames_multi`
+        measurement_lines (List[MeasurementLine]): measurement lines, in the
+            same order as used for the crossings
+
+    Returns:
+        DataFrame containing the columns 'id', 'frame', 'line', where 'line'
+        is the index of the touched measurement line, may contain duplicates
+    """
+    data = traj_data.data
+    frame_range = data.groupby(by=ID_COL)[FRAME_COL].agg(["min", "max"])
+    has_movement = (
+        data[FRAME_COL].between(
+            data[ID_COL].map(frame_range["min"]),
+            data[ID_COL].map(frame_range["max"]),
+            inclusive="neither",
         )
-        .merge(
-            end_crossed_1,
-            how="outer",
-            on=[ID_COL, FIRST_FRAME_COL, LAST_FRAME_COL],
+    ).to_numpy()
+    x = data[X_COL].to_numpy(dtype=np.float64)
+    y = data[Y_COL].to_numpy(dtype=np.float64)
+
+    touching_frames = [crossing_frames[[ID_COL, FRAME_COL, LINE_COL]]]
+    for line_index, measurement_line in enumerate(measurement_lines):
+        is_on_line = has_movement & _compute_is_on_line(
+            x=x, y=y, measurement_line=measurement_line
         )
-        .merge(
-            end_crossed_2,
-            how="outer",
-            on=[ID_COL, FIRST_FRAME_COL, LAST_FRAME_COL],
+        touching_frames.append(
+            data.loc[is_on_line, [ID_COL, FRAME_COL]].assign(
+                **{LINE_COL: line_index}
+            )
         )
-    )
 
-    frame_range_between_lines = frame_range_between_lines[
-        (
-            frame_range_between_lines.start_crossed_1
-            & frame_range_between_lines.end_crossed_2
-        )
-        | (
-            frame_range_between_lines.start_crossed_2
-            & frame_range_between_lines.end_crossed_1
-        )
-    ]
+    return pd.concat(touching_frames, ignore_index=True)
 
-    return (
-        frame_range_between_lines.loc[
-            :, (ID_COL, FIRST_FRAME_COL, LAST_FRAME_COL)
-        ],
-        measurement_area,
-    )
+
+def _pack_frame_keys(
+    *,
+    ids: npt.NDArray[np.int64],
+    frames: npt.NDArray[np.int64],
+    traj_data: TrajectoryData,
+) -> npt.NDArray[np.int64]:
+    """Pack the pairs of id and frame into a single key for fast lookups.
+
+    Args:
+        ids (npt.NDArray[np.int64]): ids of the pedestrians
+        frames (npt.NDArray[np.int64]): frames, may be one after the last
+            frame of the trajectory data
+        traj_data (TrajectoryData): trajectory data the ids and frames belong
+            to
+
+    Returns:
+        Keys, which are equal if and only if id and frame are equal
+    """
+    min_id = traj_data.data[ID_COL].min()
+    min_frame = traj_data.data[FRAME_COL].min()
+    num_frames = traj_data.data[FRAME_COL].max() - min_frame + 2
+
+    return (ids - min_id) * num_frames + (frames - min_frame)
 
 
 def compute_neighbors(individual_voronoi_data: pd.DataFrame) -> pd.DataFrame:
-    """Compute the neighbors of each pedestrian based on the Voronoi cells.
+    r"""Compute the neighbors of each pedestrian based on the Voronoi cells.
 
     Computation of the neighborhood of each pedestrian per frame. Every other
     pedestrian is a neighbor if the Voronoi cells of both pedestrian touch
     and some point. The threshold for touching is set to 1mm.
 
+    Only the pairs of Voronoi cells with intersecting bounding boxes, found
+    with a :class:`shapely.STRtree`, are checked for touching. Hence, the
+    computation scales with :math:`N \log N` instead of :math:`N^2` for
+    :math:`N` pedestrians per frame.
+
     Args:
         individual_voronoi_data (pd.DataFrame): individual voronoi data, needs
             to contain a column 'polygon', which holds a
@@ -251,45 +333,312 @@ def compute_neighbors(individual_voronoi_data: pd.DataFrame) -> pd.DataFrame:
         DataFrame containing the columns 'id', 'frame' and 'neighbors', where
         neighbors are a list of the neighbor's IDs
     """
-    neighbor_df = []
+    return compute_neighbor_list(individual_voronoi_data).to_dataframe()
+
+
+@dataclass(frozen=True)
+class NeighborList:
+    """Neighbors of each pedestrian per frame in a compressed sparse row format.
+
+    Instead of storing a list of neighbor IDs per row, as in the result of
+    :func:`compute_neighbors`, the neighbors of all rows are stored in a
+    single array :attr:`neighbor_ids`. The neighbors of row :code:`i` are
+    :code:`neighbor_ids[offsets[i]:offsets[i + 1]]`. The rows are sorted by
+    frame. The neighbor IDs are stored as 32 bit integers, if all pedestrian
+    IDs are in their range, otherwise as 64 bit integers.
+
+    Attributes:
+        ids (npt.NDArray[np.int64]): ID of the pedestrian in each row
+        frames (npt.NDArray[np.int64]): frame of each row
+        offsets (npt.NDArray[np.int64]): start of the neighbors of each row in
+            :attr:`neighbor_ids`, with one additional value for the end
+        neighbor_ids (Union[npt.NDArray[np.int32], npt.NDArray[np.int64]]):
+            IDs of the neighbors of all rows
+    """
 
-    for frame, frame_data in individual_voronoi_data.groupby(FRAME_COL):
-        touching = shapely.dwithin(
-            np.array(frame_data[POLYGON_COL])[:, np.newaxis],
-            np.array(frame_data[POLYGON_COL])[np.newaxis, :],
-            1e-9,  # Voronoi cells as close as 1 mm are touching
+    ids: npt.NDArray[np.int64]
+    frames: npt.NDArray[np.int64]
+    offsets: npt.NDArray[np.int64]
+    neighbor_ids: Union[npt.NDArray[np.int32], npt.NDArray[np.int64]]
+    _lookup: Optional[
+        Tuple[
+            npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]
+        ]
+    ] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def num_neighbors(self) -> npt.NDArray[np.int64]:
+        """Number of neighbors of each row.
+
+        Returns:
+            Number of neighbors in the same order as the rows
+        """
+        return np.diff(self.offsets)
+
+    def find_rows(
+        self, *, ped_ids: npt.ArrayLike, frames: npt.ArrayLike
+    ) -> npt.NDArray[np.int64]:
+        """Find the rows of the given pedestrians and frames.
+
+        Args:
+            ped_ids (npt.ArrayLike): IDs of the pedestrians
+            frames (npt.ArrayLike): frames, same length as :code:`ped_ids`
+
+        Returns:
+            Index of the row for each pair of ID and frame, -1 if there is no
+            such row
+        """
+        ped_ids, frames = np.broadcast_arrays(
+            np.asarray(ped_ids, dtype=np.int64),
+            np.asarray(frames, dtype=np.int64),
+        )
+        if len(self.ids) == 0:
+            return np.full(ped_ids.shape, -1, dtype=np.int64)
+
+        lookup = self._lookup
+        if lookup is None:
+            unique_ids, id_index = np.unique(self.ids, return_inverse=True)
+            lookup_keys = self._get_lookup_keys(
+                id_index=id_index, frames=self.frames, num_ids=len(unique_ids)
+            )
+            lookup_order = np.argsort(lookup_keys, kind="stable")
+            lookup = (unique_ids, lookup_order, lookup_keys[lookup_order])
+            object.__setattr__(self, "_lookup", lookup)
+        unique_ids, lookup_order, sorted_keys = lookup
+
+        # the keys combine the frame and the index of the id in the unique
+        # ids, hence they are unique and sorted in the same way as the pairs
+        # (frame, id)
+        id_index = np.minimum(
+            np.searchsorted(unique_ids, ped_ids), len(unique_ids) - 1
+        )
+        is_valid = (
+            (frames >= self.frames[0])
+            & (frames <= self.frames[-1])
+            & (unique_ids[id_index] == ped_ids)
+        )
+        keys = self._get_lookup_keys(
+            id_index=id_index,
+            frames=np.where(is_valid, frames, self.frames[0]),
+            num_ids=len(unique_ids),
+        )
+        positions = np.minimum(
+            np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1
         )
 
-        # the peds are not neighbors of themselves
-        for i in range(len(touching)):
-            touching[i, i] = False
+        found = is_valid & (sorted_keys[positions] == keys)
+        return np.where(found, lookup_order[positions], -1)
+
+    def _get_lookup_keys(
+        self,
+        *,
+        id_index: npt.NDArray[np.int64],
+        frames: npt.NDArray[np.int64],
+        num_ids: int,
+    ) -> npt.NDArray[np.int64]:
+        """Combine frame and id to a single key.
+
+        Args:
+            id_index (npt.NDArray[np.int64]): index of the IDs of the
+                pedestrians in the sorted unique IDs of the rows
+            frames (npt.NDArray[np.int64]): frames
+            num_ids (int): number of unique IDs of the rows
+
+        Returns:
+            Key for each pair of frame and id
+        """
+        return (frames - self.frames[0]) * num_ids + id_index
+
+    def get_neighbors(
+        self, *, ped_id: int, frame: int
+    ) -> Union[npt.NDArray[np.int32], npt.NDArray[np.int64]]:
+        """Get the neighbors of a pedestrian in a frame.
+
+        Args:
+            ped_id (int): ID of the pedestrian
+            frame (int): frame
+
+        Returns:
+            IDs of the neighbors of the pedestrian in the frame
+        """
+        row = int(self.find_rows(ped_ids=ped_id, frames=frame))
+        if row < 0:
+            raise KeyError(
+                f"No neighbors for pedestrian {ped_id} in frame {frame} found."
+            )
+        return self.neighbor_ids[self.offsets[row] : self.offsets[row + 1]]
+
+    def compute_num_neighbors_statistics(self) -> pd.DataFrame:
+        """Compute statistics of the number of neighbors per frame.
+
+        Returns:
+            DataFrame containing the columns 'frame', 'num_peds', and the
+            'mean', 'min', and 'max' number of neighbors in the frame
+        """
+        num_neighbors = self.num_neighbors
+        frame_starts = np.flatnonzero(
+            np.diff(self.frames, prepend=self.frames[:1] - 1)
+        )
+        num_rows = np.diff(np.append(frame_starts, len(self.frames)))
+
+        if len(frame_starts) == 0:
+            return pd.DataFrame(
+                {
+                    column: pd.Series(dtype=dtype)
+                    for column, dtype in (
+                        (COUNT_COL, np.int64),
+                        (MEAN_NEIGHBORS_COL, np.float64),
+                        (MIN_NEIGHBORS_COL, np.int64),
+                        (MAX_NEIGHBORS_COL, np.int64),
+                    )
+                },
+                index=pd.Index([], dtype=np.int64, name=FRAME_COL),
+            )
 
-        # create matrix with ped IDs
-        ids = np.outer(
-            np.ones_like(frame_data[ID_COL].values),
-            frame_data[ID_COL].values.reshape(1, -1),
+        return pd.DataFrame(
+            {
+                COUNT_COL: num_rows,
+                MEAN_NEIGHBORS_COL: np.add.reduceat(num_neighbors, frame_starts)
+                / num_rows,
+                MIN_NEIGHBORS_COL: np.minimum.reduceat(
+                    num_neighbors, frame_starts
+                ),
+                MAX_NEIGHBORS_COL: np.maximum.reduceat(
+                    num_neighbors, frame_starts
+                ),
+            },
+            index=pd.Index(self.frames[frame_starts], name=FRAME_COL),
         )
 
-        neighbors = np.where(touching, ids, np.nan)
+    def to_dataframe(self) -> pd.DataFrame:
+        """Convert to the format returned by :func:`compute_neighbors`.
 
+        Returns:
+            DataFrame containing the columns 'id', 'frame' and 'neighbors',
+            where neighbors are a list of the neighbor's IDs
+        """
         neighbors_list = [
-            np.array(neighbor)[~np.isnan(np.array(neighbor))]
-            .astype(int)
-            .tolist()
-            for neighbor in neighbors
+            self.neighbor_ids[start:end].tolist()
+            for start, end in zip(self.offsets[:-1], self.offsets[1:])
         ]
 
-        frame_df = pd.DataFrame(
-            zip(
-                frame_data[ID_COL].values,
-                itertools.repeat(frame),
-                neighbors_list,
-            ),
-            columns=[ID_COL, FRAME_COL, NEIGHBORS_COL],
+        # each frame starts with index 0, as when concatenating the frames
+        frame_starts = np.flatnonzero(
+            np.diff(self.frames, prepend=self.frames[:1] - 1)
         )
-        neighbor_df.append(frame_df)
+        frame_sizes = np.diff(np.append(frame_starts, len(self.frames)))
+
+        return pd.DataFrame(
+            {
+                ID_COL: self.ids,
+                FRAME_COL: self.frames,
+                NEIGHBORS_COL: neighbors_list,
+            },
+            index=np.arange(len(self.frames))
+            - np.repeat(frame_starts, frame_sizes),
+        )
+
 
-    return pd.concat(neighbor_df)
+def compute_neighbor_list(
+    individual_voronoi_data: pd.DataFrame,
+) -> NeighborList:
+    """Compute the neighbors of each pedestrian as :class:`NeighborList`.
+
+    Same as :func:`compute_neighbors`, but the neighbors are returned in a
+    compact format, which needs considerably less memory than a list of
+    neighbors per row. It can be converted to the format of
+    :func:`compute_neighbors` with :meth:`NeighborList.to_dataframe`.
+
+    Args:
+        individual_voronoi_data (pd.DataFrame): individual voronoi data, needs
+            to contain a column 'polygon', which holds a
+            :class:`shapely.Polygon` (result from
+            :func:`~method_utils.compute_individual_voronoi_polygons`)
+
+    Returns:
+        :class:`NeighborList` containing the neighbors of each pedestrian in
+        each frame
+    """
+    # sort the data by frame, keeping the original order inside each frame,
+    # this is the same order a groupby over the frames would create
+    frame_order = np.argsort(
+        individual_voronoi_data[FRAME_COL].values, kind="stable"
+    )
+    frames = (
+        individual_voronoi_data[FRAME_COL].values[frame_order].astype(np.int64)
+    )
+    ids = individual_voronoi_data[ID_COL].values[frame_order].astype(np.int64)
+
+    ped, neighbor = _compute_touching_polygons(
+        polygons=individual_voronoi_data[POLYGON_COL].values[frame_order],
+        frames=frames,
+        distance=1e-9,  # Voronoi cells as close as 1 mm are touching
+    )
+
+    neighbor_order = np.lexsort((neighbor, ped))
+    return NeighborList(
+        ids=ids,
+        frames=frames,
+        offsets=np.concatenate(
+            [[0], np.cumsum(np.bincount(ped, minlength=len(ids)))]
+        ).astype(np.int64),
+        neighbor_ids=ids[neighbor[neighbor_order]].astype(
+            np.int32
+            if ids.size == 0
+            or (
+                ids.min() >= np.iinfo(np.int32).min
+                and ids.max() <= np.iinfo(np.int32).max
+            )
+            else np.int64
+        ),
+    )
+
+
+def _compute_touching_polygons(
+    *,
+    polygons: npt.NDArray[np.object_],
+    frames: npt.NDArray[np.int64],
+    distance: float,
+) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Compute the pairs of polygons in the same frame within the distance.
+
+    Instead of comparing all pairs of polygons in a frame, the candidate pairs
+    are determined by a query of the bounding boxes in a
+    :class:`shapely.STRtree`, and only these candidates are checked with
+    :func:`shapely.dwithin`. To handle all frames in a single tree, the
+    bounding boxes of each frame are shifted along the x-axis, such that the
+    bounding boxes of different frames can not intersect.
+
+    Args:
+        polygons (npt.NDArray[np.object_]): polygons sorted by frame
+        frames (npt.NDArray[np.int64]): frame of each polygon
+        distance (float): maximal distance between touching polygons
+
+    Returns:
+        Indices of the pairs of touching polygons (each pair is contained in
+        both orders, a polygon is not paired with itself)
+    """
+    if len(polygons) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    bounds = shapely.bounds(polygons)
+    # expand the bounds before shifting them, as rounding is monotonic, no
+    # candidate pairs are lost due to floating point errors
+    bounds[:, :2] -= distance
+    bounds[:, 2:] += distance
+
+    frame_width = bounds[:, 2].max() - bounds[:, 0].min() + 1.0
+    frame_rank = np.cumsum(np.diff(frames, prepend=frames[:1]) != 0)
+    bounds[:, [0, 2]] += (frame_rank * frame_width)[:, np.newaxis]
+
+    boxes = shapely.box(*bounds.T)
+    ped, neighbor = shapely.STRtree(boxes).query(boxes)
+
+    is_candidate = ped != neighbor
+    ped, neighbor = ped[is_candidate], neighbor[is_candidate]
+
+    is_touching = shapely.dwithin(polygons[ped], polygons[neighbor], distance)
+    return ped[is_touching], neighbor[is_touching]
 
 
 def compute_time_distance_line(
@@ -311,13 +660,13 @@ def compute_time_distance_line(
         DataFrame containing 'id', 'frame', 'time' (seconds until
         crossing),  and 'distance' (meters to measurement line)
     """
-    df_distance_time = traj_data.data[[ID_COL, FRAME_COL, POINT_COL]].copy(
-        deep=True
-    )
+    df_distance_time = traj_data.data[[ID_COL, FRAME_COL]].copy(deep=True)
 
     # Compute distance to measurement line
-    df_distance_time[DISTANCE_COL] = shapely.distance(
-        df_distance_time[POINT_COL], measurement_line.line
+    df_distance_time[DISTANCE_COL] = _compute_distance_to_line(
+        x=traj_data.data.x.values,
+        y=traj_data.data.y.values,
+        measurement_line=measurement_line,
     )
 
     # Compute time to entrance
@@ -335,12 +684,14 @@ def compute_time_distance_line(
     return df_distance_time.loc[:, [ID_COL, FRAME_COL, DISTANCE_COL, TIME_COL]]
 
 
+@cached(ignore=["n_workers"])
 def compute_individual_voronoi_polygons(
     *,
     traj_data: TrajectoryData,
     walkable_area: WalkableArea,
     cut_off: Optional[Cutoff] = None,
     use_blind_points: bool = True,
+    n_workers: Optional[int] = None,
 ) -> pd.DataFrame:
     """Compute the individual Voronoi polygon for each person and frame.
 
@@ -388,6 +739,13 @@ def compute_individual_voronoi_polygons(
     pedestrians walking in a line can lead to issues in the computation of the
     Voronoi tesselation.
 
+    As the Voronoi tesselation of each frame is independent of all other
+    frames, the computation can be distributed over several processes by
+    setting :code:`n_workers`. The frames are then split into contiguous
+    chunks, which are processed in a process pool. Only the coordinates and
+    the walkable area (as WKB) are sent to the worker processes. The result is
+    identical to the computation in a single process.
+
     Args:
         traj_data (TrajectoryData): trajectory data
         walkable_area (WalkableArea): bounding area, where pedestrian are
@@ -397,82 +755,49 @@ def compute_individual_voronoi_polygons(
         use_blind_points (bool): adds extra 4 points outside the walkable area
                 to also compute voronoi cells when less than 4 peds are in the
                 walkable area (default: on!)
+        n_workers (int): number of worker processes used for the computation,
+                None or 1 if the computation should be done in the current
+                process (default: None)
 
     Returns:
         DataFrame containing the columns 'id', 'frame','polygon' (
         :class:`shapely.Polygon`), and 'individual_density' in :math:`1/m^2`.
     """
-    dfs = []
-
-    bounds = walkable_area.polygon.bounds
-    x_diff = abs(bounds[2] - bounds[0])
-    y_diff = abs(bounds[3] - bounds[1])
-    clipping_diameter = 2 * max(x_diff, y_diff)
-
-    blind_points = np.array(
-        [
-            [100 * (bounds[0] - x_diff), 100 * (bounds[1] - y_diff)],
-            [100 * (bounds[2] + x_diff), 100 * (bounds[1] - y_diff)],
-            [100 * (bounds[0] - x_diff), 100 * (bounds[3] + y_diff)],
-            [100 * (bounds[2] + x_diff), 100 * (bounds[3] + y_diff)],
-        ]
+    # sort the data by frame, keeping the original order inside each frame,
+    # this is the same order a groupby over the frames would create
+    frame_order = np.argsort(traj_data.data.frame.values, kind="stable")
+    frames = traj_data.data.frame.values[frame_order]
+    points = traj_data.data[[X_COL, Y_COL]].values[frame_order]
+
+    compute_chunk = functools.partial(
+        _compute_voronoi_polygons_chunk,
+        walkable_area_wkb=shapely.to_wkb(walkable_area.polygon),
+        cut_off=cut_off,
+        use_blind_points=use_blind_points,
     )
 
-    for frame, peds_in_frame in traj_data.data.groupby(traj_data.data.frame):
-        points = peds_in_frame[[X_COL, Y_COL]].values
-        points = np.concatenate([points, blind_points])
-
-        # only skip analysis if less than 4 peds are in the frame and blind
-        # points are turned off
-        if not use_blind_points and len(points) - len(blind_points) < 4:
-            _log.warning(
-                f"Not enough pedestrians (N="
-                f"{len(points) -len(blind_points)}) available to "
-                f"calculate Voronoi cells for frame = {frame}. "
-                f"Consider enable use of blind points."
-            )
-            continue
-
-        vor = Voronoi(points)
-        voronoi_polygons = _clip_voronoi_polygons(vor, clipping_diameter)
-
-        voronoi_polygons = voronoi_polygons[:-4]
-        voronoi_in_frame = peds_in_frame.loc[:, (ID_COL, FRAME_COL, POINT_COL)]
-
-        # Compute the intersecting area with the walkable area
-        voronoi_in_frame[POLYGON_COL] = shapely.intersection(
-            voronoi_polygons, walkable_area.polygon
+    if n_workers is None or n_workers <= 1:
+        voronoi_polygons = compute_chunk(frames, points)
+    else:
+        chunk_borders = _get_frame_chunk_borders(
+            frames=frames, num_chunks=_VORONOI_CHUNKS_PER_WORKER * n_workers
         )
-
-        if cut_off is not None:
-            radius = cut_off.radius
-            quad_segments = cut_off.quad_segments
-            voronoi_in_frame.polygon = shapely.intersection(
-                voronoi_in_frame.polygon,
-                shapely.buffer(
-                    peds_in_frame.point,
-                    radius,
-                    quad_segs=quad_segments,
-                ),
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=n_workers
+        ) as executor:
+            voronoi_polygons = np.concatenate(
+                list(
+                    executor.map(
+                        compute_chunk,
+                        np.split(frames, chunk_borders),
+                        np.split(points, chunk_borders),
+                    )
+                )
             )
 
-        # Only consider the parts of a multipolygon which contain the position
-        # of the pedestrian
-        voronoi_in_frame.loc[
-            shapely.get_type_id(voronoi_in_frame.polygon) != 3,
-            POLYGON_COL,
-        ] = voronoi_in_frame.loc[
-            shapely.get_type_id(voronoi_in_frame.polygon) != 3, :
-        ].apply(
-            lambda row: shapely.get_parts(row[POLYGON_COL])[
-                shapely.within(row.point, shapely.get_parts(row.polygon))
-            ][0],
-            axis=1,
-        )
-
-        dfs.append(voronoi_in_frame)
-
-    result = pd.concat(dfs)[[ID_COL, FRAME_COL, POLYGON_COL]]
+    has_polygon = ~shapely.is_missing(voronoi_polygons)
+    result = traj_data.data.iloc[frame_order[has_polygon]][[ID_COL, FRAME_COL]]
+    result[POLYGON_COL] = voronoi_polygons[has_polygon]
     result[DENSITY_COL] = 1.0 / shapely.area(result.polygon)
 
     return result
@@ -507,8 +832,343 @@ def compute_intersecting_polygons(
     return df_intersection
 
 
+def _compute_points_in_areas(
+    *, traj_data: TrajectoryData, measurement_areas: Sequence[MeasurementArea]
+) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Compute which positions are inside which measurement areas.
+
+    The positions are sorted once into a coarse uniform grid over the bounds
+    of the areas (see :class:`_PositionGrid`). For each area only the
+    positions in the grid cells overlapping its bounds are checked with
+    :func:`_compute_is_inside_area`. No geometry objects are created for the
+    positions.
+
+    Args:
+        traj_data (TrajectoryData): trajectory data
+        measurement_areas (Sequence[MeasurementArea]): measurement areas
+
+    Returns:
+        Row in the trajectory data and index of the measurement area in
+        :data:`measurement_areas` for each position inside an area, sorted
+        by area and row
+    """
+    x = traj_data.data[X_COL].to_numpy(dtype=np.float64)
+    y = traj_data.data[Y_COL].to_numpy(dtype=np.float64)
+    grid = _PositionGrid.create(
+        x=x,
+        y=y,
+        bounds=shapely.total_bounds(
+            [measurement_area.polygon for measurement_area in measurement_areas]
+        ),
+    )
+
+    rows = []
+    areas = []
+    for area, measurement_area in enumerate(measurement_areas):
+        candidates = grid.find_candidates(
+            bounds=measurement_area.polygon.bounds
+        )
+        candidates = candidates[
+            _compute_is_inside_area(
+                measurement_area=measurement_area,
+                x=x[candidates],
+                y=y[candidates],
+            )
+        ]
+        rows.append(np.sort(candidates))
+        areas.append(np.full(len(candidates), area, dtype=np.int64))
+
+    return (
+        np.concatenate([np.empty(0, dtype=np.int64), *rows]),
+        np.concatenate([np.empty(0, dtype=np.int64), *areas]),
+    )
+
+
+@dataclass(frozen=True)
+class _PositionGrid:
+    """Coarse uniform grid over positions, to find positions near an area.
+
+    The rows of the positions strictly inside the bounds of the grid are
+    sorted by their grid cell. The positions of consecutive cells in one row
+    of the grid are then consecutive as well.
+
+    Attributes:
+        origin (Tuple[float, float]): lower left corner of the grid
+        cell_size (float): width and height of the grid cells
+        shape (Tuple[int, int]): number of grid cells in x and y direction
+        rows (npt.NDArray[np.int64]): rows of the positions, sorted by cell
+        cell_starts (npt.NDArray[np.int64]): index in :attr:`rows` of the
+            first position in each cell, and the number of positions at the
+            end
+    """
+
+    origin: Tuple[float, float]
+    cell_size: float
+    shape: Tuple[int, int]
+    rows: npt.NDArray[np.int64]
+    cell_starts: npt.NDArray[np.int64]
+
+    @staticmethod
+    def create(
+        *,
+        x: npt.NDArray[np.float64],
+        y: npt.NDArray[np.float64],
+        bounds: npt.NDArray[np.float64],
+    ) -> "_PositionGrid":
+        """Sorts the positions strictly inside the bounds into a grid.
+
+        The cells are chosen such that on average about four positions are
+        in each cell, but at most :data:`_MAX_POSITION_GRID_CELLS` cells are
+        used. This allows to sort the positions by their cell in linear time.
+
+        Args:
+            x (npt.NDArray[np.float64]): x-coordinates of the positions
+            y (npt.NDArray[np.float64]): y-coordinates of the positions
+            bounds (npt.NDArray[np.float64]): min x, min y, max x, and max y
+                of the grid
+
+        Returns:
+            grid containing the positions
+        """
+        min_x, min_y, max_x, max_y = (float(value) for value in bounds)
+        rows = np.flatnonzero(
+            (min_x < x) & (x < max_x) & (min_y < y) & (y < max_y)
+        )
+
+        num_cells = min(max(len(rows) // 4, 1), _MAX_POSITION_GRID_CELLS)
+        width, height = max_x - min_x, max_y - min_y
+        cell_size = max(
+            np.sqrt(width * height / num_cells),
+            max(width, height) / num_cells,
+        )
+        grid = _PositionGrid(
+            origin=(min_x, min_y),
+            cell_size=cell_size,
+            shape=(
+                min(max(int(np.ceil(width / cell_size)), 1), num_cells),
+                min(max(int(np.ceil(height / cell_size)), 1), num_cells),
+            ),
+            rows=rows,
+            cell_starts=np.empty(0, dtype=np.int64),
+        )
+
+        # the cell indices fit into 16 bit, which are sorted by radix sort
+        cells = grid.get_cells(x=x[rows], y=y[rows]).astype(np.uint16)
+        order = np.argsort(cells, kind="stable")
+        return _PositionGrid(
+            origin=grid.origin,
+            cell_size=grid.cell_size,
+            shape=grid.shape,
+            rows=rows[order],
+            cell_starts=np.searchsorted(
+                cells[order], np.arange(grid.shape[0] * grid.shape[1] + 1)
+            ),
+        )
+
+    def get_cell_indices(
+        self, *, x: npt.ArrayLike, y: npt.ArrayLike
+    ) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """Compute the column and row of the grid cells of the positions.
+
+        Positions outside the grid are assigned to the closest cell.
+
+        Args:
+            x (npt.ArrayLike): x-coordinates of the positions
+            y (npt.ArrayLike): y-coordinates of the positions
+
+        Returns:
+            column and row of the grid cell of each position
+        """
+        columns = np.floor(
+            (np.asarray(x, dtype=np.float64) - self.origin[0]) / self.cell_size
+        )
+        rows = np.floor(
+            (np.asarray(y, dtype=np.float64) - self.origin[1]) / self.cell_size
+        )
+        return (
+            np.clip(columns, 0, self.shape[0] - 1).astype(np.int64),
+            np.clip(rows, 0, self.shape[1] - 1).astype(np.int64),
+        )
+
+    def get_cells(
+        self, *, x: npt.ArrayLike, y: npt.ArrayLike
+    ) -> npt.NDArray[np.int64]:
+        """Compute the index of the grid cells of the positions.
+
+        Args:
+            x (npt.ArrayLike): x-coordinates of the positions
+            y (npt.ArrayLike): y-coordinates of the positions
+
+        Returns:
+            index of the grid cell of each position
+        """
+        columns, rows = self.get_cell_indices(x=x, y=y)
+        return rows * self.shape[0] + columns
+
+    def find_candidates(
+        self, *, bounds: Tuple[float, float, float, float]
+    ) -> npt.NDArray[np.int64]:
+        """Find the positions in the grid cells overlapping the bounds.
+
+        As the cell of a position is monotone in its coordinates, all
+        positions strictly inside the bounds are found.
+
+        Args:
+            bounds (Tuple[float, float, float, float]): min x, min y, max x,
+                and max y of the area
+
+        Returns:
+            rows of the positions in the grid cells overlapping the bounds
+        """
+        (first_column, last_column), (
+            first_row,
+            last_row,
+        ) = self.get_cell_indices(x=bounds[::2], y=bounds[1::2])
+        cell_rows = np.arange(first_row, last_row + 1)
+        starts = self.cell_starts[cell_rows * self.shape[0] + first_column]
+        ends = self.cell_starts[cell_rows * self.shape[0] + last_column + 1]
+
+        # concatenate the ranges of the positions in each row of the grid
+        lengths = ends - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return self.rows[offsets + np.arange(len(offsets))]
+
+
+def _compute_is_inside_area(
+    *,
+    measurement_area: MeasurementArea,
+    x: npt.ArrayLike,
+    y: npt.ArrayLike,
+) -> npt.NDArray[np.bool_]:
+    """Check which positions are inside the measurement area.
+
+    Gives the same result as :func:`shapely.contains_xy`, i.e., positions on
+    the boundary are not inside, but works directly on the coordinates using
+    the half-plane representation of the measurement area (see
+    :attr:`MeasurementArea.half_planes`). For axis-aligned rectangles only
+    the bounds are compared. Otherwise, the positions inside the bounds need
+    to be strictly left of each edge. Positions too close to an edge for a
+    reliable floating point result are checked with
+    :func:`_compute_orientation`.
+
+    Args:
+        measurement_area (MeasurementArea): measurement area
+        x (npt.ArrayLike): x-coordinates of the positions
+        y (npt.ArrayLike): y-coordinates of the positions
+
+    Returns:
+        Boolean array, True if the position is inside the measurement area
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    min_x, min_y, max_x, max_y = measurement_area.polygon.bounds
+    is_inside = (min_x < x) & (x < max_x) & (min_y < y) & (y < max_y)
+    if measurement_area.is_rectangle:
+        return is_inside
+
+    candidates = np.flatnonzero(is_inside)
+    candidates_x = x[candidates]
+    candidates_y = y[candidates]
+    is_left = np.ones(len(candidates), dtype=bool)
+    for edge in measurement_area.half_planes:
+        is_left &= _compute_is_left_of_edge(
+            edge=edge,
+            x=candidates_x,
+            y=candidates_y,
+            size=(max_x - min_x, max_y - min_y),
+        )
+
+    is_inside[candidates] = is_left
+    return is_inside
+
+
+def _compute_is_left_of_edge(
+    *,
+    edge: npt.NDArray[np.float64],
+    x: npt.NDArray[np.float64],
+    y: npt.NDArray[np.float64],
+    size: Tuple[float, float],
+) -> npt.NDArray[np.bool_]:
+    """Check which positions are strictly left of the edge.
+
+    The orientation is computed in floating point first. Only positions too
+    close to the edge for a reliable result are checked with
+    :func:`_compute_orientation`.
+
+    Args:
+        edge (npt.NDArray[np.float64]): start and end point of the edge as
+            (start_x, start_y, end_x, end_y), see
+            :attr:`MeasurementArea.half_planes`
+        x (npt.NDArray[np.float64]): x-coordinates of the positions
+        y (npt.NDArray[np.float64]): y-coordinates of the positions
+        size (Tuple[float, float]): width and height of the bounds containing
+            all positions and the edge
+
+    Returns:
+        Boolean array, True if the position is strictly left of the edge
+    """
+    start_x, start_y, end_x, end_y = edge
+    edge_x = end_x - start_x
+    edge_y = end_y - start_y
+    det = edge_x * (y - start_y) - edge_y * (x - start_x)
+
+    # as all positions are inside the bounds, the error of the determinant is
+    # bounded by the size of the bounds. Only if the determinant is below this
+    # bound, the orientation is computed exactly
+    error_bound = _ORIENTATION_ERROR_BOUND * (
+        abs(edge_x) * size[1] + abs(edge_y) * size[0]
+    )
+    is_left = det > error_bound
+    uncertain = np.flatnonzero(np.abs(det) <= error_bound)
+    is_left[uncertain] = (
+        _compute_orientation(
+            a_x=start_x,
+            a_y=start_y,
+            b_x=end_x,
+            b_y=end_y,
+            c_x=x[uncertain],
+            c_y=y[uncertain],
+        )
+        > 0
+    )
+    return is_left
+
+
+def _compute_polygons_in_areas(
+    *,
+    individual_voronoi_data: pd.DataFrame,
+    measurement_areas: Sequence[MeasurementArea],
+) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Compute which Voronoi polygons intersect which measurement areas.
+
+    The candidate areas of each polygon are found with a
+    :class:`shapely.STRtree` over the measurement areas, the intersection is
+    only checked for these candidates.
+
+    Args:
+        individual_voronoi_data (pd.DataFrame): individual voronoi data, needs
+                to contain a column 'polygon' (:class:`shapely.Polygon`),
+                result from
+                :func:`~method_utils.compute_individual_voronoi_polygons`
+        measurement_areas (Sequence[MeasurementArea]): measurement areas
+
+    Returns:
+        Row in :data:`individual_voronoi_data` and index of the measurement
+        area in :data:`measurement_areas` for each polygon intersecting an
+        area, sorted by row
+    """
+    polygons = np.array([area.polygon for area in measurement_areas])
+    return shapely.STRtree(polygons).query(
+        individual_voronoi_data[POLYGON_COL].to_numpy(), predicate="intersects"
+    )
+
+
+@cached()
 def compute_crossing_frames(
-    *, traj_data: TrajectoryData, measurement_line: MeasurementLine
+    *,
+    traj_data: TrajectoryData,
+    measurement_line: MeasurementLine,
+    ignore_touching: bool = False,
 ) -> pd.DataFrame:
     """Compute the frames at the pedestrians pass the measurement line.
 
@@ -523,6 +1183,20 @@ def compute_crossing_frames(
         :width: 80 %
         :align: center
 
+    Additionally, the direction of each crossing is determined from the side
+    of the measurement line the movement started on, seen from the first to
+    the second point of the line. A direction of 1 means the movement started
+    left of the line and crossed it to the right, -1 from right to left. If
+    the movement started on the line, the side it moved to is used. Movements
+    along the line, which leave it over one of its end points, have the
+    direction 0.
+
+    Stepping on the line and back to the side the pedestrian came from
+    counts as crossing in the direction back. With
+    :code:`ignore_touching=True`, such movements are not counted as
+    crossing. If the pedestrian has not been off the line before, leaving it
+    still counts.
+
     Note:
         Due to oscillations, it may happen that a pedestrian crosses the
         measurement line multiple times in a small-time interval.
@@ -530,36 +1204,753 @@ def compute_crossing_frames(
     Args:
         traj_data (pd.DataFrame): trajectory data
         measurement_line (MeasurementLine): measurement line which is crossed
+        ignore_touching (bool): if True, stepping on the line and back is not
+            counted as crossing (default: False)
 
     Returns:
-        DataFrame containing the columns 'id', 'frame', where 'frame' is
-        the frame where the measurement line is crossed.
+        DataFrame containing the columns 'id', 'frame', and 'direction', where
+        'frame' is the frame where the measurement line is crossed, and
+        'direction' the direction of the crossing.
     """
-    # stack is used to get the coordinates in the correct order, as pygeos
-    # does not support creating linestring from points directly. The
-    # resulting array looks as follows:
-    # [[[x_0_start, y_0_start], [x_0_end, y_0_end]],
-    #  [[x_1_start, y_1_start], [x_1_end, y_1_end]], ... ]
-    df_movement = _compute_individual_movement(
+    movement = _compute_individual_movement(
         traj_data=traj_data, frame_step=1, bidirectional=False
     )
-    df_movement["movement"] = shapely.linestrings(
-        np.stack(
-            [
-                shapely.get_coordinates(df_movement.start_position),
-                shapely.get_coordinates(df_movement.end_position),
-            ],
-            axis=1,
+    return _compute_crossing_frames_of_movement(
+        movement=movement,
+        measurement_line=measurement_line,
+        ignore_touching=ignore_touching,
+    )
+
+
+def compute_crossing_frames_multi(
+    *,
+    traj_data: TrajectoryData,
+    measurement_lines: Sequence[MeasurementLine],
+) -> pd.DataFrame:
+    """Compute the frames at the pedestrians pass any of the measurement lines.
+
+    Computes the same crossings as :func:`compute_crossing_frames` for
+    multiple measurement lines. The movement of the pedestrians between
+    consecutive frames is computed at most once and shared by all lines.
+    The crossings are still computed for each measurement line separately,
+    so the time needed grows linearly with the number of lines. Lines whose
+    crossing frames are in the active analysis cache are skipped, if all of
+    them are cached the movement is not computed at all.
+
+    Args:
+        traj_data (pd.DataFrame): trajectory data
+        measurement_lines (Sequence[MeasurementLine]): measurement lines which
+            are crossed
+
+    Returns:
+        DataFrame containing the columns 'line', 'id', 'frame', and
+        'direction', where 'line' is the index of the measurement line in
+        :code:`measurement_lines`, 'frame' is the frame where the measurement
+        line is crossed, and 'direction' the direction of the crossing (see
+        :func:`compute_crossing_frames`). Sorted by 'line' and then in the
+        same order as :func:`compute_crossing_frames`.
+    """
+    movement: Optional[pd.DataFrame] = None
+
+    def compute_line_crossing_frames(
+        measurement_line: MeasurementLine,
+    ) -> pd.DataFrame:
+        nonlocal movement
+        if movement is None:
+            movement = _compute_individual_movement(
+                traj_data=traj_data, frame_step=1, bidirectional=False
+            )
+        return _compute_crossing_frames_of_movement(
+            movement=movement, measurement_line=measurement_line
+        )
+
+    # the movement is only computed once for all lines, and only if the
+    # crossing frames of a line are not in the active analysis cache
+    crossing_frames = [
+        get_or_compute_cached(
+            function=compute_crossing_frames,
+            compute=functools.partial(
+                compute_line_crossing_frames, measurement_line
+            ),
+            arguments={
+                "traj_data": traj_data,
+                "measurement_line": measurement_line,
+            },
+        )
+        for measurement_line in measurement_lines
+    ]
+
+    return pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    LINE_COL: pd.Series(dtype=int),
+                    ID_COL: traj_data.data[ID_COL].iloc[:0],
+                    FRAME_COL: traj_data.data[FRAME_COL].iloc[:0],
+                    DIRECTION_COL: pd.Series(dtype=np.int8),
+                }
+            ),
+            *(
+                line_crossing_frames.assign(**{LINE_COL: line})[
+                    [LINE_COL, ID_COL, FRAME_COL, DIRECTION_COL]
+                ]
+                for line, line_crossing_frames in enumerate(crossing_frames)
+            ),
+        ],
+        ignore_index=True,
+    )
+
+
+def _compute_crossing_frames_of_movement(
+    *,
+    movement: pd.DataFrame,
+    measurement_line: MeasurementLine,
+    ignore_touching: bool = False,
+) -> pd.DataFrame:
+    """Compute the frames at which the movements cross the measurement line.
+
+    Args:
+        movement (pd.DataFrame): movement between consecutive frames, as
+            computed by :func:`_compute_individual_movement` with
+            :code:`frame_step=1` and :code:`bidirectional=False`
+        measurement_line (MeasurementLine): measurement line which is crossed
+        ignore_touching (bool): if True, stepping on the line and back is not
+            counted as crossing (default: False)
+
+    Returns:
+        DataFrame containing the columns 'id', 'frame', and 'direction' (see
+        :func:`compute_crossing_frames`)
+    """
+    # crossing means, the current movement intersects the line and does not
+    # end on it. The result is in the same order as the trajectory data
+    is_crossing, direction = _compute_segments_crossing_line(
+        start_x=movement[START_X_COL].to_numpy(),
+        start_y=movement[START_Y_COL].to_numpy(),
+        end_x=movement[END_X_COL].to_numpy(),
+        end_y=movement[END_Y_COL].to_numpy(),
+        measurement_line=measurement_line,
+    )
+    if ignore_touching:
+        is_crossing &= ~_compute_is_touching_line(
+            movement=movement,
+            measurement_line=measurement_line,
+            is_crossing=is_crossing,
+            direction=direction,
+        )
+
+    return pd.DataFrame(
+        {
+            ID_COL: movement[ID_COL].values[is_crossing],
+            FRAME_COL: movement[FRAME_COL].values[is_crossing],
+            DIRECTION_COL: direction[is_crossing],
+        }
+    )
+
+
+def _compute_is_touching_line(
+    *,
+    movement: pd.DataFrame,
+    measurement_line: MeasurementLine,
+    is_crossing: npt.NDArray[np.bool_],
+    direction: npt.NDArray[np.int8],
+) -> npt.NDArray[np.bool_]:
+    """Check which crossings only touch the measurement line.
+
+    A crossing movement starting on the line only touches it, if the
+    pedestrian leaves the line to the same side it came from. Hence,
+    stepping on the line and back is touching. If the pedestrian has not
+    been off the line before, leaving it is no touching.
+
+    Args:
+        movement (pd.DataFrame): movement between consecutive frames, as
+            computed by :func:`_compute_individual_movement` with
+            :code:`frame_step=1` and :code:`bidirectional=False`
+        measurement_line (MeasurementLine): line to check
+        is_crossing (npt.NDArray[np.bool_]): True if the movement crosses the
+            measurement line (see :func:`_compute_segments_crossing_line`)
+        direction (npt.NDArray[np.int8]): direction of the crossing for each
+            movement (see :func:`_compute_segments_crossing_line`)
+
+    Returns:
+        Boolean array, True if the movement only touches the measurement line
+    """
+    (a_x, a_y), (b_x, b_y) = measurement_line.coords
+    start_side = _compute_orientation(
+        a_x=a_x,
+        a_y=a_y,
+        b_x=b_x,
+        b_y=b_y,
+        c_x=movement[START_X_COL].to_numpy(),
+        c_y=movement[START_Y_COL].to_numpy(),
+    )
+    starts_on_line = is_crossing & (start_side == 0)
+    if not starts_on_line.any():
+        return starts_on_line
+
+    came_from = _compute_last_side_off_line(
+        ids=movement[ID_COL].to_numpy(),
+        frames=movement[FRAME_COL].to_numpy(),
+        side=start_side,
+    )
+
+    # the direction of a movement starting on the line is the opposite of
+    # the side it ends on, hence it went back if the direction is the
+    # opposite of the side it came from
+    return starts_on_line & (came_from != 0) & (came_from == -direction)
+
+
+def _compute_last_side_off_line(
+    *,
+    ids: npt.NDArray[np.int64],
+    frames: npt.NDArray[np.int64],
+    side: npt.NDArray[np.int8],
+) -> npt.NDArray[np.int8]:
+    """Compute the last side of the line a pedestrian was on.
+
+    Args:
+        ids (npt.NDArray[np.int64]): id of the pedestrian of each position
+        frames (npt.NDArray[np.int64]): frame of each position
+        side (npt.NDArray[np.int8]): side of the line of each position (see
+            :func:`_compute_orientation`)
+
+    Returns:
+        Side of the last position off the line of the same pedestrian up to
+        the frame of each position, 0 if the pedestrian has not been off the
+        line yet
+    """
+    order = np.lexsort((frames, ids))
+    sorted_ids = ids[order]
+    sorted_side = side[order]
+
+    is_first = np.ones(len(order), dtype=bool)
+    is_first[1:] = sorted_ids[1:] != sorted_ids[:-1]
+    ped_starts = np.maximum.accumulate(
+        np.where(is_first, np.arange(len(order)), 0)
+    )
+    last_off_line = np.maximum.accumulate(
+        np.where(sorted_side != 0, np.arange(len(order)), -1)
+    )
+
+    last_side = np.empty(len(order), dtype=np.int8)
+    last_side[order] = np.where(
+        last_off_line >= ped_starts, sorted_side[last_off_line], 0
+    )
+    return last_side
+
+
+def _compute_segments_crossing_line(  # pylint: disable=too-many-arguments
+    *,
+    start_x: npt.NDArray[np.float64],
+    start_y: npt.NDArray[np.float64],
+    end_x: npt.NDArray[np.float64],
+    end_y: npt.NDArray[np.float64],
+    measurement_line: MeasurementLine,
+) -> Tuple[npt.NDArray[np.bool_], npt.NDArray[np.int8]]:
+    """Check which segments cross the measurement line and how.
+
+    A segment crosses the line, if it intersects the line (as
+    :func:`shapely.intersects` for the segment as :class:`shapely.LineString`)
+    and its end point is not on the line. Hence, segments starting on the
+    line cross it, segments ending on it do not. This includes segments
+    moving along the line, which only cross it, if they leave it over one of
+    its end points. Segments with zero length never cross the line.
+
+    The check uses the orientation of the end points of each segment relative
+    to the other segment, which is computed exactly (see
+    :func:`_compute_orientation`). The orientation of the start point (or of
+    the end point, if the start point is on the line) also gives the
+    direction of the crossing.
+
+    Args:
+        start_x (npt.NDArray[np.float64]): x-coordinates of the segment starts
+        start_y (npt.NDArray[np.float64]): y-coordinates of the segment starts
+        end_x (npt.NDArray[np.float64]): x-coordinates of the segment ends
+        end_y (npt.NDArray[np.float64]): y-coordinates of the segment ends
+        measurement_line (MeasurementLine): line to check
+
+    Returns:
+        Boolean array, True if the segment crosses the measurement line, and
+        the direction of the crossing for each segment: 1 if the segment
+        starts left of the line (seen from its first to its second point),
+        -1 if it starts right of it, and 0 if the segment does not cross it
+        or moves along it
+    """
+    (a_x, a_y), (b_x, b_y) = measurement_line.coords
+
+    in_envelope = (
+        (np.maximum(start_x, end_x) >= min(a_x, b_x))
+        & (np.minimum(start_x, end_x) <= max(a_x, b_x))
+        & (np.maximum(start_y, end_y) >= min(a_y, b_y))
+        & (np.minimum(start_y, end_y) <= max(a_y, b_y))
+        & ((start_x != end_x) | (start_y != end_y))
+    )
+    candidates = np.flatnonzero(in_envelope)
+    start_x = start_x[candidates]
+    start_y = start_y[candidates]
+    end_x = end_x[candidates]
+    end_y = end_y[candidates]
+
+    # the segments do not intersect, if both end points of one segment are
+    # strictly on the same side of the other segment. If all points are
+    # collinear, the segments intersect as their envelopes intersect.
+    start_side = _compute_orientation(
+        a_x=a_x, a_y=a_y, b_x=b_x, b_y=b_y, c_x=start_x, c_y=start_y
+    )
+    end_side = _compute_orientation(
+        a_x=a_x, a_y=a_y, b_x=b_x, b_y=b_y, c_x=end_x, c_y=end_y
+    )
+    line_start_side = _compute_orientation(
+        a_x=start_x, a_y=start_y, b_x=end_x, b_y=end_y, c_x=a_x, c_y=a_y
+    )
+    line_end_side = _compute_orientation(
+        a_x=start_x, a_y=start_y, b_x=end_x, b_y=end_y, c_x=b_x, c_y=b_y
+    )
+
+    # the end point is on the line, if it is collinear and inside the
+    # envelope of the line
+    ends_on_line = (
+        (end_side == 0)
+        & (min(a_x, b_x) <= end_x)
+        & (end_x <= max(a_x, b_x))
+        & (min(a_y, b_y) <= end_y)
+        & (end_y <= max(a_y, b_y))
+    )
+
+    intersects = np.zeros(len(in_envelope), dtype=bool)
+    intersects[candidates] = (
+        (start_side * end_side <= 0)
+        & (line_start_side * line_end_side <= 0)
+        & ~ends_on_line
+    )
+
+    direction = np.zeros(len(in_envelope), dtype=np.int8)
+    direction[candidates] = np.where(start_side != 0, start_side, -end_side)
+    direction[~intersects] = 0
+
+    return intersects, direction
+
+
+def _compute_orientation(  # pylint: disable=too-many-arguments
+    *,
+    a_x: npt.ArrayLike,
+    a_y: npt.ArrayLike,
+    b_x: npt.ArrayLike,
+    b_y: npt.ArrayLike,
+    c_x: npt.ArrayLike,
+    c_y: npt.ArrayLike,
+) -> npt.NDArray[np.int8]:
+    """Compute the orientation of the point c relative to the line a-b.
+
+    The sign of the determinant is first computed in floating point
+    arithmetic. Only if its magnitude is below the error bound of the
+    computation, the determinant is computed exactly with rational numbers.
+
+    Args:
+        a_x (npt.ArrayLike): x-coordinates of the first points of the lines
+        a_y (npt.ArrayLike): y-coordinates of the first points of the lines
+        b_x (npt.ArrayLike): x-coordinates of the second points of the lines
+        b_y (npt.ArrayLike): y-coordinates of the second points of the lines
+        c_x (npt.ArrayLike): x-coordinates of the points
+        c_y (npt.ArrayLike): y-coordinates of the points
+
+    Returns:
+        1 if c is left of a-b (counter-clockwise), -1 if c is right of a-b
+        (clockwise), and 0 if the points are collinear
+    """
+    a_x, a_y, b_x, b_y, c_x, c_y = np.broadcast_arrays(
+        *(
+            np.asarray(value, dtype=np.float64)
+            for value in (a_x, a_y, b_x, b_y, c_x, c_y)
         )
     )
+    det_left = (a_x - c_x) * (b_y - c_y)
+    det_right = (a_y - c_y) * (b_x - c_x)
+    det = det_left - det_right
+    orientation = np.sign(det).astype(np.int8)
+
+    error_bound = _ORIENTATION_ERROR_BOUND * (
+        np.abs(det_left) + np.abs(det_right)
+    )
+    for index in np.flatnonzero(
+        (np.abs(det) <= error_bound) & (error_bound > 0)
+    ):
+        exact_det = (
+            fractions.Fraction(a_x[index]) - fractions.Fraction(c_x[index])
+        ) * (
+            fractions.Fraction(b_y[index]) - fractions.Fraction(c_y[index])
+        ) - (
+            fractions.Fraction(a_y[index]) - fractions.Fraction(c_y[index])
+        ) * (
+            fractions.Fraction(b_x[index]) - fractions.Fraction(c_x[index])
+        )
+        orientation[index] = (exact_det > 0) - (exact_det < 0)
+
+    return orientation
+
+
+def _compute_is_on_line(
+    *,
+    x: npt.NDArray[np.float64],
+    y: npt.NDArray[np.float64],
+    measurement_line: MeasurementLine,
+) -> npt.NDArray[np.bool_]:
+    """Check which positions are exactly on the measurement line.
+
+    Args:
+        x (npt.NDArray[np.float64]): x-coordinates of the positions
+        y (npt.NDArray[np.float64]): y-coordinates of the positions
+        measurement_line (MeasurementLine): line to check
 
-    # crossing means, the current movement crosses the line and the end point
-    # of the movement is not on the line. The result is sorted by frame number
-    crossing_frames = df_movement.loc[
-        shapely.intersects(df_movement.movement, measurement_line.line)
-    ][[ID_COL, FRAME_COL]]
+    Returns:
+        Boolean array, True if the position is on the measurement line
+    """
+    (a_x, a_y), (b_x, b_y) = measurement_line.coords
+    return (
+        (min(a_x, b_x) <= x)
+        & (x <= max(a_x, b_x))
+        & (min(a_y, b_y) <= y)
+        & (y <= max(a_y, b_y))
+        & (
+            _compute_orientation(
+                a_x=a_x, a_y=a_y, b_x=b_x, b_y=b_y, c_x=x, c_y=y
+            )
+            == 0
+        )
+    )
 
-    return crossing_frames
+
+def _compute_distance_to_line(
+    *,
+    x: npt.NDArray[np.float64],
+    y: npt.NDArray[np.float64],
+    measurement_line: MeasurementLine,
+) -> npt.NDArray[np.float64]:
+    """Compute the distance of the given positions to the measurement line.
+
+    Computes the distance directly from the coordinates, with the same point
+    to segment distance algorithm as used in GEOS.
+
+    Args:
+        x (npt.NDArray[np.float64]): x-coordinates of the positions
+        y (npt.NDArray[np.float64]): y-coordinates of the positions
+        measurement_line (MeasurementLine): line to which the distance is
+            computed
+
+    Returns:
+        Distance of each position to the measurement line
+    """
+    (a_x, a_y), (b_x, b_y) = measurement_line.coords
+    length_squared = (b_x - a_x) ** 2 + (b_y - a_y) ** 2
+
+    # position of the projection on the line, relative to the line length
+    projection = ((x - a_x) * (b_x - a_x) + (y - a_y) * (b_y - a_y)) / (
+        length_squared
+    )
+    distance_line = np.abs(
+        ((a_y - y) * (b_x - a_x) - (a_x - x) * (b_y - a_y)) / length_squared
+    ) * np.sqrt(length_squared)
+
+    return np.where(
+        projection <= 0,
+        np.sqrt((x - a_x) ** 2 + (y - a_y) ** 2),
+        np.where(
+            projection >= 1,
+            np.sqrt((x - b_x) ** 2 + (y - b_y) ** 2),
+            distance_line,
+        ),
+    )
+
+
+def _get_frame_chunk_borders(
+    *, frames: npt.NDArray[np.int64], num_chunks: int
+) -> npt.NDArray[np.int64]:
+    """Compute the borders to split frame sorted data into chunks.
+
+    The data is split such that all rows of one frame are in the same chunk,
+    and all chunks contain roughly the same number of frames.
+
+    Args:
+        frames (npt.NDArray[np.int64]): sorted frame of each row
+        num_chunks (int): number of desired chunks
+
+    Returns:
+        Row indices at which the data needs to be split (see :func:`np.split`)
+    """
+    frame_starts = np.flatnonzero(np.diff(frames, prepend=frames[:1] - 1))
+    chunk_borders = [
+        frame_starts_in_chunk[0]
+        for frame_starts_in_chunk in np.array_split(frame_starts, num_chunks)[
+            1:
+        ]
+        if len(frame_starts_in_chunk) > 0
+    ]
+    return np.array(chunk_borders, dtype=np.int64)
+
+
+def _compute_voronoi_polygons_chunk(
+    frames: npt.NDArray[np.int64],
+    points: npt.NDArray[np.float64],
+    *,
+    walkable_area_wkb: bytes,
+    cut_off: Optional[Cutoff],
+    use_blind_points: bool,
+) -> npt.NDArray[np.object_]:
+    """Compute the individual Voronoi polygons for a chunk of frames.
+
+    This function only works on plain arrays and is independent of the
+    :class:`TrajectoryData`, such that it can be cheaply sent to worker
+    processes.
+
+    Args:
+        frames (npt.NDArray[np.int64]): frame of each row, sorted by frame
+        points (npt.NDArray[np.float64]): position of the pedestrian in each
+            row, shape (N, 2)
+        walkable_area_wkb (bytes): WKB representation of the walkable area
+        cut_off (Cutoff): cutoff information, which provide the largest
+            possible extend of a single Voronoi polygon
+        use_blind_points (bool): adds extra 4 points outside the walkable area
+
+    Returns:
+        Voronoi polygon for each row, None for rows in frames in which no
+        Voronoi polygons could be computed.
+    """
+    walkable_area = shapely.from_wkb(walkable_area_wkb)
+    shapely.prepare(walkable_area)
+    blind_points, clipping_diameter = _get_blind_points(
+        bounds=walkable_area.bounds
+    )
+
+    result = np.full(len(frames), None, dtype=object)
+    frame_starts = np.flatnonzero(np.diff(frames, prepend=frames[:1] - 1))
+    frame_ends = np.append(frame_starts[1:], len(frames))
+
+    for start, end in zip(frame_starts, frame_ends):
+        peds_in_frame = points[start:end]
+
+        # only skip analysis if less than 4 peds are in the frame and blind
+        # points are turned off
+        if not use_blind_points and len(peds_in_frame) < 4:
+            _log.warning(
+                f"Not enough pedestrians (N="
+                f"{len(peds_in_frame)}) available to "
+                f"calculate Voronoi cells for frame = {frames[start]}. "
+                f"Consider enable use of blind points."
+            )
+            continue
+
+        vor = Voronoi(np.concatenate([peds_in_frame, blind_points]))
+        voronoi_polygons = _clip_voronoi_polygons_vectorized(
+            vor, clipping_diameter
+        )
+
+        result[start:end] = _clip_voronoi_polygons_to_area(
+            voronoi_polygons=voronoi_polygons[:-4],
+            points=peds_in_frame,
+            walkable_area=walkable_area,
+            cut_off=cut_off,
+        )
+
+    return result
+
+
+def _get_blind_points(
+    *, bounds: Tuple[float, float, float, float]
+) -> Tuple[npt.NDArray[np.float64], float]:
+    """Create the blind points far outside of the walkable area.
+
+    Args:
+        bounds (Tuple[float, float, float, float]): bounds of the walkable
+            area
+
+    Returns:
+        The 4 blind points, and the diameter used for clipping the infinite
+        Voronoi regions
+    """
+    x_diff = abs(bounds[2] - bounds[0])
+    y_diff = abs(bounds[3] - bounds[1])
+    clipping_diameter = 2 * max(x_diff, y_diff)
+
+    blind_points = np.array(
+        [
+            [100 * (bounds[0] - x_diff), 100 * (bounds[1] - y_diff)],
+            [100 * (bounds[2] + x_diff), 100 * (bounds[1] - y_diff)],
+            [100 * (bounds[0] - x_diff), 100 * (bounds[3] + y_diff)],
+            [100 * (bounds[2] + x_diff), 100 * (bounds[3] + y_diff)],
+        ]
+    )
+    return blind_points, clipping_diameter
+
+
+def _clip_voronoi_polygons_to_area(
+    *,
+    voronoi_polygons: npt.NDArray[np.object_],
+    points: npt.NDArray[np.float64],
+    walkable_area: shapely.Geometry,
+    cut_off: Optional[Cutoff],
+) -> npt.NDArray[np.object_]:
+    """Clip the Voronoi polygons of a frame to the walkable area.
+
+    Args:
+        voronoi_polygons (npt.NDArray[np.object_]): Voronoi polygon of each
+            pedestrian in the frame
+        points (npt.NDArray[np.float64]): position of each pedestrian in the
+            frame, shape (N, 2)
+        walkable_area (shapely.Geometry): prepared walkable area
+        cut_off (Cutoff): cutoff information, which provide the largest
+            possible extend of a single Voronoi polygon
+
+    Returns:
+        Clipped Voronoi polygon of each pedestrian in the frame
+    """
+    # Compute the intersecting area with the walkable area
+    voronoi_polygons = shapely.intersection(voronoi_polygons, walkable_area)
+
+    ped_points = shapely.points(points)
+    if cut_off is not None:
+        voronoi_polygons = shapely.intersection(
+            voronoi_polygons,
+            shapely.buffer(
+                ped_points,
+                cut_off.radius,
+                quad_segs=cut_off.quad_segments,
+            ),
+        )
+
+    # Only consider the parts of a multipolygon which contain the position
+    # of the pedestrian
+    for i in np.flatnonzero(shapely.get_type_id(voronoi_polygons) != 3):
+        parts = shapely.get_parts(voronoi_polygons[i])
+        voronoi_polygons[i] = parts[shapely.within(ped_points[i], parts)][0]
+
+    return voronoi_polygons
+
+
+def _clip_voronoi_polygons_vectorized(  # pylint: disable=too-many-locals
+    voronoi: Voronoi, diameter: float
+) -> npt.NDArray[np.object_]:
+    """Generate Polygons from the Voronoi diagram without Python loops.
+
+    Vectorized version of :func:`_clip_voronoi_polygons`, which yields the same
+    polygons, in the order of the input points. The vertices of all (finite
+    and infinite) regions are gathered in one flat coordinate array via index
+    arithmetic, all polygons are then created with a single call to
+    :func:`shapely.polygons`.
+
+    Args:
+        voronoi (Voronoi): Voronoi diagram
+        diameter (float): infinite regions are clipped such that all points
+            within this distance of a Voronoi vertex are contained
+
+    Returns:
+        Array of shapely.Polygon for each input point
+    """
+    points = voronoi.points
+    vertices = voronoi.vertices
+    centroid = points.mean(axis=0)
+
+    # Unit vectors in the directions of the infinite ridges, stored for each
+    # pair of (input point index, Voronoi vertex index) the ridges neighbor.
+    # The pairs are sorted, such that the directions of a pair appear in the
+    # same order as the ridges in the Voronoi diagram.
+    ridge_vertices = np.sort(np.asarray(voronoi.ridge_vertices), axis=1)
+    infinite_ridges = np.flatnonzero(ridge_vertices[:, 0] == -1)
+    p, q = voronoi.ridge_points[infinite_ridges].T  # pylint: disable=C0103
+    tangent = points[q] - points[p]
+    normal = (
+        np.stack([-tangent[:, 1], tangent[:, 0]], axis=1)
+        / np.linalg.norm(tangent, axis=1)[:, np.newaxis]
+    )
+    midpoint = (points[p] + points[q]) / 2
+    direction = (
+        np.sign(np.sum((midpoint - centroid) * normal, axis=1))[:, np.newaxis]
+        * normal
+    )
+
+    num_keys = len(vertices) + 1
+    ridge_keys = np.concatenate([p, q]) * num_keys + np.tile(
+        ridge_vertices[infinite_ridges, 1], 2
+    )
+    ridge_order = np.lexsort((np.tile(infinite_ridges, 2), ridge_keys))
+    ridge_keys = ridge_keys[ridge_order]
+    ridge_direction = np.tile(direction, (2, 1))[ridge_order]
+
+    # Flatten the ragged regions of the input points
+    region_lengths = np.fromiter(
+        map(len, voronoi.regions), dtype=np.int64, count=len(voronoi.regions)
+    )
+    region_starts = np.cumsum(region_lengths) - region_lengths
+    region_vertices = np.fromiter(
+        itertools.chain.from_iterable(voronoi.regions),
+        dtype=np.int64,
+        count=region_lengths.sum(),
+    )
+    infinite_position = np.full(len(voronoi.regions), -1, dtype=np.int64)
+    infinite_vertices = np.flatnonzero(region_vertices == -1)
+    infinite_regions = (
+        np.searchsorted(region_starts, infinite_vertices, side="right") - 1
+    )
+    infinite_position[infinite_regions] = (
+        infinite_vertices - region_starts[infinite_regions]
+    )
+
+    point_region = voronoi.point_region
+    length = region_lengths[point_region]
+    start = region_starts[point_region]
+    inf = infinite_position[point_region]  # Index of vertex at infinity.
+    is_infinite = inf >= 0
+
+    # The finite part of an infinite region starts after the vertex at
+    # infinity and ends before it
+    shift = np.where(is_infinite, inf + 1, 0)
+    num_finite = length - is_infinite
+    num_vertices = num_finite + 2 * is_infinite
+
+    polygon_of_vertex = np.repeat(np.arange(len(points)), num_finite)
+    vertex_in_polygon = np.arange(num_finite.sum()) - np.repeat(
+        np.cumsum(num_finite) - num_finite, num_finite
+    )
+    finite_vertices = region_vertices[
+        start[polygon_of_vertex]
+        + (shift[polygon_of_vertex] + vertex_in_polygon)
+        % length[polygon_of_vertex]
+    ]
+
+    coordinates = np.empty((num_vertices.sum(), 2))
+    polygon_starts = np.cumsum(num_vertices) - num_vertices
+    coordinates[
+        polygon_starts[polygon_of_vertex] + vertex_in_polygon
+    ] = vertices[finite_vertices]
+
+    # Infinite regions get an extra edge
+    i = np.flatnonzero(is_infinite)
+    j = region_vertices[start[i] + (inf[i] - 1) % length[i]]  # previous vertex
+    k = region_vertices[start[i] + (inf[i] + 1) % length[i]]  # next vertex
+
+    direction_j = np.searchsorted(ridge_keys, i * num_keys + j)
+    # If the region has one Voronoi vertex with two ridges, use both of them
+    direction_k = np.where(
+        j == k,
+        direction_j + 1,
+        np.searchsorted(ridge_keys, i * num_keys + k),
+    )
+    dir_j = ridge_direction[direction_j]
+    dir_k = ridge_direction[direction_k]
+
+    # Length of ridges needed for the extra edge to lie at least
+    # 'diameter' away from all Voronoi vertices.
+    ridge_length = (2 * diameter / np.linalg.norm(dir_j + dir_k, axis=1))[
+        :, np.newaxis
+    ]
+    extra_edge_start = polygon_starts[i] + num_finite[i]
+    coordinates[extra_edge_start] = vertices[j] + dir_j * ridge_length
+    coordinates[extra_edge_start + 1] = vertices[k] + dir_k * ridge_length
+
+    return shapely.polygons(
+        shapely.linearrings(
+            coordinates,
+            indices=np.repeat(np.arange(len(points)), num_vertices),
+        )
+    )
 
 
 def _clip_voronoi_polygons(  # pylint: disable=too-many-locals,invalid-name
@@ -573,6 +1964,10 @@ def _clip_voronoi_polygons(  # pylint: disable=too-many-locals,invalid-name
     enough that all points within a distance 'diameter' of a Voronoi
     vertex are contained in one of the infinite polygons.
     from: https://stackoverflow.com/a/52727406/9601068
+
+    This is the reference implementation of
+    :func:`_clip_voronoi_polygons_vectorized`, which is used for the actual
+    computation.
     """
     polygons = []
     centroid = voronoi.points.mean(axis=0)
@@ -635,236 +2030,273 @@ def _compute_individual_movement(
     frame_step: int,
     bidirectional: bool = True,
     speed_border_method: SpeedCalculation = SpeedCalculation.BORDER_ADAPTIVE,
-) -> pd.DataFrame:
-    if speed_border_method == SpeedCalculation.BORDER_EXCLUDE:
-        return _compute_movement_exclude_border(
-            traj_data, frame_step, bidirectional
-        )
-    if speed_border_method == SpeedCalculation.BORDER_SINGLE_SIDED:
-        return _compute_movement_single_sided_border(
-            traj_data, frame_step, bidirectional
-        )
-    if speed_border_method == SpeedCalculation.BORDER_ADAPTIVE:
-        return _compute_movememnt_adaptive_border(
-            traj_data, frame_step, bidirectional
-        )
-
-    raise ValueError("speed border method not accepted")
-
-
-def _compute_movement_exclude_border(
-    traj_data: TrajectoryData,
-    frame_step: int,
-    bidirectional: bool,
 ) -> pd.DataFrame:
     """Compute the individual movement in the time interval frame_step.
 
     The movement is computed for the interval [frame - frame_step: frame +
-    frame_step], if one of the boundaries is not contained in the trajectory
-    frame these points will not be considered.
+    frame_step]. How the interval is chosen at the borders of each
+    trajectory, where one of the boundaries is not contained in the
+    trajectory, depends on :data:`speed_border_method`:
+
+    - :attr:`SpeedCalculation.BORDER_EXCLUDE`: these frames are not
+      considered.
+    - :attr:`SpeedCalculation.BORDER_SINGLE_SIDED`: the frame itself is used
+      as boundary. Hence, the intervals become [frame, frame + frame_step],
+      or [frame - frame_step, frame] respectively.
+    - :attr:`SpeedCalculation.BORDER_ADAPTIVE`: the maximum available number
+      of frames on this side is used and the same number of frames also on
+      the other side. Frames where this number is 0 are not considered.
+
+    The trajectory data is sorted once by 'id' and 'frame', afterwards the
+    start and end of each movement are found by index arithmetic on the
+    sorted arrays.
 
     Args:
-        traj_data (pd.DataFrame): trajectory data
+        traj_data (TrajectoryData): trajectory data
         frame_step (int): how many frames back and forwards are used to compute
             the movement.
         bidirectional (bool): if True also the future frame_step points will
             be used to determine the movement
+        speed_border_method (SpeedCalculation): method used at the borders of
+            the individual trajectories
 
     Returns:
-        DataFrame containing the columns: 'id', 'frame', 'start_position',
-        'end_position', 'window_size'. Where 'start_position'/'end_position' are
-        the points where the movement start/ends, and 'window_size' is the
-        number of frames between the movement start and end.
+        DataFrame containing the columns: 'id', 'frame', 'start_x', 'start_y',
+        'end_x', 'end_y', 'window_size'. Where 'start_x'/'start_y' and
+        'end_x'/'end_y' are the coordinates where the movement starts/ends,
+        and 'window_size' is the number of frames between the movement start
+        and end. The rows are in the same order as the trajectory data.
     """
-    df_movement = traj_data.data.copy(deep=True)
-
-    df_movement[START_POSITION_COL] = df_movement.groupby(
-        by=ID_COL
-    ).point.shift(frame_step)
-    df_movement["start_frame"] = df_movement.groupby(by=ID_COL).frame.shift(
-        frame_step
+    if speed_border_method not in (
+        SpeedCalculation.BORDER_EXCLUDE,
+        SpeedCalculation.BORDER_SINGLE_SIDED,
+        SpeedCalculation.BORDER_ADAPTIVE,
+    ):
+        raise ValueError("speed border method not accepted")
+
+    ids = traj_data.data[ID_COL].to_numpy()
+    frames = traj_data.data[FRAME_COL].to_numpy()
+
+    order = np.lexsort((frames, ids))
+    sorted_frames = frames[order]
+    sorted_x = traj_data.data[X_COL].to_numpy(dtype=np.float64)[order]
+    sorted_y = traj_data.data[Y_COL].to_numpy(dtype=np.float64)[order]
+
+    # the position of each row in the sorted arrays, given in the same order
+    # as the trajectory data
+    position = np.empty(len(order), dtype=np.int64)
+    position[order] = np.arange(len(order))
+    ped_index, first, last = _get_trajectory_borders(
+        sorted_ids=ids[order], position=position
     )
 
-    if bidirectional:
-        df_movement[END_POSITION_COL] = df_movement.groupby(
-            df_movement.id
-        ).point.shift(-frame_step)
-        df_movement["end_frame"] = df_movement.groupby(
-            df_movement.id
-        ).frame.shift(-frame_step)
+    if speed_border_method == SpeedCalculation.BORDER_ADAPTIVE:
+        start, end, window_size, has_movement = _compute_adaptive_window(
+            sorted_frames=sorted_frames,
+            ped_index=ped_index,
+            position=position,
+            first=first,
+            last=last,
+            frame_step=frame_step,
+            bidirectional=bidirectional,
+        )
     else:
-        df_movement[END_POSITION_COL] = df_movement.point
-        df_movement["end_frame"] = df_movement.frame
+        start, end, window_size, has_movement = _compute_fixed_window(
+            sorted_frames=sorted_frames,
+            position=position,
+            first=first,
+            last=last,
+            frame_step=frame_step,
+            bidirectional=bidirectional,
+            exclude_border=(
+                speed_border_method == SpeedCalculation.BORDER_EXCLUDE
+            ),
+        )
 
-    df_movement[WINDOW_SIZE_COL] = (
-        df_movement.end_frame - df_movement.start_frame
+    return pd.DataFrame(
+        {
+            ID_COL: ids[has_movement],
+            FRAME_COL: frames[has_movement],
+            START_X_COL: sorted_x[start],
+            START_Y_COL: sorted_y[start],
+            END_X_COL: sorted_x[end],
+            END_Y_COL: sorted_y[end],
+            WINDOW_SIZE_COL: window_size,
+        },
+        index=traj_data.data.index[has_movement],
     )
-    return df_movement[
-        [
-            ID_COL,
-            FRAME_COL,
-            START_POSITION_COL,
-            END_POSITION_COL,
-            WINDOW_SIZE_COL,
-        ]
-    ].dropna()
 
 
-def _compute_movement_single_sided_border(
-    traj_data: TrajectoryData,
+def _get_trajectory_borders(
+    *, sorted_ids: npt.NDArray[np.int64], position: npt.NDArray[np.int64]
+) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Find the first and last frame of the pedestrian of each row.
+
+    Args:
+        sorted_ids (npt.NDArray[np.int64]): ids sorted by 'id' and 'frame'
+        position (npt.NDArray[np.int64]): position of each row in the sorted
+            ids
+
+    Returns:
+        Index of the pedestrian of each sorted id, and the position of the
+        first and last frame of the pedestrian of each row in the sorted ids
+    """
+    is_first = np.ones(len(sorted_ids), dtype=bool)
+    is_first[1:] = sorted_ids[1:] != sorted_ids[:-1]
+    ped_index = np.cumsum(is_first) - 1
+    ped_starts = np.flatnonzero(is_first)
+    ped_stops = np.append(ped_starts[1:], len(sorted_ids)) - 1
+
+    return (
+        ped_index,
+        ped_starts[ped_index[position]],
+        ped_stops[ped_index[position]],
+    )
+
+
+def _compute_fixed_window(  # pylint: disable=too-many-arguments
+    *,
+    sorted_frames: npt.NDArray[np.int64],
+    position: npt.NDArray[np.int64],
+    first: npt.NDArray[np.int64],
+    last: npt.NDArray[np.int64],
     frame_step: int,
     bidirectional: bool,
-) -> pd.DataFrame:
-    """Compute the individual movement in the time interval frame_step.
-
-    The movement is computed for the interval [frame - frame_step: frame +
-    frame_step], if one of the boundaries is not contained in the trajectory
-    frame will be used as boundary. Hence, the intervals become [frame,
-    frame + frame_step], or [frame - frame_step, frame] respectively.
+    exclude_border: bool,
+) -> Tuple[
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.bool_],
+]:
+    """Compute the movement window for the exclude and single sided border.
+
+    The window spans :code:`frame_step` rows in the sorted frames on each
+    side. If it exceeds the first or last frame of the pedestrian, the
+    movement is either not considered, or the frame itself is used as
+    boundary instead.
 
     Args:
-        traj_data (pd.DataFrame): trajectory data
+        sorted_frames (npt.NDArray[np.int64]): frames sorted by 'id' and
+            'frame'
+        position (npt.NDArray[np.int64]): position of each row in the sorted
+            frames
+        first (npt.NDArray[np.int64]): position of the first frame of the
+            pedestrian of each row in the sorted frames
+        last (npt.NDArray[np.int64]): position of the last frame of the
+            pedestrian of each row in the sorted frames
         frame_step (int): how many frames back and forwards are used to compute
             the movement.
         bidirectional (bool): if True also the future frame_step points will
             be used to determine the movement
+        exclude_border (bool): if True movements exceeding the trajectory are
+            not considered, otherwise the frame itself is used as boundary
 
     Returns:
-        DataFrame containing the columns: 'id', 'frame', 'start_position',
-        'end_position', 'window_size' .Where 'start_position'/'end_position' are
-        the points where the movement start/ends, and 'window_size' is the
-        number of frames between the movement start and end.
+        Positions of the start and end of the movement in the sorted frames,
+        and the window size, for each row with movement, and a boolean array
+        which rows have a movement
     """
-    df_movement = traj_data.data.copy(deep=True)
-
-    df_movement[START_POSITION_COL] = (
-        df_movement.groupby(by=ID_COL)
-        .point.shift(frame_step)
-        .fillna(df_movement.point)
-    )
-    df_movement["start_frame"] = (
-        df_movement.groupby(by=ID_COL)
-        .frame.shift(frame_step)
-        .fillna(df_movement.frame)
-    )
-
-    if bidirectional:
-        df_movement[END_POSITION_COL] = (
-            df_movement.groupby(df_movement.id)
-            .point.shift(-frame_step)
-            .fillna(df_movement.point)
-        )
-        df_movement["end_frame"] = (
-            df_movement.groupby(df_movement.id)
-            .frame.shift(-frame_step)
-            .fillna(df_movement.frame)
-        )
+    start = position - frame_step
+    end = position + frame_step if bidirectional else position
+    if exclude_border:
+        has_movement = (start >= first) & (end <= last)
     else:
-        df_movement[END_POSITION_COL] = df_movement.point
-        df_movement["end_frame"] = df_movement.frame
+        start = np.where(start >= first, start, position)
+        end = np.where(end <= last, end, position)
+        has_movement = np.ones(len(position), dtype=bool)
 
-    df_movement[WINDOW_SIZE_COL] = (
-        df_movement.end_frame - df_movement.start_frame
+    start = start[has_movement]
+    end = end[has_movement]
+    return (
+        start,
+        end,
+        sorted_frames[end] - sorted_frames[start],
+        has_movement,
     )
-    return df_movement[
-        [
-            ID_COL,
-            FRAME_COL,
-            START_POSITION_COL,
-            END_POSITION_COL,
-            WINDOW_SIZE_COL,
-        ]
-    ]
 
 
-def _compute_movememnt_adaptive_border(
-    traj_data: TrajectoryData,
+def _compute_adaptive_window(  # pylint: disable=too-many-arguments
+    *,
+    sorted_frames: npt.NDArray[np.int64],
+    ped_index: npt.NDArray[np.int64],
+    position: npt.NDArray[np.int64],
+    first: npt.NDArray[np.int64],
+    last: npt.NDArray[np.int64],
     frame_step: int,
     bidirectional: bool,
-) -> pd.DataFrame:
-    """Compute the individual movement in the time interval frame_step.
-
-    The movement is computed for the interval [frame - frame_step: frame +
-    frame_step], if one of the boundaries is not contained in the trajectory
-    frame use the maximum available number of frames on this side and the same
-    number of frames also on the other side.
+) -> Tuple[
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.bool_],
+]:
+    """Compute the movement window for the adaptive border method.
+
+    The window on both sides is limited by the distance to the first and last
+    frame of the pedestrian. As the trajectory may have gaps, the frames at
+    the start and end of the window are looked up in the sorted frames.
+    Movements where one of them is missing are not considered.
 
     Args:
-        traj_data (pd.DataFrame): trajectory data
+        sorted_frames (npt.NDArray[np.int64]): frames sorted by 'id' and
+            'frame'
+        ped_index (npt.NDArray[np.int64]): index of the pedestrian of each
+            sorted frame, in ascending order
+        position (npt.NDArray[np.int64]): position of each row in the sorted
+            frames
+        first (npt.NDArray[np.int64]): position of the first frame of the
+            pedestrian of each row in the sorted frames
+        last (npt.NDArray[np.int64]): position of the last frame of the
+            pedestrian of each row in the sorted frames
         frame_step (int): how many frames back and forwards are used to compute
             the movement.
         bidirectional (bool): if True also the future frame_step points will
             be used to determine the movement
 
     Returns:
-        DataFrame containing the columns: 'id', 'frame', 'start_position',
-        'end_position', 'window_size'. Where 'start_position'/'end_position' are
-        the points where the movement start/ends, and 'window_size' is the
-        number of frames between the movement start and end.
+        Positions of the start and end of the movement in the sorted frames,
+        and the window size, for each row with movement, and a boolean array
+        which rows have a movement
     """
-    df_movement = traj_data.data.copy(deep=True)
-
-    frame_infos = df_movement.groupby(by=ID_COL).agg(
-        frame_min=(FRAME_COL, np.min), frame_max=(FRAME_COL, np.max)
-    )
-    df_movement = df_movement.merge(frame_infos, on=ID_COL)
-
-    df_movement["distance_min"] = np.abs(
-        df_movement.frame - df_movement["frame_min"]
-    )
-    df_movement["distance_max"] = np.abs(
-        df_movement.frame - df_movement["frame_max"]
-    )
-    df_movement[WINDOW_SIZE_COL] = np.minimum(
+    frame = sorted_frames[position]
+    window = np.minimum(
         frame_step,
-        np.minimum(
-            df_movement.distance_min.values, df_movement.distance_max.values
-        ),
+        np.minimum(frame - sorted_frames[first], sorted_frames[last] - frame),
     )
-    df_movement["start_frame"] = df_movement.frame - df_movement.window_size
-    df_movement["end_frame"] = df_movement.frame + df_movement.window_size
 
-    start = (
-        pd.merge(
-            df_movement[[ID_COL, FRAME_COL, "start_frame", WINDOW_SIZE_COL]],
-            df_movement[[ID_COL, FRAME_COL, POINT_COL]],
-            left_on=[ID_COL, "start_frame"],
-            right_on=[ID_COL, FRAME_COL],
-            suffixes=("", "_drop"),
+    # (pedestrian, frame) packed into a single key, which is sorted in the
+    # same way as the sorted frames
+    min_frame = sorted_frames.min(initial=0)
+    num_frames = sorted_frames.max(initial=0) - min_frame + 1
+    keys = ped_index * num_frames + (sorted_frames - min_frame)
+
+    def find(
+        target_frames: npt.NDArray[np.int64],
+    ) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.bool_]]:
+        target_keys = ped_index[position] * num_frames + (
+            target_frames - min_frame
         )
-        .drop("frame_drop", axis=1)
-        .rename({POINT_COL: START_POSITION_COL}, axis=1)
-    )
-
-    if bidirectional:
-        end = (
-            pd.merge(
-                df_movement[[ID_COL, FRAME_COL, "end_frame"]],
-                df_movement[[ID_COL, FRAME_COL, POINT_COL]],
-                left_on=[ID_COL, "end_frame"],
-                right_on=[ID_COL, FRAME_COL],
-                suffixes=("", "_drop"),
-            )
-            .drop("frame_drop", axis=1)
-            .rename({POINT_COL: END_POSITION_COL}, axis=1)
+        found_position = np.minimum(
+            np.searchsorted(keys, target_keys), len(keys) - 1
         )
-        # as the window is used on both sides
-        start[WINDOW_SIZE_COL] = 2 * start[WINDOW_SIZE_COL]
+        return found_position, keys[found_position] == target_keys
 
+    start, has_start = find(frame - window)
+    has_movement = (window > 0) & has_start
+    if bidirectional:
+        end, has_end = find(frame + window)
+        has_movement &= has_end
+        window = 2 * window
     else:
-        df_movement[END_POSITION_COL] = df_movement[POINT_COL]
-        end = df_movement[[ID_COL, FRAME_COL, END_POSITION_COL]].copy(deep=True)
+        end = position
 
-    result = pd.merge(start, end, on=[ID_COL, FRAME_COL])[
-        [
-            ID_COL,
-            FRAME_COL,
-            START_POSITION_COL,
-            END_POSITION_COL,
-            WINDOW_SIZE_COL,
-        ]
-    ]
-    return result[result.window_size > 0]
+    return (
+        start[has_movement],
+        end[has_movement],
+        window[has_movement],
+        has_movement,
+    )
 
 
 def _get_continuous_parts_in_area(
@@ -886,60 +2318,31 @@ def _get_continuous_parts_in_area(
         is inside the measurement area, and 'leaving_frame' is first frame a
         pedestrian after the pedestrian has left the measurement area.
     """
-    inside = traj_data.data.loc[
-        shapely.within(traj_data.data.point, measurement_area.polygon), :
-    ].copy()
-    inside.loc[:, "g"] = inside.groupby(
-        by=ID_COL, group_keys=False
-    ).frame.apply(lambda x: x.diff().ge(2).cumsum())
-    inside_range = (
-        inside.groupby([ID_COL, "g"])
-        .agg(
-            entering_frame=(FRAME_COL, "first"),
-            leaving_frame=(FRAME_COL, "last"),
-        )
-        .reset_index()[[ID_COL, FIRST_FRAME_COL, LAST_FRAME_COL]]
+    is_inside = _compute_is_inside_area(
+        measurement_area=measurement_area,
+        x=traj_data.data[X_COL],
+        y=traj_data.data[Y_COL],
+    )
+    ids = traj_data.data[ID_COL].to_numpy()[is_inside]
+    frames = traj_data.data[FRAME_COL].to_numpy()[is_inside]
+
+    order = np.lexsort((frames, ids))
+    ids = ids[order]
+    frames = frames[order]
+
+    # a new continuous part starts with each pedestrian, or if at least one
+    # frame is missing since the previous frame inside the area
+    is_part_start = np.ones(len(ids), dtype=bool)
+    is_part_start[1:] = (np.diff(ids) != 0) | (np.diff(frames) >= 2)
+    is_part_end = np.ones(len(ids), dtype=bool)
+    is_part_end[:-1] = is_part_start[1:]
+    part_starts = np.flatnonzero(is_part_start)
+    part_ends = np.flatnonzero(is_part_end)
+
+    return pd.DataFrame(
+        {
+            ID_COL: ids[part_starts],
+            FIRST_FRAME_COL: frames[part_starts],
+            LAST_FRAME_COL: frames[part_ends] + 1,
+        }
     )
-    inside_range[LAST_FRAME_COL] += 1
-
-    return inside_range
-
-
-def _check_crossing_in_frame_range(
-    *,
-    inside_range: pd.DataFrame,
-    crossing_frames: pd.DataFrame,
-    check_column: str,
-    column_name: str,
-) -> pd.DataFrame:
-    """Returns rows of inside_range which are also in crossing_frames.
-
-    Args:
-        inside_range (pd.DataFrame): DataFrame containing the columns 'ID'
-            and check_column
-        crossing_frames (pd.DataFrame): DataFrame containing the columns 'ID'
-            and 'frame'
-        check_column (str): name of the column in inside_range which represents
-            a frame value. Needs to be 'frame_start' or 'frame_end'
-        column_name (str): name of the result column
-
-    Returns:
-        DataFrame containing the columns 'id', 'entering_frame',
-        'leaving_frame', and column_name
-    """
-    assert check_column in (
-        FIRST_FRAME_COL,
-        LAST_FRAME_COL,
-    ), f"check_column needs to be '{FIRST_FRAME_COL}' or '{LAST_FRAME_COL}'"
-
-    crossed = pd.merge(
-        inside_range,
-        crossing_frames,
-        left_on=[ID_COL, check_column],
-        right_on=[ID_COL, FRAME_COL],
-        how="left",
-        indicator=column_name,
-    )[[ID_COL, FIRST_FRAME_COL, LAST_FRAME_COL, column_name]]
-    crossed[column_name] = crossed[column_name] == "both"
-    crossed = crossed[crossed[column_name]]
-    return crossed
@@ -1,5 +1,5 @@
 """Module containing functions to compute velocities."""
-from typing import Optional, Tuple
+from typing import Optional, Sequence, Tuple
 
 import numpy as np
 import numpy.typing as npt
@@ -7,17 +7,25 @@ import pandas
 import shapely
 
 from pedpy.column_identifier import (
+    AREA_COL,
+    END_X_COL,
+    END_Y_COL,
     FRAME_COL,
     ID_COL,
     SPEED_COL,
+    START_X_COL,
+    START_Y_COL,
     V_X_COL,
     V_Y_COL,
 )
 from pedpy.data.geometry import MeasurementArea
 from pedpy.data.trajectory_data import TrajectoryData
+from pedpy.methods.analysis_cache import cached
 from pedpy.methods.method_utils import (
     SpeedCalculation,
     _compute_individual_movement,
+    _compute_is_inside_area,
+    _compute_points_in_areas,
 )
 
 
@@ -33,6 +41,7 @@ class SpeedError(Exception):
         self.message = message
 
 
+@cached()
 def compute_individual_speed(
     *,
     traj_data: TrajectoryData,
@@ -231,21 +240,17 @@ def compute_mean_speed_per_frame(
     Returns:
         DataFrame containing the columns 'frame' and 'speed' in m/s
     """
-    if len(individual_speed.index) < len(traj_data.data.index):
-        raise SpeedError(
-            f"Can not compute the mean speed, as the there are less speed "
-            f"data (rows={len(individual_speed)}) than trajectory data "
-            f"(rows={len(traj_data.data.index)}). This means a person occupies "
-            f"space but has no speed at some frames."
-            f"To resolve this either edit your trajectory data, s.th. it only "
-            f"contains the data that is also contained in the speed data. Or "
-            f"use a different speed border method when computing the individual "
-            f"speed."
-        )
+    _check_speed_data_complete(
+        traj_data=traj_data, individual_speed=individual_speed
+    )
 
     combined = traj_data.data.merge(individual_speed, on=[ID_COL, FRAME_COL])
     df_mean = (
-        combined[shapely.within(combined.point, measurement_area.polygon)]
+        combined[
+            _compute_is_inside_area(
+                measurement_area=measurement_area, x=combined.x, y=combined.y
+            )
+        ]
         .groupby(by=FRAME_COL)
         .speed.mean()
     )
@@ -256,6 +261,101 @@ def compute_mean_speed_per_frame(
     return df_mean
 
 
+def compute_mean_speed_per_frame_multi(
+    *,
+    traj_data: TrajectoryData,
+    individual_speed: pandas.DataFrame,
+    measurement_areas: Sequence[MeasurementArea],
+) -> pandas.DataFrame:
+    """Compute mean speed per frame inside multiple measurement areas.
+
+    Computes the same results as :func:`compute_mean_speed_per_frame` for each
+    of the given measurement areas in a single pass over the trajectory data.
+    The positions are sorted once into a coarse uniform grid, and for each
+    area only the positions in the grid cells overlapping its bounds are
+    checked. Hence, the effort grows with the number of positions and the
+    number of positions near each area, and not with the number of positions
+    times the number of areas.
+
+    The result is returned in long form, with the index of the measurement
+    area in :code:`measurement_areas` as additional level 'area'. The result
+    of :func:`compute_mean_speed_per_frame` for the i-th area is given by
+    :code:`speed.loc[i]`.
+
+    Args:
+        traj_data (TrajectoryData): trajectory data
+        individual_speed (pandas.DataFrame): individual speed data from
+            :func:`~speed_calculator.compute_individual_speed`
+        measurement_areas (Sequence[MeasurementArea]): measurement areas for
+            which the speed is computed
+
+    Returns:
+        DataFrame indexed by 'area' and 'frame' containing the column 'speed'
+        in m/s
+    """
+    if len(measurement_areas) == 0:
+        raise ValueError("At least one measurement area is needed.")
+
+    _check_speed_data_complete(
+        traj_data=traj_data, individual_speed=individual_speed
+    )
+
+    rows, areas = _compute_points_in_areas(
+        traj_data=traj_data, measurement_areas=measurement_areas
+    )
+    peds_in_areas = pandas.DataFrame(
+        {
+            AREA_COL: areas,
+            ID_COL: traj_data.data[ID_COL].to_numpy()[rows],
+            FRAME_COL: traj_data.data[FRAME_COL].to_numpy()[rows],
+        }
+    )
+    combined = peds_in_areas.merge(
+        individual_speed[[ID_COL, FRAME_COL, SPEED_COL]],
+        on=[ID_COL, FRAME_COL],
+    )
+    df_mean = combined.groupby(by=[AREA_COL, FRAME_COL]).speed.mean()
+
+    return df_mean.reindex(
+        pandas.MultiIndex.from_product(
+            [
+                range(len(measurement_areas)),
+                range(
+                    traj_data.data.frame.min(), traj_data.data.frame.max() + 1
+                ),
+            ],
+            names=[AREA_COL, FRAME_COL],
+        ),
+        fill_value=0.0,
+    )
+
+
+def _check_speed_data_complete(
+    *, traj_data: TrajectoryData, individual_speed: pandas.DataFrame
+) -> None:
+    """Check that there is speed data for each row of the trajectory data.
+
+    Args:
+        traj_data (TrajectoryData): trajectory data
+        individual_speed (pandas.DataFrame): individual speed data from
+            :func:`~speed_calculator.compute_individual_speed`
+
+    Raises:
+        SpeedError: if there are less speed data than trajectory data
+    """
+    if len(individual_speed.index) < len(traj_data.data.index):
+        raise SpeedError(
+            f"Can not compute the mean speed, as the there are less speed "
+            f"data (rows={len(individual_speed)}) than trajectory data "
+            f"(rows={len(traj_data.data.index)}). This means a person occupies "
+            f"space but has no speed at some frames."
+            f"To resolve this either edit your trajectory data, s.th. it only "
+            f"contains the data that is also contained in the speed data. Or "
+            f"use a different speed border method when computing the individual "
+            f"speed."
+        )
+
+
 def compute_voronoi_speed(
     *,
     traj_data: TrajectoryData,
@@ -381,7 +481,7 @@ def _compute_individual_speed(
 
     Args:
         movement_data (pandas.DataFrame): movement data
-            (see compute_individual_movement)
+            (see _compute_individual_movement)
         frame_rate (float): frame rate of the trajectory data
         movement_direction (np.ndarray): main movement direction on which the
             actual movement is projected (default: None, when the un-projected
@@ -397,9 +497,12 @@ def _compute_individual_speed(
     time_interval = movement_data.window_size / frame_rate
 
     # Compute displacements in x and y direction
-    movement_data[["d_x", "d_y"]] = shapely.get_coordinates(
-        movement_data.end_position
-    ) - shapely.get_coordinates(movement_data.start_position)
+    movement_data["d_x"] = (
+        movement_data[END_X_COL].values - movement_data[START_X_COL].values
+    )
+    movement_data["d_y"] = (
+        movement_data[END_Y_COL].values - movement_data[START_Y_COL].values
+    )
 
     movement_data[SPEED_COL] = (
         np.linalg.norm(movement_data[["d_x", "d_y"]], axis=1) / time_interval
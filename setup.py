@@ -43,4 +43,7 @@ setuptools.setup(
         "scipy~=1.11",
         "matplotlib~=3.7",
     ],
+    extras_require={
+        "hdf5": ["h5py~=3.9"],
+    },
 )
@@ -533,6 +533,34 @@ def test_changing_measurement_area_fails():
         )
 
 
+@pytest.mark.parametrize(
+    "coordinates, is_rectangle",
+    [
+        ([(0, 0), (0, 1), (1, 1), (1, 0)], True),
+        ([(-2.5, 1.0), (3.0, 1.0), (3.0, 4.2), (-2.5, 4.2)], True),
+        ([(0, 0), (1, 0), (2, 0), (2, 1), (0, 1), (0, 1)], True),
+        ([(0, 3.1), (1.2, 5.4), (4.1, 7.9), (7.1, 3.0)], False),
+        ([(-5.1, -3.2), (-3.1, 2.4), (-1.1, -2.5)], False),
+        ([(0, 0), (1, 0), (1, 1), (0.5, 1.5), (0, 1)], False),
+    ],
+)
+def test_measurement_area_half_planes(coordinates, is_rectangle):
+    measurement_area = MeasurementArea(coordinates)
+    half_planes = measurement_area.half_planes
+
+    assert measurement_area.is_rectangle == is_rectangle
+    # the edges form a closed ring in counter-clockwise order without
+    # degenerated edges
+    assert (half_planes[:-1, 2:] == half_planes[1:, :2]).all()
+    assert (half_planes[-1, 2:] == half_planes[0, :2]).all()
+    assert (half_planes[:, :2] != half_planes[:, 2:]).any(axis=1).all()
+    assert shapely.Polygon(half_planes[:, :2]).exterior.is_ccw
+    assert shapely.Polygon(half_planes[:, :2]).equals(measurement_area.polygon)
+
+    with pytest.raises(ValueError, match="read-only"):
+        half_planes[0, 0] = 1.0
+
+
 ###############################################################################
 # Measurement Line
 ###############################################################################
@@ -1,9 +1,12 @@
 import pathlib
 from dataclasses import FrozenInstanceError
 
+import numpy as np
 import pandas as pd
 import pytest
+import shapely
 
+from pedpy.column_identifier import *
 from pedpy.data.trajectory_data import TrajectoryData
 
 
@@ -24,3 +27,34 @@ def test_changing_trajectory_data_fails():
         FrozenInstanceError,
     ):
         trajectory_data.frame_rate = 10
+
+
+def test_trajectory_data_lazy_points():
+    data = pd.DataFrame.from_dict(
+        {
+            "id": [0, 1, 0, 1],
+            "frame": [0, 0, 1, 1],
+            "x": [0, 1, 0.5, 1.5],
+            "y": [0, 1, 0, 1],
+            "z": [0, 0, 0, 0],
+        }
+    )
+    trajectory_data = TrajectoryData(data=data, frame_rate=25, lazy_points=True)
+
+    assert list(trajectory_data.data.columns) == [
+        ID_COL,
+        FRAME_COL,
+        X_COL,
+        Y_COL,
+    ]
+    assert trajectory_data.data[ID_COL].dtype == np.int64
+    assert trajectory_data.data[FRAME_COL].dtype == np.int64
+    assert trajectory_data.data[X_COL].dtype == np.float64
+    assert trajectory_data.data[Y_COL].dtype == np.float64
+
+    points = trajectory_data.points
+    assert points is trajectory_data.points
+    assert np.array_equal(shapely.get_coordinates(points), data[[X_COL, Y_COL]])
+    assert shapely.equals(
+        points, TrajectoryData(data=data, frame_rate=25).points
+    ).all()
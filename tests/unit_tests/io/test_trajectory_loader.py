@@ -1,5 +1,5 @@
 import pathlib
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Tuple
 
 import numpy as np
 import numpy.typing as npt
@@ -8,12 +8,21 @@ import pytest
 from numpy import dtype
 
 from pedpy.column_identifier import *
+from pedpy.data.trajectory_data import TrajectoryData
+from pedpy.io.binary_trajectory_loader import (
+    load_trajectory_from_binary,
+    write_trajectory_to_binary,
+)
+from pedpy.io.hdf5_trajectory_loader import load_trajectory_from_hdf5
 from pedpy.io.trajectory_loader import (
-    TrajectoryUnit,
     _load_trajectory_data,
     _load_trajectory_meta_data,
     load_trajectory,
+    load_trajectory_chunks,
 )
+from pedpy.io.trajectory_meta_data import TrajectoryUnit
+from pedpy.methods.method_utils import SpeedCalculation
+from pedpy.methods.speed_calculator import compute_individual_speed
 
 
 def prepare_data_frame(data_frame: pd.DataFrame) -> pd.DataFrame:
@@ -546,3 +555,474 @@ def test_load_trajectory_meta_data_failure(
         )
 
     assert expected_message in str(error_info.value)
+
+
+def get_binary_test_trajectory() -> TrajectoryData:
+    return TrajectoryData(
+        data=pd.DataFrame(
+            {
+                ID_COL: [1, 2, 1, 2, 3, 3, 1],
+                FRAME_COL: [0, 0, 1, 1, 1, 3, 3],
+                X_COL: [0.0, 1.0, 0.5, 1.5, -2.0, -2.5, 1.0],
+                Y_COL: [0.0, -1.0, 0.25, -0.5, 3.0, 3.5, 0.5],
+            }
+        ).sample(frac=1, random_state=42),
+        frame_rate=25.0,
+    )
+
+
+def test_load_trajectory_binary_round_trip(tmp_path: pathlib.Path) -> None:
+    trajectory_bin = pathlib.Path(tmp_path / "trajectory.bin")
+    traj_data = get_binary_test_trajectory()
+
+    write_trajectory_to_binary(
+        traj_data=traj_data, trajectory_file=trajectory_bin
+    )
+    traj_data_from_file = load_trajectory(trajectory_file=trajectory_bin)
+
+    expected_data = traj_data.data.sort_values(
+        by=[FRAME_COL, ID_COL]
+    ).reset_index(drop=True)[[ID_COL, FRAME_COL, X_COL, Y_COL]]
+    result_data = traj_data_from_file.data.sort_values(
+        by=[FRAME_COL, ID_COL]
+    ).reset_index(drop=True)
+
+    assert traj_data_from_file.frame_rate == traj_data.frame_rate
+    assert traj_data_from_file.lazy_points
+    assert result_data[FRAME_COL].is_monotonic_increasing
+    pd.testing.assert_frame_equal(result_data, expected_data)
+
+
+@pytest.mark.parametrize(
+    "frame_range, expected_frames",
+    [
+        ((0, 3), [0, 0, 1, 1, 1, 3, 3]),
+        ((1, 1), [1, 1, 1]),
+        ((1, 2), [1, 1, 1]),
+        ((2, 2), []),
+        ((-5, 0), [0, 0]),
+        ((3, 10), [3, 3]),
+    ],
+)
+def test_load_trajectory_from_binary_frame_range(
+    tmp_path: pathlib.Path,
+    frame_range: Tuple[int, int],
+    expected_frames: List[int],
+) -> None:
+    trajectory_bin = pathlib.Path(tmp_path / "trajectory.bin")
+    write_trajectory_to_binary(
+        traj_data=get_binary_test_trajectory(), trajectory_file=trajectory_bin
+    )
+
+    traj_data_from_file = load_trajectory_from_binary(
+        trajectory_file=trajectory_bin, frame_range=frame_range
+    )
+
+    assert traj_data_from_file.data[FRAME_COL].tolist() == expected_frames
+
+
+@pytest.mark.parametrize(
+    "default_frame_rate, default_unit, expected_message",
+    [
+        (
+            30.0,
+            None,
+            "The given default frame rate seems to differ from the frame rate "
+            "given in the trajectory file:",
+        ),
+        (
+            None,
+            TrajectoryUnit.CENTIMETER,
+            "The given default unit seems to differ from the unit given in the "
+            "trajectory file:",
+        ),
+    ],
+)
+def test_load_trajectory_binary_meta_data_failure(
+    tmp_path: pathlib.Path,
+    default_frame_rate: Optional[float],
+    default_unit: Optional[TrajectoryUnit],
+    expected_message: str,
+) -> None:
+    trajectory_bin = pathlib.Path(tmp_path / "trajectory.bin")
+    write_trajectory_to_binary(
+        traj_data=get_binary_test_trajectory(), trajectory_file=trajectory_bin
+    )
+
+    with pytest.raises(ValueError) as error_info:
+        load_trajectory(
+            trajectory_file=trajectory_bin,
+            default_frame_rate=default_frame_rate,
+            default_unit=default_unit,
+        )
+
+    assert expected_message in str(error_info.value)
+
+
+def test_load_trajectory_from_binary_invalid_file(
+    tmp_path: pathlib.Path,
+) -> None:
+    trajectory_txt = pathlib.Path(tmp_path / "trajectory.txt")
+    with trajectory_txt.open("w") as f:
+        f.write("#framerate: 8.00\n")
+
+    with pytest.raises(ValueError) as error_info:
+        load_trajectory_from_binary(trajectory_file=trajectory_txt)
+
+    assert "is not a valid binary trajectory file" in str(error_info.value)
+
+
+def write_hdf5_trajectory_file(
+    *,
+    data: pd.DataFrame,
+    file: pathlib.Path,
+    frame_rate: Optional[float] = None,
+    unit_description: Optional[str] = None,
+    compound: bool = True,
+) -> None:
+    h5py = pytest.importorskip("h5py")
+    with h5py.File(file, "w") as hdf5_file:
+        if compound:
+            records = np.empty(
+                len(data.index),
+                dtype=[
+                    (ID_COL, "i8"),
+                    (FRAME_COL, "i8"),
+                    (X_COL, "f8"),
+                    (Y_COL, "f8"),
+                    ("z", "f8"),
+                ],
+            )
+            for column in (ID_COL, FRAME_COL, X_COL, Y_COL):
+                records[column] = data[column]
+            records["z"] = 1.7
+            dataset = hdf5_file.create_dataset("trajectory", data=records)
+            if unit_description is not None:
+                dataset.attrs[X_COL] = unit_description
+            if frame_rate is not None:
+                dataset.attrs["fps"] = frame_rate
+        else:
+            for column in (ID_COL, FRAME_COL, X_COL, Y_COL):
+                hdf5_file.create_dataset(column, data=data[column].values)
+            if unit_description is not None:
+                hdf5_file[X_COL].attrs["unit"] = unit_description
+            if frame_rate is not None:
+                hdf5_file.attrs["frame_rate"] = frame_rate
+
+
+def get_hdf5_test_data() -> pd.DataFrame:
+    num_frames = 50
+    return pd.DataFrame(
+        {
+            ID_COL: np.repeat(np.arange(1, 6), num_frames),
+            FRAME_COL: np.tile(np.arange(num_frames), 5),
+            X_COL: np.linspace(-5, 5, 5 * num_frames),
+            Y_COL: np.linspace(10, 0, 5 * num_frames),
+        }
+    )
+
+
+@pytest.mark.parametrize("compound", [True, False])
+@pytest.mark.parametrize(
+    "unit_description, expected_factor",
+    [
+        ("pedestrian x-coordinate (meter [m])", 1),
+        ("pedestrian x-coordinate (centimeter [cm])", 100),
+        ("m", 1),
+        ("cm", 100),
+    ],
+)
+def test_load_trajectory_hdf5_success(
+    tmp_path: pathlib.Path,
+    compound: bool,
+    unit_description: str,
+    expected_factor: float,
+) -> None:
+    trajectory_h5 = pathlib.Path(tmp_path / "trajectory.h5")
+    data = get_hdf5_test_data()
+    write_hdf5_trajectory_file(
+        data=data,
+        file=trajectory_h5,
+        frame_rate=16.0,
+        unit_description=unit_description,
+        compound=compound,
+    )
+
+    traj_data_from_file = load_trajectory(trajectory_file=trajectory_h5)
+
+    expected_data = data.copy()
+    expected_data[X_COL] /= expected_factor
+    expected_data[Y_COL] /= expected_factor
+
+    assert traj_data_from_file.frame_rate == 16.0
+    pd.testing.assert_frame_equal(
+        traj_data_from_file.data[[ID_COL, FRAME_COL, X_COL, Y_COL]],
+        expected_data,
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 1000])
+@pytest.mark.parametrize(
+    "frame_range, ids",
+    [
+        (None, None),
+        ((10, 20), None),
+        (None, [2, 4]),
+        ((0, 0), [5]),
+        ((45, 100), [1, 3, 10]),
+        ((100, 200), None),
+    ],
+)
+def test_load_trajectory_from_hdf5_selection(
+    tmp_path: pathlib.Path,
+    chunk_size: int,
+    frame_range: Optional[Tuple[int, int]],
+    ids: Optional[List[int]],
+) -> None:
+    trajectory_h5 = pathlib.Path(tmp_path / "trajectory.h5")
+    data = get_hdf5_test_data()
+    write_hdf5_trajectory_file(
+        data=data, file=trajectory_h5, frame_rate=25.0, unit_description="m"
+    )
+
+    traj_data_from_file = load_trajectory_from_hdf5(
+        trajectory_file=trajectory_h5,
+        frame_range=frame_range,
+        ids=ids,
+        chunk_size=chunk_size,
+    )
+
+    expected_data = data
+    if frame_range is not None:
+        expected_data = expected_data[
+            expected_data[FRAME_COL].between(*frame_range)
+        ]
+    if ids is not None:
+        expected_data = expected_data[expected_data[ID_COL].isin(ids)]
+
+    pd.testing.assert_frame_equal(
+        traj_data_from_file.data[[ID_COL, FRAME_COL, X_COL, Y_COL]],
+        expected_data.reset_index(drop=True),
+    )
+
+
+def test_load_trajectory_hdf5_defaults(tmp_path: pathlib.Path) -> None:
+    trajectory_h5 = pathlib.Path(tmp_path / "trajectory.h5")
+    write_hdf5_trajectory_file(data=get_hdf5_test_data(), file=trajectory_h5)
+
+    with pytest.raises(ValueError) as error_info:
+        load_trajectory(trajectory_file=trajectory_h5)
+    assert "Frame rate is needed, but none could be found" in str(
+        error_info.value
+    )
+
+    traj_data_from_file = load_trajectory(
+        trajectory_file=trajectory_h5,
+        default_frame_rate=10.0,
+        default_unit=TrajectoryUnit.CENTIMETER,
+    )
+    assert traj_data_from_file.frame_rate == 10.0
+    assert traj_data_from_file.data[X_COL].max() == pytest.approx(0.05)
+
+
+def test_load_trajectory_hdf5_invalid_file(tmp_path: pathlib.Path) -> None:
+    h5py = pytest.importorskip("h5py")
+    trajectory_h5 = pathlib.Path(tmp_path / "trajectory.h5")
+    with h5py.File(trajectory_h5, "w") as hdf5_file:
+        hdf5_file.create_dataset("positions", data=np.zeros((3, 2)))
+
+    with pytest.raises(ValueError) as error_info:
+        load_trajectory(trajectory_file=trajectory_h5)
+
+    assert "does not contain trajectory data" in str(error_info.value)
+
+
+def get_chunk_test_data() -> pd.DataFrame:
+    rng = np.random.default_rng(seed=7)
+    pedestrians = []
+    for ped_id, (first_frame, last_frame) in enumerate(
+        [(0, 60), (5, 23), (17, 99), (40, 41), (42, 70), (80, 99)], start=1
+    ):
+        frames = np.arange(first_frame, last_frame + 1)
+        pedestrians.append(
+            pd.DataFrame(
+                {
+                    ID_COL: ped_id,
+                    FRAME_COL: frames,
+                    X_COL: np.cumsum(rng.uniform(0, 0.1, frames.size)),
+                    Y_COL: np.cumsum(rng.uniform(-0.05, 0.05, frames.size)),
+                }
+            )
+        )
+    return pd.concat(pedestrians, ignore_index=True)
+
+
+def write_chunk_test_file(
+    *, data: pd.DataFrame, file: pathlib.Path, file_format: str
+) -> None:
+    if file_format == "binary":
+        write_trajectory_to_binary(
+            traj_data=TrajectoryData(data=data, frame_rate=10.0),
+            trajectory_file=file,
+        )
+        return
+
+    if file_format == "sorted by frame":
+        data = data.sort_values(by=[FRAME_COL, ID_COL])
+    write_trajectory_file(
+        data=data, file=file, frame_rate=10.0, unit=TrajectoryUnit.METER
+    )
+
+
+@pytest.mark.parametrize(
+    "file_format", ["sorted by id", "sorted by frame", "binary"]
+)
+@pytest.mark.parametrize(
+    "frames_per_chunk, overlap_frames, rows_per_read",
+    [(1, 0, 1000), (10, 0, 17), (7, 3, 50), (33, 5, 1), (1000, 2, 100)],
+)
+def test_load_trajectory_chunks_cover_trajectory(
+    tmp_path: pathlib.Path,
+    file_format: str,
+    frames_per_chunk: int,
+    overlap_frames: int,
+    rows_per_read: int,
+) -> None:
+    trajectory_file = pathlib.Path(tmp_path / "trajectory")
+    data = get_chunk_test_data()
+    write_chunk_test_file(
+        data=data, file=trajectory_file, file_format=file_format
+    )
+
+    chunks = list(
+        load_trajectory_chunks(
+            trajectory_file=trajectory_file,
+            frames_per_chunk=frames_per_chunk,
+            overlap_frames=overlap_frames,
+            rows_per_read=rows_per_read,
+        )
+    )
+
+    assert chunks[0].first_frame == data[FRAME_COL].min()
+    assert chunks[-1].last_frame == data[FRAME_COL].max()
+    for chunk, next_chunk in zip(chunks, chunks[1:]):
+        assert chunk.last_frame - chunk.first_frame + 1 == frames_per_chunk
+        assert next_chunk.first_frame == chunk.last_frame + 1
+
+    for chunk in chunks:
+        expected_data = data[
+            data[FRAME_COL].between(
+                chunk.first_frame - overlap_frames,
+                chunk.last_frame + overlap_frames,
+            )
+        ]
+        assert chunk.traj_data.frame_rate == 10.0
+        pd.testing.assert_frame_equal(
+            chunk.traj_data.data[[ID_COL, FRAME_COL, X_COL, Y_COL]]
+            .sort_values(by=[FRAME_COL, ID_COL])
+            .reset_index(drop=True),
+            expected_data.sort_values(by=[FRAME_COL, ID_COL]).reset_index(
+                drop=True
+            ),
+        )
+
+
+@pytest.mark.parametrize(
+    "file_format", ["sorted by id", "sorted by frame", "binary"]
+)
+@pytest.mark.parametrize(
+    "speed_calculation",
+    [
+        SpeedCalculation.BORDER_EXCLUDE,
+        SpeedCalculation.BORDER_ADAPTIVE,
+        SpeedCalculation.BORDER_SINGLE_SIDED,
+    ],
+)
+def test_load_trajectory_chunks_speed_is_exact(
+    tmp_path: pathlib.Path,
+    file_format: str,
+    speed_calculation: SpeedCalculation,
+) -> None:
+    trajectory_file = pathlib.Path(tmp_path / "trajectory")
+    data = get_chunk_test_data()
+    write_chunk_test_file(
+        data=data, file=trajectory_file, file_format=file_format
+    )
+    frame_step = 4
+
+    expected_speed = compute_individual_speed(
+        traj_data=TrajectoryData(data=data, frame_rate=10.0),
+        frame_step=frame_step,
+        speed_calculation=speed_calculation,
+    )
+
+    chunk_speeds = []
+    for chunk in load_trajectory_chunks(
+        trajectory_file=trajectory_file,
+        frames_per_chunk=9,
+        overlap_frames=frame_step,
+    ):
+        speed = compute_individual_speed(
+            traj_data=chunk.traj_data,
+            frame_step=frame_step,
+            speed_calculation=speed_calculation,
+        )
+        chunk_speeds.append(
+            speed[speed[FRAME_COL].between(chunk.first_frame, chunk.last_frame)]
+        )
+
+    pd.testing.assert_frame_equal(
+        pd.concat(chunk_speeds)
+        .sort_values(by=[ID_COL, FRAME_COL])
+        .reset_index(drop=True),
+        expected_speed.sort_values(by=[ID_COL, FRAME_COL]).reset_index(
+            drop=True
+        ),
+    )
+
+
+def test_load_trajectory_chunks_invalid_arguments(
+    tmp_path: pathlib.Path,
+) -> None:
+    trajectory_file = pathlib.Path(tmp_path / "trajectory.txt")
+    write_chunk_test_file(
+        data=get_chunk_test_data(),
+        file=trajectory_file,
+        file_format="sorted by id",
+    )
+
+    # the arguments are checked when calling, not when iterating
+    with pytest.raises(ValueError) as error_info:
+        load_trajectory_chunks(
+            trajectory_file=trajectory_file, frames_per_chunk=0
+        )
+    assert "number of frames per chunk needs to be positive" in str(
+        error_info.value
+    )
+
+    with pytest.raises(ValueError) as error_info:
+        load_trajectory_chunks(
+            trajectory_file=trajectory_file,
+            frames_per_chunk=10,
+            overlap_frames=-1,
+        )
+    assert "number of overlapping frames can not be negative" in str(
+        error_info.value
+    )
+
+    with pytest.raises(ValueError) as error_info:
+        load_trajectory_chunks(
+            trajectory_file=trajectory_file,
+            frames_per_chunk=10,
+            default_frame_rate=25.0,
+        )
+    assert "The given default frame rate seems to differ" in str(
+        error_info.value
+    )
+
+    with pytest.raises(IOError) as error_info:
+        load_trajectory_chunks(
+            trajectory_file=pathlib.Path(tmp_path / "missing.txt"),
+            frames_per_chunk=10,
+        )
+    assert "does not exist" in str(error_info.value)
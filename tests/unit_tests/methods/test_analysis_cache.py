@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pedpy.data.geometry import MeasurementLine, WalkableArea
+from pedpy.data.trajectory_data import TrajectoryData
+from pedpy.methods.analysis_cache import AnalysisCache
+from pedpy.methods.flow_calculator import compute_n_t
+from pedpy.methods.method_utils import (
+    compute_crossing_frames,
+    compute_crossing_frames_multi,
+    compute_frame_range_in_area,
+    compute_individual_voronoi_polygons,
+)
+from pedpy.methods.speed_calculator import compute_individual_speed
+from tests.utils.utils import get_trajectory_data
+
+
+@pytest.fixture
+def traj_data():
+    return get_trajectory_data(
+        grid_shape=[4, 4],
+        number_frames=30,
+        start_position=np.array([-2, -2]),
+        movement_direction=np.array([0.1, 0]),
+        ped_distance=1.0,
+    )
+
+
+@pytest.fixture
+def walkable_area():
+    return WalkableArea([(-10, -10), (10, -10), (10, 10), (-10, 10)])
+
+
+def test_cache_returns_same_result_as_uncached(traj_data, walkable_area):
+    expected = compute_individual_voronoi_polygons(
+        traj_data=traj_data, walkable_area=walkable_area
+    )
+
+    with AnalysisCache() as cache:
+        first = compute_individual_voronoi_polygons(
+            traj_data=traj_data, walkable_area=walkable_area
+        )
+        second = compute_individual_voronoi_polygons(
+            traj_data=traj_data, walkable_area=walkable_area
+        )
+
+    assert cache.misses == 1
+    assert cache.hits == 1
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(second, expected)
+
+
+def test_cache_ignores_number_of_workers(traj_data, walkable_area):
+    with AnalysisCache() as cache:
+        serial = compute_individual_voronoi_polygons(
+            traj_data=traj_data, walkable_area=walkable_area
+        )
+        parallel = compute_individual_voronoi_polygons(
+            traj_data=traj_data, walkable_area=walkable_area, n_workers=2
+        )
+
+    assert cache.misses == 1
+    assert cache.hits == 1
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_cache_shares_crossing_frames_of_multiple_lines(traj_data):
+    # the second line is the one used by compute_frame_range_in_area
+    measurement_lines = [
+        MeasurementLine([(0, 10), (0, -10)]),
+        MeasurementLine([(1, 10), (1, -10)]),
+    ]
+    expected = compute_crossing_frames_multi(
+        traj_data=traj_data, measurement_lines=measurement_lines
+    )
+    expected_n_t, _ = compute_n_t(
+        traj_data=traj_data, measurement_line=measurement_lines[1]
+    )
+
+    with AnalysisCache() as cache:
+        compute_frame_range_in_area(
+            traj_data=traj_data,
+            measurement_line=measurement_lines[0],
+            width=1.0,
+        )
+        assert cache.misses == 2
+        crossing_frames = compute_crossing_frames_multi(
+            traj_data=traj_data, measurement_lines=measurement_lines
+        )
+        n_t, _ = compute_n_t(
+            traj_data=traj_data, measurement_line=measurement_lines[1]
+        )
+
+    assert cache.misses == 2
+    assert cache.hits == 3
+    pd.testing.assert_frame_equal(crossing_frames, expected)
+    pd.testing.assert_frame_equal(n_t, expected_n_t)
+
+
+def test_cache_distinguishes_arguments(traj_data):
+    with AnalysisCache() as cache:
+        speed_5 = compute_individual_speed(traj_data=traj_data, frame_step=5)
+        speed_3 = compute_individual_speed(traj_data=traj_data, frame_step=3)
+        assert cache.hits == 0
+        compute_individual_speed(traj_data=traj_data, frame_step=5)
+        assert cache.hits == 1
+
+    assert len(speed_5) != len(speed_3)
+    pd.testing.assert_frame_equal(
+        speed_3, compute_individual_speed(traj_data=traj_data, frame_step=3)
+    )
+
+
+def test_cache_identifies_trajectory_data_by_content(traj_data):
+    line = MeasurementLine([(0, -10), (0, 10)])
+    copy = TrajectoryData(
+        data=traj_data.data[["id", "frame", "x", "y"]],
+        frame_rate=traj_data.frame_rate,
+    )
+    moved_data = traj_data.data[["id", "frame", "x", "y"]].copy()
+    moved_data.x += 0.5
+    moved = TrajectoryData(data=moved_data, frame_rate=traj_data.frame_rate)
+
+    assert copy.content_hash == traj_data.content_hash
+    assert moved.content_hash != traj_data.content_hash
+
+    with AnalysisCache() as cache:
+        compute_crossing_frames(traj_data=traj_data, measurement_line=line)
+        hits = cache.hits
+        compute_crossing_frames(traj_data=copy, measurement_line=line)
+        assert cache.hits == hits + 1
+        compute_crossing_frames(traj_data=moved, measurement_line=line)
+        assert cache.hits == hits + 1
+
+
+def test_cache_returns_independent_copies(traj_data):
+    with AnalysisCache():
+        first = compute_individual_speed(traj_data=traj_data, frame_step=5)
+        first.loc[:, "speed"] = -1.0
+        second = compute_individual_speed(traj_data=traj_data, frame_step=5)
+
+    assert (second.speed >= 0).all()
+
+
+def test_cache_is_only_used_while_active(traj_data):
+    cache = AnalysisCache()
+    compute_individual_speed(traj_data=traj_data, frame_step=5)
+    assert cache.misses == 0
+
+    with cache:
+        compute_individual_speed(traj_data=traj_data, frame_step=5)
+    compute_individual_speed(traj_data=traj_data, frame_step=5)
+
+    assert cache.hits == 0
+    assert cache.num_entries > 0
+
+
+def test_cache_evicts_least_recently_used_results():
+    cache = AnalysisCache(max_bytes=200)
+    result = np.zeros(10)
+
+    cache.get_or_compute(key="a", compute=lambda: result)
+    cache.get_or_compute(key="b", compute=lambda: result)
+    cache.get_or_compute(key="a", compute=lambda: result)
+    cache.get_or_compute(key="c", compute=lambda: result)
+
+    assert cache.num_entries == 2
+    assert cache.num_bytes == 2 * result.nbytes
+    cache.get_or_compute(key="a", compute=lambda: result)
+    cache.get_or_compute(key="b", compute=lambda: result)
+    assert cache.hits == 2
+    assert cache.misses == 4
+
+
+def test_cache_does_not_keep_results_larger_than_limit():
+    cache = AnalysisCache(max_bytes=10)
+    cache.get_or_compute(key="a", compute=lambda: np.zeros(10))
+
+    assert cache.num_entries == 0
+    assert cache.num_bytes == 0
+
+
+def test_cache_persists_results_in_directory(traj_data, tmp_path):
+    with AnalysisCache(directory=tmp_path) as cache:
+        expected = compute_individual_speed(traj_data=traj_data, frame_step=5)
+    assert cache.misses > 0
+
+    with AnalysisCache(directory=tmp_path) as cache:
+        result = compute_individual_speed(traj_data=traj_data, frame_step=5)
+
+    assert cache.misses == 0
+    assert cache.hits == 1
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_cache_needs_non_negative_max_bytes():
+    with pytest.raises(ValueError, match=r"max_bytes needs to be"):
+        AnalysisCache(max_bytes=-1)
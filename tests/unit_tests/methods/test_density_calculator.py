@@ -5,13 +5,24 @@ import shapely
 from shapely.geometry import Point
 
 from pedpy.column_identifier import *
-from pedpy.data.geometry import MeasurementArea
+from pedpy.data.geometry import MeasurementArea, WalkableArea
 from pedpy.data.trajectory_data import TrajectoryData
 from pedpy.methods.density_calculator import (
+    OnlineVoronoiDensity,
     _get_num_peds_per_frame,
     compute_classic_density,
+    compute_classic_density_chunked,
+    compute_classic_density_multi,
+    compute_passing_density,
+    compute_voronoi_density,
+    compute_voronoi_density_multi,
+)
+from pedpy.methods.method_utils import compute_individual_voronoi_polygons
+from tests.utils.utils import (
+    get_trajectory,
+    get_trajectory_chunks,
+    get_trajectory_data,
 )
-from tests.utils.utils import get_trajectory, get_trajectory_data
 
 
 @pytest.mark.parametrize(
@@ -94,3 +105,350 @@ def test_get_num_peds_per_frame(num_peds_row, num_peds_col, num_frames):
     num_peds_per_frame = _get_num_peds_per_frame(traj_data)
 
     assert (num_peds_per_frame[COUNT_COL] == num_peds).all()
+
+
+def test_compute_classic_density_lazy_points():
+    trajectory_data = get_trajectory_data(
+        grid_shape=[5, 5],
+        number_frames=50,
+        movement_direction=np.array([0.1, 0]),
+        start_position=np.array([-3, -2]),
+        ped_distance=0.5,
+        fps=25,
+    )
+    lazy_trajectory_data = TrajectoryData(
+        data=trajectory_data.data,
+        frame_rate=trajectory_data.frame_rate,
+        lazy_points=True,
+    )
+    measurement_area = MeasurementArea([(-1, -1), (-1, 1), (1, 1), (1, -1)])
+
+    density = compute_classic_density(
+        traj_data=trajectory_data, measurement_area=measurement_area
+    )
+    lazy_density = compute_classic_density(
+        traj_data=lazy_trajectory_data, measurement_area=measurement_area
+    )
+
+    assert POINT_COL not in lazy_trajectory_data.data.columns
+    assert density.equals(lazy_density)
+
+
+@pytest.mark.parametrize(
+    "frames_per_chunk, overlap_frames",
+    [(1, 0), (7, 0), (10, 3), (49, 1), (100, 0)],
+)
+def test_compute_classic_density_chunked_equals_batch(
+    frames_per_chunk, overlap_frames
+):
+    trajectory_data = get_trajectory_data(
+        grid_shape=[5, 5],
+        number_frames=50,
+        movement_direction=np.array([0.5, 0]),
+        start_position=np.array([-10, 0]),
+        ped_distance=1.0,
+        fps=25,
+    )
+    measurement_area = MeasurementArea([(-5, -1), (-5, 3), (5, 3), (5, -1)])
+
+    expected_density = compute_classic_density(
+        traj_data=trajectory_data, measurement_area=measurement_area
+    )
+
+    computed_density = pd.concat(
+        compute_classic_density_chunked(
+            traj_chunks=get_trajectory_chunks(
+                traj_data=trajectory_data,
+                frames_per_chunk=frames_per_chunk,
+                overlap_frames=overlap_frames,
+            ),
+            measurement_area=measurement_area,
+        )
+    )
+
+    pd.testing.assert_frame_equal(computed_density, expected_density)
+
+
+@pytest.mark.parametrize(
+    "frames_per_update, window_size",
+    [(1, 1000), (10, 1000), (7, 20), (25, 1), (100, 30)],
+)
+def test_online_voronoi_density_equals_batch(frames_per_update, window_size):
+    num_frames = 60
+    trajectory_data = get_trajectory_data(
+        grid_shape=[4, 5],
+        number_frames=num_frames,
+        movement_direction=np.array([0.2, 0]),
+        start_position=np.array([-8, -2]),
+        ped_distance=1.0,
+    )
+    walkable_area = WalkableArea([(-10, -5), (10, -5), (10, 5), (-10, 5)])
+    measurement_area = MeasurementArea([(-2, -1), (2, -1), (2, 1), (-2, 1)])
+
+    expected_density, expected_voronoi_data = compute_voronoi_density(
+        individual_voronoi_data=compute_individual_voronoi_polygons(
+            traj_data=trajectory_data, walkable_area=walkable_area
+        ),
+        measurement_area=measurement_area,
+    )
+
+    online_density = OnlineVoronoiDensity(
+        walkable_area=walkable_area,
+        measurement_area=measurement_area,
+        window_size=window_size,
+    )
+    new_densities = []
+    for chunk in get_trajectory_chunks(
+        traj_data=trajectory_data,
+        frames_per_chunk=frames_per_update,
+        overlap_frames=0,
+    ):
+        new_densities.append(online_density.update(traj_data=chunk.traj_data))
+
+    first_frame_in_window = num_frames - window_size
+    pd.testing.assert_frame_equal(pd.concat(new_densities), expected_density)
+    pd.testing.assert_frame_equal(
+        online_density.density,
+        expected_density[expected_density.index >= first_frame_in_window],
+    )
+
+    voronoi_data = online_density.voronoi_data.sort_values(
+        by=[ID_COL, FRAME_COL]
+    ).reset_index(drop=True)
+    expected_voronoi_data = (
+        expected_voronoi_data[
+            expected_voronoi_data.frame >= first_frame_in_window
+        ]
+        .sort_values(by=[ID_COL, FRAME_COL])
+        .reset_index(drop=True)
+    )
+    assert (
+        voronoi_data.columns.tolist() == expected_voronoi_data.columns.tolist()
+    )
+    pd.testing.assert_frame_equal(
+        voronoi_data[[ID_COL, FRAME_COL, DENSITY_COL]],
+        expected_voronoi_data[[ID_COL, FRAME_COL, DENSITY_COL]],
+    )
+    assert shapely.equals_exact(
+        voronoi_data.polygon.values, expected_voronoi_data.polygon.values, 0
+    ).all()
+
+
+def test_online_voronoi_density_update_without_polygons():
+    trajectory_data = get_trajectory_data(
+        grid_shape=[2, 2],
+        number_frames=30,
+        movement_direction=np.array([0.1, 0]),
+        start_position=np.array([-2, -1]),
+        ped_distance=1.0,
+    )
+    data = trajectory_data.data
+    # in frames 10 to 19 only a single pedestrian is left, for which no
+    # Voronoi polygon can be computed without blind points
+    data = data[(data.frame < 10) | (data.frame >= 20) | (data.id == 0)]
+    online_density = OnlineVoronoiDensity(
+        walkable_area=WalkableArea([(-5, -5), (5, -5), (5, 5), (-5, 5)]),
+        measurement_area=MeasurementArea([(-2, -2), (2, -2), (2, 2), (-2, 2)]),
+        window_size=100,
+        use_blind_points=False,
+    )
+
+    new_densities = [
+        online_density.update(
+            traj_data=TrajectoryData(
+                data=data[data.frame.between(first_frame, first_frame + 9)],
+                frame_rate=trajectory_data.frame_rate,
+            )
+        )
+        for first_frame in [0, 10, 20]
+    ]
+
+    assert new_densities[0].index.tolist() == list(range(0, 10))
+    assert new_densities[1].empty
+    assert new_densities[2].index.tolist() == list(range(20, 30))
+    assert online_density.density.index.tolist() == [
+        *range(0, 10),
+        *range(20, 30),
+    ]
+
+
+def test_online_voronoi_density_rejects_old_frames():
+    trajectory_data = get_trajectory_data(
+        grid_shape=[2, 2],
+        number_frames=20,
+        movement_direction=np.array([0.2, 0]),
+        start_position=np.array([-2, -1]),
+        ped_distance=1.0,
+    )
+    online_density = OnlineVoronoiDensity(
+        walkable_area=WalkableArea([(-5, -5), (5, -5), (5, 5), (-5, 5)]),
+        measurement_area=MeasurementArea([(-1, -1), (1, -1), (1, 1), (-1, 1)]),
+        window_size=10,
+    )
+    online_density.update(traj_data=trajectory_data)
+
+    with pytest.raises(ValueError) as error_info:
+        online_density.update(traj_data=trajectory_data)
+    assert "The new frames need to be after the last frame added" in str(
+        error_info.value
+    )
+
+
+def test_online_voronoi_density_invalid_window_size():
+    with pytest.raises(ValueError) as error_info:
+        OnlineVoronoiDensity(
+            walkable_area=WalkableArea([(-5, -5), (5, -5), (5, 5), (-5, 5)]),
+            measurement_area=MeasurementArea(
+                [(-1, -1), (1, -1), (1, 1), (-1, 1)]
+            ),
+            window_size=0,
+        )
+    assert "The window size needs to be positive" in str(error_info.value)
+
+
+@pytest.mark.parametrize("missing_frames", [[], [3, 4, 5], list(range(10, 20))])
+def test_compute_passing_density(missing_frames):
+    rng = np.random.default_rng(42)
+    all_frames = np.arange(0, 30)
+    density_per_frame = pd.DataFrame(
+        {
+            FRAME_COL: all_frames,
+            DENSITY_COL: rng.uniform(0, 4, size=len(all_frames)),
+        }
+    ).set_index(FRAME_COL)
+    density_per_frame = density_per_frame.drop(index=missing_frames)
+
+    frames = pd.DataFrame(
+        {
+            ID_COL: [1, 2, 3, 4, 5, 6, 7],
+            FIRST_FRAME_COL: [0, 2, 3, 8, 12, 25, 40],
+            LAST_FRAME_COL: [30, 6, 6, 22, 18, 35, 50],
+        },
+        index=[4, 8, 15, 16, 23, 42, 50],
+    )
+
+    expected_densities = []
+    for entering_frame, leaving_frame in zip(
+        frames[FIRST_FRAME_COL], frames[LAST_FRAME_COL]
+    ):
+        in_interval = (density_per_frame.index >= entering_frame) & (
+            density_per_frame.index < leaving_frame
+        )
+        expected_densities.append(
+            density_per_frame[DENSITY_COL][in_interval].mean()
+        )
+
+    result = compute_passing_density(
+        density_per_frame=density_per_frame, frames=frames
+    )
+
+    assert list(result.columns) == [ID_COL, DENSITY_COL]
+    assert result.index.equals(frames.index)
+    assert result[ID_COL].equals(frames[ID_COL])
+    assert np.allclose(
+        result[DENSITY_COL], expected_densities, equal_nan=True, rtol=1e-12
+    )
+
+
+MEASUREMENT_AREAS = [
+    MeasurementArea([(-2, -1), (2, -1), (2, 1), (-2, 1)]),
+    MeasurementArea([(0, -3), (3, -3), (3, 3), (0, 3)]),
+    MeasurementArea([(-6, -4), (-1, 0), (-6, 4)]),
+    MeasurementArea([(20, 20), (21, 20), (21, 21), (20, 21)]),
+]
+
+
+def test_compute_classic_density_multi_equals_single_areas():
+    trajectory_data = get_trajectory_data(
+        grid_shape=[4, 5],
+        number_frames=60,
+        movement_direction=np.array([0.2, 0]),
+        start_position=np.array([-8, -2]),
+        ped_distance=1.0,
+    )
+
+    density = compute_classic_density_multi(
+        traj_data=trajectory_data, measurement_areas=MEASUREMENT_AREAS
+    )
+
+    assert density.index.names == [AREA_COL, FRAME_COL]
+    for area, measurement_area in enumerate(MEASUREMENT_AREAS):
+        pd.testing.assert_frame_equal(
+            density.loc[area],
+            compute_classic_density(
+                traj_data=trajectory_data, measurement_area=measurement_area
+            ),
+        )
+
+
+def test_compute_voronoi_density_multi_equals_single_areas():
+    trajectory_data = get_trajectory_data(
+        grid_shape=[4, 5],
+        number_frames=30,
+        movement_direction=np.array([0.2, 0]),
+        start_position=np.array([-8, -2]),
+        ped_distance=1.0,
+    )
+    individual_voronoi_data = compute_individual_voronoi_polygons(
+        traj_data=trajectory_data,
+        walkable_area=WalkableArea([(-10, -5), (10, -5), (10, 5), (-10, 5)]),
+    )
+
+    density, intersecting = compute_voronoi_density_multi(
+        individual_voronoi_data=individual_voronoi_data,
+        measurement_areas=MEASUREMENT_AREAS,
+    )
+
+    assert density.index.names == [AREA_COL, FRAME_COL]
+    assert intersecting.columns.tolist() == [
+        AREA_COL,
+        ID_COL,
+        FRAME_COL,
+        POLYGON_COL,
+        INTERSECTION_COL,
+    ]
+    for area, measurement_area in enumerate(MEASUREMENT_AREAS):
+        expected_density, expected_intersecting = compute_voronoi_density(
+            individual_voronoi_data=individual_voronoi_data,
+            measurement_area=measurement_area,
+        )
+        pd.testing.assert_frame_equal(
+            density.loc[area], expected_density, rtol=1e-12
+        )
+
+        expected_intersecting = expected_intersecting[
+            ~shapely.is_empty(expected_intersecting[INTERSECTION_COL])
+        ].sort_values(by=[ID_COL, FRAME_COL])
+        area_intersecting = intersecting[
+            intersecting[AREA_COL] == area
+        ].sort_values(by=[ID_COL, FRAME_COL])
+        assert (
+            area_intersecting[[ID_COL, FRAME_COL]].values
+            == expected_intersecting[[ID_COL, FRAME_COL]].values
+        ).all()
+        assert shapely.equals(
+            area_intersecting[INTERSECTION_COL].values,
+            expected_intersecting[INTERSECTION_COL].values,
+        ).all()
+
+
+def test_compute_density_multi_without_areas():
+    trajectory_data = get_trajectory_data(
+        grid_shape=[2, 2],
+        number_frames=10,
+        movement_direction=np.array([0.2, 0]),
+        start_position=np.array([-1, 0]),
+        ped_distance=1.0,
+    )
+
+    with pytest.raises(ValueError, match="measurement area"):
+        compute_classic_density_multi(
+            traj_data=trajectory_data, measurement_areas=[]
+        )
+    with pytest.raises(ValueError, match="measurement area"):
+        compute_voronoi_density_multi(
+            individual_voronoi_data=pd.DataFrame(
+                columns=[ID_COL, FRAME_COL, POLYGON_COL]
+            ),
+            measurement_areas=[],
+        )
@@ -0,0 +1,380 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pedpy.column_identifier import *
+from pedpy.data.geometry import MeasurementLine
+from pedpy.data.trajectory_data import TrajectoryData
+from pedpy.methods.flow_calculator import (
+    _compute_cumulative_count,
+    compute_flow,
+    compute_n_t,
+    compute_n_t_chunked,
+    compute_n_t_multi,
+)
+from tests.utils.utils import get_trajectory_chunks, get_trajectory_data
+
+
+@pytest.mark.parametrize(
+    "frames_per_chunk, overlap_frames",
+    [(1, 1), (7, 1), (10, 3), (49, 1), (100, 1)],
+)
+@pytest.mark.parametrize(
+    "measurement_line",
+    [
+        MeasurementLine([(0, -10), (0, 10)]),
+        MeasurementLine([(2, -10), (2, 10)]),
+        MeasurementLine([(-3, -1), (3, 3)]),
+        MeasurementLine([(20, -10), (20, 10)]),
+    ],
+)
+def test_compute_n_t_chunked_equals_batch(
+    frames_per_chunk, overlap_frames, measurement_line
+):
+    trajectory_data = get_trajectory_data(
+        grid_shape=[4, 5],
+        number_frames=80,
+        movement_direction=np.array([0.3, 0.05]),
+        start_position=np.array([-10, 0]),
+        ped_distance=0.8,
+    )
+
+    expected_n_t, expected_crossing_frames = compute_n_t(
+        traj_data=trajectory_data, measurement_line=measurement_line
+    )
+
+    results = list(
+        compute_n_t_chunked(
+            traj_chunks=get_trajectory_chunks(
+                traj_data=trajectory_data,
+                frames_per_chunk=frames_per_chunk,
+                overlap_frames=overlap_frames,
+            ),
+            measurement_line=measurement_line,
+        )
+    )
+    computed_n_t = pd.concat([n_t for n_t, _ in results])
+    computed_crossing_frames = pd.concat(
+        [crossing_frames for _, crossing_frames in results]
+    )
+
+    pd.testing.assert_frame_equal(computed_n_t, expected_n_t)
+    pd.testing.assert_frame_equal(
+        computed_crossing_frames, expected_crossing_frames
+    )
+
+
+def test_compute_n_t_chunked_equals_batch_positions_on_line():
+    # random walk on a grid, such that many positions are on the line
+    rng = np.random.default_rng(4)
+    steps = rng.choice([-0.5, 0.0, 0.5], size=(30, 60, 2))
+    positions = rng.integers(-4, 5, size=(30, 1, 2)) * 0.5 + np.cumsum(
+        steps, axis=1
+    )
+    trajectory_data = TrajectoryData(
+        data=pd.DataFrame(
+            {
+                ID_COL: np.repeat(np.arange(30), 60),
+                FRAME_COL: np.tile(np.arange(60), 30),
+                X_COL: positions[:, :, 0].ravel(),
+                Y_COL: positions[:, :, 1].ravel(),
+            }
+        ),
+        frame_rate=10,
+    )
+    measurement_line = MeasurementLine([(0, -20), (0, 20)])
+
+    expected_n_t, expected_crossing_frames = compute_n_t(
+        traj_data=trajectory_data, measurement_line=measurement_line
+    )
+
+    results = list(
+        compute_n_t_chunked(
+            traj_chunks=get_trajectory_chunks(
+                traj_data=trajectory_data, frames_per_chunk=5, overlap_frames=1
+            ),
+            measurement_line=measurement_line,
+        )
+    )
+
+    pd.testing.assert_frame_equal(
+        pd.concat([n_t for n_t, _ in results]), expected_n_t
+    )
+    pd.testing.assert_frame_equal(
+        pd.concat([crossing_frames for _, crossing_frames in results]),
+        expected_crossing_frames,
+    )
+
+
+def _compute_flow_reference(
+    *, nt, crossing_frames, individual_speed, delta_frame, frame_rate
+):
+    crossing_speeds = pd.merge(
+        crossing_frames, individual_speed, on=[ID_COL, FRAME_COL]
+    )
+    num_passed_before = 0
+    passed_frame_before = nt[nt[CUMULATED_COL] > 0].index.min()
+
+    rows = []
+    for frame in range(
+        passed_frame_before + delta_frame, nt.index.max(), delta_frame
+    ):
+        passed_num_peds = nt.loc[frame][CUMULATED_COL]
+        passed_frame = nt[nt[CUMULATED_COL] == passed_num_peds].index.min() + 1
+
+        if passed_num_peds != num_passed_before:
+            num_passing_peds = passed_num_peds - num_passed_before
+            time_range = passed_frame - passed_frame_before
+            flow_rate = num_passing_peds / time_range * frame_rate
+            velocity = crossing_speeds[
+                crossing_speeds.frame.between(
+                    passed_frame_before, passed_frame, inclusive="both"
+                )
+            ][SPEED_COL].mean()
+
+            num_passed_before = passed_num_peds
+            passed_frame_before = passed_frame
+            rows.append({FLOW_COL: flow_rate, MEAN_SPEED_COL: velocity})
+
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("delta_frame", [1, 3, 10, 25, 80])
+@pytest.mark.parametrize("num_peds", [1, 20, 200])
+def test_compute_flow_equals_reference(delta_frame, num_peds):
+    rng = np.random.default_rng(num_peds)
+    crossing_frames = pd.DataFrame(
+        {
+            ID_COL: np.arange(num_peds),
+            FRAME_COL: rng.integers(20, 400, size=num_peds),
+        }
+    ).sort_values(by=FRAME_COL, kind="stable", ignore_index=True)
+    individual_speed = crossing_frames.copy()
+    individual_speed[SPEED_COL] = rng.uniform(0.2, 1.6, size=num_peds)
+    individual_speed.loc[::7, SPEED_COL] = np.nan
+    nt = _compute_cumulative_count(
+        crossing_frames=crossing_frames,
+        frames=range(0, 500),
+        frame_rate=25,
+        initial_count=0,
+    )
+
+    expected_flow = _compute_flow_reference(
+        nt=nt,
+        crossing_frames=crossing_frames,
+        individual_speed=individual_speed,
+        delta_frame=delta_frame,
+        frame_rate=25,
+    )
+    flow = compute_flow(
+        nt=nt,
+        crossing_frames=crossing_frames,
+        individual_speed=individual_speed,
+        delta_frame=delta_frame,
+        frame_rate=25,
+    )
+
+    assert list(flow.columns) == [FLOW_COL, MEAN_SPEED_COL]
+    assert len(flow) == len(expected_flow)
+    assert np.array_equal(flow[FLOW_COL], expected_flow[FLOW_COL])
+    assert np.allclose(
+        flow[MEAN_SPEED_COL],
+        expected_flow[MEAN_SPEED_COL],
+        rtol=1e-12,
+        equal_nan=True,
+    )
+
+
+def test_compute_flow_without_crossings():
+    crossing_frames = pd.DataFrame(
+        {ID_COL: pd.Series(dtype=int), FRAME_COL: pd.Series(dtype=int)}
+    )
+    nt = _compute_cumulative_count(
+        crossing_frames=crossing_frames,
+        frames=range(0, 100),
+        frame_rate=25,
+        initial_count=0,
+    )
+
+    flow = compute_flow(
+        nt=nt,
+        crossing_frames=crossing_frames,
+        individual_speed=pd.DataFrame(columns=[ID_COL, FRAME_COL, SPEED_COL]),
+        delta_frame=10,
+        frame_rate=25,
+    )
+
+    assert list(flow.columns) == [FLOW_COL, MEAN_SPEED_COL]
+    assert flow.empty
+
+
+def test_compute_n_t_multi_equals_single_lines():
+    trajectory_data = get_trajectory_data(
+        grid_shape=[4, 5],
+        number_frames=80,
+        movement_direction=np.array([0.3, 0.05]),
+        start_position=np.array([-10, 0]),
+        ped_distance=0.8,
+    )
+    measurement_lines = [
+        MeasurementLine([(0, -10), (0, 10)]),
+        MeasurementLine([(2, -10), (2, 10)]),
+        MeasurementLine([(-3, -1), (3, 3)]),
+        MeasurementLine([(20, -10), (20, 10)]),
+        MeasurementLine([(-5, 1.6), (5, 1.6)]),
+    ]
+
+    n_t, crossing_frames = compute_n_t_multi(
+        traj_data=trajectory_data, measurement_lines=measurement_lines
+    )
+
+    assert n_t.index.names == [LINE_COL, FRAME_COL]
+    assert list(crossing_frames.columns) == [LINE_COL, ID_COL, FRAME_COL]
+    for line, measurement_line in enumerate(measurement_lines):
+        expected_n_t, expected_crossing_frames = compute_n_t(
+            traj_data=trajectory_data, measurement_line=measurement_line
+        )
+        pd.testing.assert_frame_equal(n_t.loc[line], expected_n_t)
+        pd.testing.assert_frame_equal(
+            crossing_frames[crossing_frames[LINE_COL] == line][
+                [ID_COL, FRAME_COL]
+            ].reset_index(drop=True),
+            expected_crossing_frames,
+        )
+
+
+def test_compute_n_t_multi_without_lines():
+    trajectory_data = get_trajectory_data(
+        grid_shape=[2, 2],
+        number_frames=10,
+        movement_direction=np.array([0.3, 0.05]),
+        start_position=np.array([-1, 0]),
+        ped_distance=0.8,
+    )
+
+    with pytest.raises(ValueError, match="measurement line"):
+        compute_n_t_multi(traj_data=trajectory_data, measurement_lines=[])
+
+
+def test_compute_n_t_by_direction_equals_separate_directions():
+    measurement_line = MeasurementLine([(0, -10), (0, 10)])
+    # seen from the first to the second point of the line, left to right is
+    # the positive x-direction
+    left_to_right = get_trajectory_data(
+        grid_shape=[4, 5],
+        number_frames=80,
+        movement_direction=np.array([0.3, 0.05]),
+        start_position=np.array([-10, 0]),
+        ped_distance=0.8,
+    )
+    right_to_left = get_trajectory_data(
+        grid_shape=[3, 3],
+        number_frames=80,
+        movement_direction=np.array([-0.2, 0.0]),
+        start_position=np.array([5, -3]),
+        ped_distance=0.8,
+    )
+    data = right_to_left.data[[ID_COL, FRAME_COL, X_COL, Y_COL]].copy()
+    data[ID_COL] += left_to_right.data[ID_COL].max() + 1
+    trajectory_data = TrajectoryData(
+        data=pd.concat(
+            [left_to_right.data[[ID_COL, FRAME_COL, X_COL, Y_COL]], data]
+        ),
+        frame_rate=left_to_right.frame_rate,
+    )
+
+    n_t, crossing_frames = compute_n_t(
+        traj_data=trajectory_data,
+        measurement_line=measurement_line,
+        by_direction=True,
+    )
+
+    assert n_t.index.names == [DIRECTION_COL, FRAME_COL]
+    assert list(crossing_frames.columns) == [DIRECTION_COL, ID_COL, FRAME_COL]
+    individual_speed = pd.DataFrame(
+        {
+            ID_COL: trajectory_data.data[ID_COL],
+            FRAME_COL: trajectory_data.data[FRAME_COL],
+            SPEED_COL: trajectory_data.data[X_COL].abs() + 0.5,
+        }
+    )
+    flow = compute_flow(
+        nt=n_t,
+        crossing_frames=crossing_frames,
+        individual_speed=individual_speed,
+        delta_frame=10,
+        frame_rate=trajectory_data.frame_rate,
+    )
+    assert list(flow.columns) == [DIRECTION_COL, FLOW_COL, MEAN_SPEED_COL]
+
+    for direction, traj_data in [(1, left_to_right), (-1, right_to_left)]:
+        expected_n_t, expected_crossing_frames = compute_n_t(
+            traj_data=TrajectoryData(
+                data=trajectory_data.data[
+                    trajectory_data.data[ID_COL].isin(
+                        crossing_frames[ID_COL][
+                            crossing_frames[DIRECTION_COL] == direction
+                        ]
+                    )
+                ],
+                frame_rate=trajectory_data.frame_rate,
+            ),
+            measurement_line=measurement_line,
+        )
+        assert len(expected_crossing_frames) == len(
+            traj_data.data[ID_COL].unique()
+        )
+        pd.testing.assert_frame_equal(n_t.loc[direction], expected_n_t)
+        pd.testing.assert_frame_equal(
+            crossing_frames[crossing_frames[DIRECTION_COL] == direction][
+                [ID_COL, FRAME_COL]
+            ].reset_index(drop=True),
+            expected_crossing_frames,
+        )
+
+        expected_flow = compute_flow(
+            nt=expected_n_t,
+            crossing_frames=expected_crossing_frames,
+            individual_speed=individual_speed,
+            delta_frame=10,
+            frame_rate=trajectory_data.frame_rate,
+        )
+        pd.testing.assert_frame_equal(
+            flow[flow[DIRECTION_COL] == direction][
+                [FLOW_COL, MEAN_SPEED_COL]
+            ].reset_index(drop=True),
+            expected_flow,
+        )
+
+
+def test_compute_n_t_by_direction_ignores_touching_line():
+    measurement_line = MeasurementLine([(0, -10), (0, 10)])
+    # ped 0 crosses from left to right, ped 1 from right to left, ped 2
+    # steps on the line from the left and back, ped 3 from the right
+    positions = {
+        0: [-0.4, -0.2, 0.0, 0.2, 0.4],
+        1: [0.4, 0.2, 0.0, -0.2, -0.4],
+        2: [-0.4, -0.2, 0.0, -0.2, -0.4],
+        3: [0.4, 0.2, 0.0, 0.2, 0.4],
+    }
+    traj_data = TrajectoryData(
+        data=pd.DataFrame(
+            [
+                (ped_id, frame, x, float(ped_id))
+                for ped_id, ped_positions in positions.items()
+                for frame, x in enumerate(ped_positions)
+            ],
+            columns=[ID_COL, FRAME_COL, X_COL, Y_COL],
+        ),
+        frame_rate=1,
+    )
+
+    n_t, crossing_frames = compute_n_t(
+        traj_data=traj_data,
+        measurement_line=measurement_line,
+        by_direction=True,
+    )
+
+    assert crossing_frames.values.tolist() == [[-1, 1, 3], [1, 0, 3]]
+    assert n_t.loc[1][CUMULATED_COL].tolist() == [0, 0, 0, 1, 1]
+    assert n_t.loc[-1][CUMULATED_COL].tolist() == [0, 0, 0, 1, 1]
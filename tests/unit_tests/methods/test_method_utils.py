@@ -0,0 +1,960 @@
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+from scipy.spatial import Voronoi
+
+from pedpy.column_identifier import *
+from pedpy.data.geometry import MeasurementArea, MeasurementLine, WalkableArea
+from pedpy.data.trajectory_data import TrajectoryData
+from pedpy.methods.method_utils import (
+    Cutoff,
+    SpeedCalculation,
+    _clip_voronoi_polygons,
+    _clip_voronoi_polygons_vectorized,
+    _compute_individual_movement,
+    _compute_is_inside_area,
+    _compute_orientation,
+    _compute_points_in_areas,
+    _compute_segments_crossing_line,
+    _get_continuous_parts_in_area,
+    compute_crossing_frames,
+    compute_frame_range_in_area,
+    compute_individual_voronoi_polygons,
+    compute_neighbor_list,
+    compute_neighbors,
+)
+from tests.utils.utils import get_trajectory_data
+
+
+@pytest.mark.parametrize(
+    "cut_off, use_blind_points, n_workers",
+    [
+        (None, True, 2),
+        (Cutoff(radius=0.8, quad_segments=3), True, 3),
+        (Cutoff(radius=1.0, quad_segments=1), False, 2),
+    ],
+)
+def test_compute_individual_voronoi_polygons_parallel_equals_serial(
+    cut_off, use_blind_points, n_workers
+):
+    traj_data = get_trajectory_data(
+        grid_shape=[4, 5],
+        number_frames=40,
+        start_position=np.array([-5, -2]),
+        movement_direction=np.array([0.1, 0.02]),
+        ped_distance=0.7,
+    )
+    walkable_area = WalkableArea([(-10, -10), (10, -10), (10, 10), (-10, 10)])
+
+    serial = compute_individual_voronoi_polygons(
+        traj_data=traj_data,
+        walkable_area=walkable_area,
+        cut_off=cut_off,
+        use_blind_points=use_blind_points,
+    )
+    parallel = compute_individual_voronoi_polygons(
+        traj_data=traj_data,
+        walkable_area=walkable_area,
+        cut_off=cut_off,
+        use_blind_points=use_blind_points,
+        n_workers=n_workers,
+    )
+
+    assert serial.index.equals(parallel.index)
+    assert (serial[[ID_COL, FRAME_COL]] == parallel[[ID_COL, FRAME_COL]]).all(
+        axis=None
+    )
+    assert shapely.equals_exact(
+        serial[POLYGON_COL].values, parallel[POLYGON_COL].values, tolerance=0
+    ).all()
+    assert np.array_equal(serial[DENSITY_COL], parallel[DENSITY_COL])
+
+
+BLIND_POINTS = np.array(
+    [[-1000, -1000], [1000, -1000], [-1000, 1000], [1000, 1000]]
+)
+
+
+@pytest.mark.parametrize(
+    "points",
+    [
+        np.random.default_rng(0).uniform(-5, 5, (4, 2)),
+        np.random.default_rng(1).uniform(-5, 5, (100, 2)),
+        np.random.default_rng(2).uniform(-50, 50, (600, 2)),
+        np.concatenate(
+            [np.random.default_rng(3).uniform(-5, 5, (2, 2)), BLIND_POINTS]
+        ),
+        np.concatenate(
+            [np.random.default_rng(4).uniform(-5, 5, (50, 2)), BLIND_POINTS]
+        ),
+        np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0]]),
+        np.stack(
+            np.meshgrid(np.arange(6) * 0.7, np.arange(5) * 0.7), axis=-1
+        ).reshape(-1, 2),
+    ],
+)
+def test_clip_voronoi_polygons_vectorized_equals_reference(points):
+    voronoi = Voronoi(points)
+
+    expected = np.array(_clip_voronoi_polygons(voronoi, 20.0))
+    computed = _clip_voronoi_polygons_vectorized(voronoi, 20.0)
+
+    assert len(computed) == len(points)
+    assert shapely.equals_exact(expected, computed, tolerance=1e-12).all()
+
+
+@pytest.mark.parametrize(
+    "cut_off, shuffle",
+    [
+        (None, False),
+        (None, True),
+        (Cutoff(radius=0.6, quad_segments=3), False),
+        (Cutoff(radius=0.6, quad_segments=3), True),
+    ],
+)
+def test_compute_neighbors_equals_pairwise_comparison(cut_off, shuffle):
+    traj_data = get_trajectory_data(
+        grid_shape=[6, 5],
+        number_frames=10,
+        start_position=np.array([-5, -2]),
+        movement_direction=np.array([0.1, 0.02]),
+        ped_distance=1.0,
+    )
+    walkable_area = WalkableArea([(-10, -10), (10, -10), (10, 10), (-10, 10)])
+    individual_voronoi = compute_individual_voronoi_polygons(
+        traj_data=traj_data, walkable_area=walkable_area, cut_off=cut_off
+    )
+    if shuffle:
+        individual_voronoi = individual_voronoi.sample(frac=1, random_state=3)
+
+    neighbors = compute_neighbors(individual_voronoi)
+
+    assert len(neighbors.index) == len(individual_voronoi.index)
+    assert neighbors[FRAME_COL].is_monotonic_increasing
+    for frame, frame_data in individual_voronoi.groupby(FRAME_COL):
+        polygons = frame_data[POLYGON_COL].values
+        touching = shapely.dwithin(
+            polygons[:, np.newaxis], polygons[np.newaxis, :], 1e-9
+        )
+        np.fill_diagonal(touching, False)
+        expected_neighbors = [
+            frame_data[ID_COL].values[row].tolist() for row in touching
+        ]
+
+        frame_neighbors = neighbors[neighbors[FRAME_COL] == frame]
+        assert frame_neighbors[ID_COL].tolist() == frame_data[ID_COL].tolist()
+        assert frame_neighbors[NEIGHBORS_COL].tolist() == expected_neighbors
+        assert frame_neighbors.index.tolist() == list(range(len(frame_data)))
+
+
+def test_neighbor_list():
+    traj_data = get_trajectory_data(
+        grid_shape=[6, 5],
+        number_frames=10,
+        start_position=np.array([-5, -2]),
+        movement_direction=np.array([0.1, 0.02]),
+        ped_distance=1.0,
+    )
+    walkable_area = WalkableArea([(-10, -10), (10, -10), (10, 10), (-10, 10)])
+    individual_voronoi = compute_individual_voronoi_polygons(
+        traj_data=traj_data,
+        walkable_area=walkable_area,
+        cut_off=Cutoff(radius=0.6, quad_segments=3),
+    ).sample(frac=1, random_state=5)
+
+    neighbors = compute_neighbors(individual_voronoi)
+    neighbor_list = compute_neighbor_list(individual_voronoi)
+
+    assert neighbor_list.neighbor_ids.dtype == np.int32
+    pd.testing.assert_frame_equal(neighbor_list.to_dataframe(), neighbors)
+
+    rows = neighbor_list.find_rows(
+        ped_ids=neighbors[ID_COL].values, frames=neighbors[FRAME_COL].values
+    )
+    assert (rows == np.arange(len(neighbors.index))).all()
+    assert (
+        neighbor_list.find_rows(
+            ped_ids=[-1, neighbors[ID_COL].max() + 1, neighbors[ID_COL].min()],
+            frames=[0, 0, neighbors[FRAME_COL].max() + 1],
+        )
+        == -1
+    ).all()
+
+    for _, row in neighbors.iterrows():
+        assert (
+            neighbor_list.get_neighbors(
+                ped_id=row[ID_COL], frame=row[FRAME_COL]
+            )
+            == row[NEIGHBORS_COL]
+        ).all()
+    with pytest.raises(KeyError):
+        neighbor_list.get_neighbors(ped_id=-1, frame=0)
+
+    # IDs outside the range of 32 bit integers
+    large_id_voronoi = individual_voronoi.copy()
+    large_id_voronoi[ID_COL] += 2**40
+    large_id_neighbors = compute_neighbors(large_id_voronoi)
+    large_id_neighbor_list = compute_neighbor_list(large_id_voronoi)
+    assert large_id_neighbor_list.neighbor_ids.dtype == np.int64
+    assert (large_id_neighbors[ID_COL] == neighbors[ID_COL] + 2**40).all()
+    assert (
+        (large_id_neighbors[NEIGHBORS_COL].map(np.array) - 2**40)
+        .map(list)
+        .equals(neighbors[NEIGHBORS_COL])
+    )
+    assert (
+        large_id_neighbor_list.find_rows(
+            ped_ids=large_id_neighbors[ID_COL].values,
+            frames=large_id_neighbors[FRAME_COL].values,
+        )
+        == np.arange(len(neighbors.index))
+    ).all()
+    assert large_id_neighbor_list.find_rows(ped_ids=[0], frames=[0])[0] == -1
+
+    num_neighbors = neighbors[NEIGHBORS_COL].map(len)
+    statistics = neighbor_list.compute_num_neighbors_statistics()
+    grouped = num_neighbors.groupby(neighbors[FRAME_COL])
+    assert (neighbor_list.num_neighbors == num_neighbors.values).all()
+    assert (statistics[COUNT_COL] == grouped.size()).all()
+    assert np.allclose(statistics[MEAN_NEIGHBORS_COL], grouped.mean())
+    assert (statistics[MIN_NEIGHBORS_COL] == grouped.min()).all()
+    assert (statistics[MAX_NEIGHBORS_COL] == grouped.max()).all()
+
+
+@pytest.mark.parametrize(
+    "line_start, line_end",
+    [
+        ((0, 0), (1, 0)),
+        ((-2, -1), (2, 3)),
+        ((0.1, 0.3), (0.7, 1.9)),
+        ((1.5, -3.0), (1.5, 2.0)),
+    ],
+)
+def test_compute_segments_crossing_line_unless_ending_on_line(
+    line_start, line_end
+):
+    rng = np.random.default_rng(0)
+    measurement_line = MeasurementLine([line_start, line_end])
+    line_start = np.array(line_start, dtype=float)
+    line_end = np.array(line_end, dtype=float)
+
+    num_segments = 5000
+    on_line = line_start + rng.uniform(-0.5, 1.5, (num_segments, 1)) * (
+        line_end - line_start
+    )
+    start = np.where(
+        rng.uniform(size=(num_segments, 1)) < 0.3,
+        on_line,
+        rng.uniform(-4, 4, (num_segments, 2)),
+    )
+    end = start + rng.normal(0, 1, (num_segments, 2))
+
+    # segments on a coarse grid, with zero length, and touching the line with
+    # one of their end points
+    start[:500] = np.round(start[:500] * 2) / 2
+    end[:500] = np.round(end[:500] * 2) / 2
+    end[500:600] = start[500:600]
+    start[600:650] = line_start
+    end[650:700] = line_end
+    end[700:800] = on_line[700:800]
+
+    # crossing means intersecting the line, without ending on it
+    ends_on_line = shapely.intersects(
+        shapely.points(end), measurement_line.line
+    )
+    expected = (
+        shapely.intersects(
+            shapely.linestrings(np.stack([start, end], axis=1)),
+            measurement_line.line,
+        )
+        & ~ends_on_line
+    )
+    assert (
+        expected[:800]
+        != shapely.intersects(
+            shapely.linestrings(np.stack([start[:800], end[:800]], axis=1)),
+            measurement_line.line,
+        )
+    ).any()
+    result, direction = _compute_segments_crossing_line(
+        start_x=start[:, 0],
+        start_y=start[:, 1],
+        end_x=end[:, 0],
+        end_y=end[:, 1],
+        measurement_line=measurement_line,
+    )
+
+    assert np.array_equal(result, expected)
+
+    # direction is the side of the line the segment starts on (or, if it
+    # starts on the line, the opposite of the side it ends on)
+    line_direction = line_end - line_start
+    start_side = np.sign(np.cross(line_direction, start - line_start))
+    end_side = np.sign(np.cross(line_direction, end - line_start))
+    expected_direction = np.where(start_side != 0, start_side, -end_side)
+    clear = expected & (start_side != end_side) & (np.abs(start_side) > 0)
+    assert np.array_equal(direction[clear], expected_direction[clear])
+    assert (direction[~result] == 0).all()
+
+    # segments along the line have no direction
+    along_line = np.all(
+        [
+            _compute_orientation(
+                a_x=line_start[0],
+                a_y=line_start[1],
+                b_x=line_end[0],
+                b_y=line_end[1],
+                c_x=points[:, 0],
+                c_y=points[:, 1],
+            )
+            == 0
+            for points in (start, end)
+        ],
+        axis=0,
+    )
+    assert (direction[result & along_line] == 0).all()
+    assert (direction[result & ~along_line] != 0).all()
+
+
+def test_compute_segments_crossing_line_touching_line():
+    measurement_line = MeasurementLine([(0, -1), (0, 1)])
+    start = np.array(
+        [
+            [-1, 0],
+            [0, 0],
+            [-1, 0],
+            [0, -0.5],
+            [0, 0],
+            [-1, 0],
+            [0, 0.5],
+            [0, 1],
+            [0, 0.5],
+            [0, 2],
+        ]
+    )
+    end = np.array(
+        [
+            [1, 0],
+            [1, 0],
+            [0, 0],
+            [0, 0.5],
+            [0, 0],
+            [-0.5, 0.5],
+            [1, 3],
+            [0, 1.5],
+            [0, 2],
+            [0, 1],
+        ]
+    )
+
+    result, direction = _compute_segments_crossing_line(
+        start_x=start[:, 0],
+        start_y=start[:, 1],
+        end_x=end[:, 0],
+        end_y=end[:, 1],
+        measurement_line=measurement_line,
+    )
+
+    # crossing, starting on the line, ending on the line, along the line,
+    # zero length on the line, not touching, starting on the line, along the
+    # line leaving it over its end point, and along the line onto it
+    assert result.tolist() == [
+        True,
+        True,
+        False,
+        False,
+        False,
+        False,
+        True,
+        True,
+        True,
+        False,
+    ]
+    assert direction.tolist() == [1, 1, 0, 0, 0, 0, 1, 0, 0, 0]
+
+
+def test_compute_orientation_exact():
+    # nearly collinear points, where the floating point determinant is not
+    # reliable
+    orientation = _compute_orientation(
+        a_x=0.5,
+        a_y=0.5,
+        b_x=12.0,
+        b_y=12.0,
+        c_x=np.array([24.0, 24.00000000000001, 0.1 + 0.2, 0.3]),
+        c_y=np.array([24.0, 24.0, 0.3, 0.1 + 0.2]),
+    )
+
+    assert orientation.tolist() == [0, -1, -1, 1]
+
+
+@pytest.mark.parametrize("drop_fraction", [0.0, 0.1])
+def test_compute_crossing_frames_equals_linestring_crossing(drop_fraction):
+    traj_data = get_trajectory_data(
+        grid_shape=[5, 5],
+        number_frames=60,
+        start_position=np.array([-4, -2]),
+        movement_direction=np.array([0.2, 0.04]),
+        ped_distance=0.5,
+    )
+    data = traj_data.data[[ID_COL, FRAME_COL, X_COL, Y_COL]]
+    rng = np.random.default_rng(1)
+    data = data[rng.uniform(size=len(data)) >= drop_fraction].sample(
+        frac=1, random_state=2
+    )
+    traj_data = TrajectoryData(data=data, frame_rate=traj_data.frame_rate)
+
+    movement = _compute_individual_movement(
+        traj_data=traj_data, frame_step=1, bidirectional=False
+    )
+    movement_lines = shapely.linestrings(
+        np.stack(
+            [
+                movement[[START_X_COL, START_Y_COL]].values,
+                movement[[END_X_COL, END_Y_COL]].values,
+            ],
+            axis=1,
+        )
+    )
+
+    for measurement_line in [
+        MeasurementLine([(0, -10), (0, 10)]),
+        MeasurementLine([(-1, -1), (3, 2)]),
+        MeasurementLine([(-4, -2), (4, -2)]),
+    ]:
+        expected = movement.loc[
+            shapely.intersects(movement_lines, measurement_line.line)
+            & ~shapely.intersects(
+                shapely.points(movement[[END_X_COL, END_Y_COL]].values),
+                measurement_line.line,
+            ),
+            [ID_COL, FRAME_COL],
+        ].reset_index(drop=True)
+
+        result = compute_crossing_frames(
+            traj_data=traj_data, measurement_line=measurement_line
+        )
+
+        pd.testing.assert_frame_equal(result[[ID_COL, FRAME_COL]], expected)
+
+
+def test_compute_crossing_frames_direction():
+    measurement_line = MeasurementLine([(0, -1), (0, 1)])
+    data = pd.DataFrame(
+        {
+            ID_COL: [0] * 4 + [1] * 4 + [2] * 3 + [3] * 4,
+            FRAME_COL: [0, 1, 2, 3] * 2 + [0, 1, 2] + [0, 1, 2, 3],
+            X_COL: [-0.3, -0.1, 0.1, 0.3]
+            + [0.3, 0.1, -0.1, -0.3]
+            + [0.0, 0.0, 0.0]
+            + [-0.2, 0.0, 0.2, 0.4],
+            Y_COL: [0.0] * 8 + [-0.5, 0.0, 0.5] + [0.0] * 4,
+        }
+    )
+    traj_data = TrajectoryData(data=data, frame_rate=1)
+
+    crossing_frames = compute_crossing_frames(
+        traj_data=traj_data, measurement_line=measurement_line
+    )
+
+    # ped 0 crosses from left to right, ped 1 from right to left, ped 2
+    # walks along the line, which is no crossing, and ped 3 steps on the
+    # line, which only counts when leaving it
+    assert crossing_frames.values.tolist() == [
+        [0, 2, 1],
+        [1, 2, -1],
+        [3, 2, 1],
+    ]
+
+
+def test_compute_crossing_frames_touching_line():
+    measurement_line = MeasurementLine([(0, -1), (0, 1)])
+    positions = {
+        # steps on the line and back
+        0: [-0.2, 0.0, -0.2, -0.4],
+        # stays on the line and goes back
+        1: [0.2, 0.0, 0.0, 0.0, 0.2],
+        # stays on the line and continues
+        2: [-0.2, 0.0, 0.0, 0.2, 0.4],
+        # starts on the line
+        3: [0.0, 0.0, -0.2, -0.4],
+        # steps on the line, back, and then crosses it
+        4: [-0.2, 0.0, -0.2, 0.0, 0.2, 0.4],
+    }
+    data = pd.DataFrame(
+        [
+            (ped_id, frame, x, 0.0)
+            for ped_id, ped_positions in positions.items()
+            for frame, x in enumerate(ped_positions)
+        ],
+        columns=[ID_COL, FRAME_COL, X_COL, Y_COL],
+    ).sample(frac=1, random_state=3)
+    traj_data = TrajectoryData(data=data, frame_rate=1)
+
+    crossing_frames = compute_crossing_frames(
+        traj_data=traj_data, measurement_line=measurement_line
+    )
+    assert sorted(crossing_frames.values.tolist()) == [
+        [0, 2, -1],
+        [2, 3, 1],
+        [3, 2, -1],
+        [4, 2, -1],
+        [4, 4, 1],
+    ]
+
+    crossing_frames = compute_crossing_frames(
+        traj_data=traj_data,
+        measurement_line=measurement_line,
+        ignore_touching=True,
+    )
+    assert sorted(crossing_frames.values.tolist()) == [
+        [2, 3, 1],
+        [3, 2, -1],
+        [4, 4, 1],
+    ]
+
+
+def _compute_individual_movement_reference(
+    *, data, frame_step, bidirectional, speed_border_method
+):
+    rows = []
+    for ped_id, ped_data in data.groupby(ID_COL):
+        ped_data = ped_data.sort_values(by=FRAME_COL)
+        frames = ped_data[FRAME_COL].tolist()
+        positions = ped_data[[X_COL, Y_COL]].values
+        position_of_frame = {frame: i for i, frame in enumerate(frames)}
+        for i, (index, frame) in enumerate(zip(ped_data.index, frames)):
+            if speed_border_method == SpeedCalculation.BORDER_ADAPTIVE:
+                window = min(frame_step, frame - frames[0], frames[-1] - frame)
+                start = position_of_frame.get(frame - window)
+                end = (
+                    position_of_frame.get(frame + window)
+                    if bidirectional
+                    else i
+                )
+                if window == 0 or start is None or end is None:
+                    continue
+            else:
+                start = i - frame_step
+                end = i + frame_step if bidirectional else i
+                is_inside = 0 <= start and end < len(frames)
+                if speed_border_method == SpeedCalculation.BORDER_EXCLUDE:
+                    if not is_inside:
+                        continue
+                else:
+                    start = start if start >= 0 else i
+                    end = end if end < len(frames) else i
+            rows.append(
+                (
+                    index,
+                    ped_id,
+                    frame,
+                    *positions[start],
+                    *positions[end],
+                    frames[end] - frames[start],
+                )
+            )
+    movement = pd.DataFrame(
+        rows,
+        columns=[
+            "index",
+            ID_COL,
+            FRAME_COL,
+            START_X_COL,
+            START_Y_COL,
+            END_X_COL,
+            END_Y_COL,
+            WINDOW_SIZE_COL,
+        ],
+    ).set_index("index")
+    return movement.loc[
+        [index for index in data.index if index in movement.index]
+    ]
+
+
+@pytest.mark.parametrize("speed_border_method", list(SpeedCalculation))
+@pytest.mark.parametrize("frame_step", [1, 3])
+@pytest.mark.parametrize("bidirectional", [True, False])
+def test_compute_individual_movement_equals_reference(
+    speed_border_method, frame_step, bidirectional
+):
+    traj_data = get_trajectory_data(
+        grid_shape=[3, 3],
+        number_frames=20,
+        start_position=np.array([-4, -2]),
+        movement_direction=np.array([0.2, 0.04]),
+        ped_distance=0.5,
+    )
+    data = traj_data.data[[ID_COL, FRAME_COL, X_COL, Y_COL]]
+    rng = np.random.default_rng(3)
+    data = data[rng.uniform(size=len(data)) >= 0.1].sample(
+        frac=1, random_state=4
+    )
+
+    movement = _compute_individual_movement(
+        traj_data=TrajectoryData(data=data, frame_rate=traj_data.frame_rate),
+        frame_step=frame_step,
+        bidirectional=bidirectional,
+        speed_border_method=speed_border_method,
+    )
+    expected = _compute_individual_movement_reference(
+        data=data,
+        frame_step=frame_step,
+        bidirectional=bidirectional,
+        speed_border_method=speed_border_method,
+    )
+
+    pd.testing.assert_frame_equal(
+        movement, expected, check_dtype=False, check_names=False
+    )
+
+
+def _get_continuous_parts_in_area_reference(*, traj_data, measurement_area):
+    inside = traj_data.data.loc[
+        shapely.contains_xy(
+            measurement_area.polygon, traj_data.data.x, traj_data.data.y
+        ),
+        :,
+    ].copy()
+    inside.loc[:, "g"] = inside.groupby(
+        by=ID_COL, group_keys=False
+    ).frame.apply(lambda x: x.diff().ge(2).cumsum())
+    inside_range = (
+        inside.groupby([ID_COL, "g"])
+        .agg(
+            entering_frame=(FRAME_COL, "first"),
+            leaving_frame=(FRAME_COL, "last"),
+        )
+        .reset_index()[[ID_COL, FIRST_FRAME_COL, LAST_FRAME_COL]]
+    )
+    inside_range[LAST_FRAME_COL] += 1
+
+    return inside_range
+
+
+@pytest.mark.parametrize("drop_fraction", [0.0, 0.2])
+def test_get_continuous_parts_in_area_equals_reference(drop_fraction):
+    traj_data = get_trajectory_data(
+        grid_shape=[5, 5],
+        number_frames=60,
+        start_position=np.array([-4, -2]),
+        movement_direction=np.array([0.2, 0.04]),
+        ped_distance=0.5,
+    )
+    data = traj_data.data[[ID_COL, FRAME_COL, X_COL, Y_COL]]
+    rng = np.random.default_rng(5)
+    traj_data = TrajectoryData(
+        data=data[rng.uniform(size=len(data)) >= drop_fraction],
+        frame_rate=traj_data.frame_rate,
+    )
+    measurement_area = MeasurementArea([(-1, -3), (1, -3), (1, 3), (-1, 3)])
+
+    inside_range = _get_continuous_parts_in_area(
+        traj_data=traj_data, measurement_area=measurement_area
+    )
+    expected = _get_continuous_parts_in_area_reference(
+        traj_data=traj_data, measurement_area=measurement_area
+    )
+
+    if drop_fraction > 0:
+        # missing frames split the parts inside the area
+        assert len(inside_range) > inside_range[ID_COL].nunique()
+    pd.testing.assert_frame_equal(inside_range, expected)
+
+
+def test_get_continuous_parts_in_area_no_position_inside():
+    traj_data = get_trajectory_data(
+        grid_shape=[2, 2],
+        number_frames=10,
+        start_position=np.array([-4, -2]),
+        movement_direction=np.array([0.1, 0]),
+        ped_distance=0.5,
+    )
+    measurement_area = MeasurementArea([(-1, -3), (1, -3), (1, 3), (-1, 3)])
+
+    inside_range = _get_continuous_parts_in_area(
+        traj_data=traj_data, measurement_area=measurement_area
+    )
+
+    assert inside_range.empty
+    assert inside_range.columns.tolist() == [
+        ID_COL,
+        FIRST_FRAME_COL,
+        LAST_FRAME_COL,
+    ]
+
+
+def test_compute_frame_range_in_area():
+    x = np.linspace(-1.5, 1.5, 31)
+    # ped 0 passes from left to right, ped 1 from right to left, ped 2
+    # enters and leaves the area via the first line, and ped 3 passes the
+    # area twice
+    trajectories = [
+        (0, x, np.zeros_like(x)),
+        (1, x[::-1], np.ones_like(x)),
+        (2, np.concatenate((x[:15], x[:15][::-1])), np.zeros(30)),
+        (3, np.concatenate((x, x[::-1])), np.full(62, 2.0)),
+    ]
+    data = pd.DataFrame(
+        [
+            (ped_id, frame, x, y)
+            for ped_id, xs, ys in trajectories
+            for frame, (x, y) in enumerate(zip(xs, ys))
+        ],
+        columns=[ID_COL, FRAME_COL, X_COL, Y_COL],
+    )
+    traj_data = TrajectoryData(data=data, frame_rate=10)
+
+    frames_in_area, measurement_area = compute_frame_range_in_area(
+        traj_data=traj_data,
+        measurement_line=MeasurementLine([(-1.05, 5), (-1.05, -5)]),
+        width=2.1,
+    )
+
+    assert measurement_area.polygon.area == pytest.approx(10 * 2.1)
+    assert frames_in_area.values.tolist() == [
+        [0, 5, 26],
+        [1, 5, 26],
+        [3, 5, 26],
+        [3, 36, 57],
+    ]
+
+
+def test_compute_frame_range_in_area_positions_on_lines():
+    # ped 0 steps exactly onto both lines, ped 1 touches the first line,
+    # turns around at the second line and leaves via the first line again
+    trajectories = [
+        (0, np.round(-0.3 + 0.1 * np.arange(18), 1)),
+        (1, np.array([-0.2, 0, 0.5, 1.0, 0.5, 0, -0.2, -0.4])),
+    ]
+    data = pd.DataFrame(
+        [
+            (ped_id, frame, x, 0.0)
+            for ped_id, xs in trajectories
+            for frame, x in enumerate(xs)
+        ],
+        columns=[ID_COL, FRAME_COL, X_COL, Y_COL],
+    )
+    traj_data = TrajectoryData(data=data, frame_rate=10)
+
+    frames_in_area, _ = compute_frame_range_in_area(
+        traj_data=traj_data,
+        measurement_line=MeasurementLine([(0, 10), (0, -10)]),
+        width=1.0,
+    )
+
+    assert frames_in_area.values.tolist() == [[0, 4, 13], [1, 2, 3], [1, 4, 5]]
+
+
+def test_compute_frame_range_in_area_last_position_on_line():
+    # both peds enter over the first line, ped 0 ends on the second line, as
+    # the movement at the last frame is empty it does not touch the line
+    trajectories = [
+        (0, [0.5, 1.5, 2.0, 2.5]),
+        (1, [0.5, 1.5, 2.0, 2.5, 3.0]),
+    ]
+    data = pd.DataFrame(
+        [
+            (ped_id, frame, x, -1.5)
+            for ped_id, xs in trajectories
+            for frame, x in enumerate(xs)
+        ],
+        columns=[ID_COL, FRAME_COL, X_COL, Y_COL],
+    )
+    traj_data = TrajectoryData(data=data, frame_rate=10)
+
+    frames_in_area, _ = compute_frame_range_in_area(
+        traj_data=traj_data,
+        measurement_line=MeasurementLine([(1, -2), (1, 2.5)]),
+        width=-1.5,
+    )
+
+    assert frames_in_area.values.tolist() == [[1, 1, 3]]
+
+
+@pytest.mark.parametrize(
+    "coordinates",
+    [
+        [(0, 0), (0, 1), (1, 1), (1, 0)],
+        [(-2.5, 1.0), (3.0, 1.0), (3.0, 4.2), (-2.5, 4.2)],
+        [(0, 3.1), (1.2, 5.4), (4.1, 7.9), (7.1, 3.0)],
+        [(-0.1, -0.3), (0.7, 0.1), (0.3, 0.2)],
+        [(0, 0), (1, 0), (1, 1), (0.5, 1.5), (0, 1)],
+    ],
+)
+def test_compute_is_inside_area_equals_shapely(coordinates):
+    rng = np.random.default_rng(6)
+    measurement_area = MeasurementArea(coordinates)
+    coordinates = np.array(coordinates, dtype=float)
+    min_x, min_y, max_x, max_y = measurement_area.polygon.bounds
+
+    # random positions, vertices, and positions on and close to the edges
+    num_positions = 5000
+    positions = rng.uniform(
+        [min_x - 1, min_y - 1], [max_x + 1, max_y + 1], (num_positions, 2)
+    )
+    edge_start = coordinates[np.arange(len(positions)) % len(coordinates)]
+    edge_end = np.roll(coordinates, -1, axis=0)[
+        np.arange(len(positions)) % len(coordinates)
+    ]
+    on_edge = edge_start + rng.uniform(size=(num_positions, 1)) * (
+        edge_end - edge_start
+    )
+    positions[:1000] = on_edge[:1000]
+    positions[1000:2000] = np.nextafter(
+        on_edge[1000:2000], rng.choice([-np.inf, np.inf], (1000, 2))
+    )
+    positions[2000 : 2000 + len(coordinates)] = coordinates
+    positions[2100] = np.nan
+
+    is_inside = _compute_is_inside_area(
+        measurement_area=measurement_area,
+        x=positions[:, 0],
+        y=positions[:, 1],
+    )
+
+    assert np.array_equal(
+        is_inside,
+        shapely.contains_xy(
+            measurement_area.polygon, positions[:, 0], positions[:, 1]
+        ),
+    )
+
+
+def test_compute_points_in_areas_equals_shapely():
+    traj_data = get_trajectory_data(
+        grid_shape=[6, 6],
+        number_frames=40,
+        start_position=np.array([-3, -3]),
+        movement_direction=np.array([0.1, 0.05]),
+        ped_distance=0.5,
+    )
+    traj_data = TrajectoryData(
+        data=traj_data.data, frame_rate=traj_data.frame_rate, lazy_points=True
+    )
+    measurement_areas = [
+        MeasurementArea([(-1, -1), (1, -1), (1, 1), (-1, 1)]),
+        MeasurementArea([(0, -2), (2, 0), (0, 2), (-2, 0)]),
+        MeasurementArea([(0.5, 0.5), (4, 0.5), (4, 4)]),
+        MeasurementArea([(10, 10), (11, 10), (11, 11), (10, 11)]),
+        MeasurementArea([(-1, -1), (1, -1), (1, 1), (-1, 1)]),
+    ]
+
+    rows, areas = _compute_points_in_areas(
+        traj_data=traj_data, measurement_areas=measurement_areas
+    )
+
+    x = traj_data.data[X_COL].to_numpy()
+    y = traj_data.data[Y_COL].to_numpy()
+    expected_areas, expected_rows = np.nonzero(
+        np.stack(
+            [
+                shapely.contains_xy(measurement_area.polygon, x, y)
+                for measurement_area in measurement_areas
+            ]
+        )
+    )
+    assert np.array_equal(rows, expected_rows)
+    assert np.array_equal(areas, expected_areas)
+    # no points are created for the positions
+    assert traj_data._points is None
+
+
+def test_compute_points_in_areas_stacked_areas_equals_shapely():
+    # positions on a fine grid, such that many are on the boundaries of the
+    # areas and on the borders of the grid cells
+    rng = np.random.default_rng(8)
+    positions = np.round(rng.uniform(-1, 21, (20000, 2)) * 8) / 8
+    traj_data = TrajectoryData(
+        data=pd.DataFrame(
+            {
+                ID_COL: np.arange(len(positions)),
+                FRAME_COL: np.zeros(len(positions), dtype=int),
+                X_COL: positions[:, 0],
+                Y_COL: positions[:, 1],
+            }
+        ),
+        frame_rate=1,
+        lazy_points=True,
+    )
+    measurement_areas = [
+        *(
+            MeasurementArea([(0, i), (20, i), (20, i + 1), (0, i + 1)])
+            for i in range(0, 20, 2)
+        ),
+        MeasurementArea([(0, 0), (20, 20), (0, 20)]),
+        MeasurementArea([(3.1, 3.3), (3.2, 3.3), (3.2, 3.45), (3.1, 3.45)]),
+    ]
+
+    rows, areas = _compute_points_in_areas(
+        traj_data=traj_data, measurement_areas=measurement_areas
+    )
+
+    expected_areas, expected_rows = np.nonzero(
+        np.stack(
+            [
+                shapely.contains_xy(
+                    measurement_area.polygon, positions[:, 0], positions[:, 1]
+                )
+                for measurement_area in measurement_areas
+            ]
+        )
+    )
+    assert np.array_equal(rows, expected_rows)
+    assert np.array_equal(areas, expected_areas)
+
+
+def test_compute_voronoi_and_crossings_lazy_points():
+    traj_data = get_trajectory_data(
+        grid_shape=[5, 5],
+        number_frames=50,
+        start_position=np.array([-3, -2]),
+        movement_direction=np.array([0.1, 0.02]),
+        ped_distance=0.5,
+    )
+    lazy_traj_data = TrajectoryData(
+        data=traj_data.data,
+        frame_rate=traj_data.frame_rate,
+        lazy_points=True,
+    )
+    walkable_area = WalkableArea([(-10, -10), (10, -10), (10, 10), (-10, 10)])
+    measurement_line = MeasurementLine([(0, 10), (0, -10)])
+
+    individual_voronoi = compute_individual_voronoi_polygons(
+        traj_data=traj_data,
+        walkable_area=walkable_area,
+        cut_off=Cutoff(radius=0.8, quad_segments=3),
+    )
+    lazy_individual_voronoi = compute_individual_voronoi_polygons(
+        traj_data=lazy_traj_data,
+        walkable_area=walkable_area,
+        cut_off=Cutoff(radius=0.8, quad_segments=3),
+    )
+    pd.testing.assert_frame_equal(
+        lazy_individual_voronoi[[ID_COL, FRAME_COL, DENSITY_COL]],
+        individual_voronoi[[ID_COL, FRAME_COL, DENSITY_COL]],
+    )
+    assert shapely.equals_exact(
+        lazy_individual_voronoi[POLYGON_COL].values,
+        individual_voronoi[POLYGON_COL].values,
+        tolerance=0,
+    ).all()
+
+    pd.testing.assert_frame_equal(
+        compute_crossing_frames(
+            traj_data=lazy_traj_data, measurement_line=measurement_line
+        ),
+        compute_crossing_frames(
+            traj_data=traj_data, measurement_line=measurement_line
+        ),
+    )
+    frame_range, _ = compute_frame_range_in_area(
+        traj_data=traj_data, measurement_line=measurement_line, width=1.0
+    )
+    lazy_frame_range, _ = compute_frame_range_in_area(
+        traj_data=lazy_traj_data, measurement_line=measurement_line, width=1.0
+    )
+    assert not frame_range.empty
+    pd.testing.assert_frame_equal(lazy_frame_range, frame_range)
+    assert lazy_traj_data._points is None
@@ -0,0 +1,366 @@
+import numpy as np
+import pytest
+import shapely
+
+from pedpy.column_identifier import FRAME_COL
+from pedpy.data.geometry import WalkableArea
+from pedpy.methods.method_utils import compute_individual_voronoi_polygons
+from pedpy.methods.profile_calculator import (
+    GridIntersectionMethod,
+    ProfileAccumulator,
+    ProfileGrid,
+    SpeedMethod,
+    compute_profile_statistics,
+    compute_profiles,
+)
+from pedpy.methods.speed_calculator import (
+    SpeedCalculation,
+    compute_individual_speed,
+)
+from tests.utils.utils import get_trajectory_data
+
+
+@pytest.fixture(scope="module")
+def walkable_area():
+    return WalkableArea(shapely.box(-6, -4, 6, 4))
+
+
+@pytest.fixture(scope="module")
+def individual_voronoi_speed_data(walkable_area):
+    trajectory_data = get_trajectory_data(
+        grid_shape=[5, 4],
+        number_frames=15,
+        movement_direction=np.array([0.05, 0.01]),
+        start_position=np.array([-4, -2.5]),
+        ped_distance=1.3,
+    )
+    individual_voronoi = compute_individual_voronoi_polygons(
+        traj_data=trajectory_data, walkable_area=walkable_area
+    )
+    individual_speed = compute_individual_speed(
+        traj_data=trajectory_data,
+        frame_step=2,
+        speed_calculation=SpeedCalculation.BORDER_SINGLE_SIDED,
+    )
+    return individual_voronoi.merge(individual_speed, on=["id", "frame"])
+
+
+@pytest.mark.parametrize(
+    "speed_method", [SpeedMethod.VORONOI, SpeedMethod.ARITHMETIC]
+)
+@pytest.mark.parametrize("grid_size", [0.25, 0.4, 0.7])
+def test_compute_profiles_bounding_box_equals_exact(
+    individual_voronoi_speed_data, walkable_area, grid_size, speed_method
+):
+    expected_density, expected_speed = compute_profiles(
+        individual_voronoi_speed_data=individual_voronoi_speed_data,
+        walkable_area=walkable_area,
+        grid_size=grid_size,
+        speed_method=speed_method,
+    )
+    density, speed = compute_profiles(
+        individual_voronoi_speed_data=individual_voronoi_speed_data,
+        walkable_area=walkable_area,
+        grid_size=grid_size,
+        speed_method=speed_method,
+        grid_intersection_method=GridIntersectionMethod.BOUNDING_BOX,
+    )
+
+    assert len(density) == len(expected_density)
+    assert len(speed) == len(expected_speed)
+    for actual, expected in zip(density, expected_density):
+        assert actual.shape == expected.shape
+        assert np.allclose(actual, expected, rtol=0, atol=1e-12)
+    for actual, expected in zip(speed, expected_speed):
+        assert actual.shape == expected.shape
+        assert np.allclose(actual, expected, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("grid_size", [0.25, 0.4, 0.7])
+def test_compute_profiles_raster_within_tolerance(
+    individual_voronoi_speed_data, walkable_area, grid_size
+):
+    expected_density, expected_speed = compute_profiles(
+        individual_voronoi_speed_data=individual_voronoi_speed_data,
+        walkable_area=walkable_area,
+        grid_size=grid_size,
+        speed_method=SpeedMethod.VORONOI,
+    )
+    density, speed = compute_profiles(
+        individual_voronoi_speed_data=individual_voronoi_speed_data,
+        walkable_area=walkable_area,
+        grid_size=grid_size,
+        speed_method=SpeedMethod.VORONOI,
+        grid_intersection_method=GridIntersectionMethod.RASTER,
+    )
+
+    expected_density = np.array(expected_density)
+    density = np.array(density)
+    assert density.shape == expected_density.shape
+    assert np.abs(density - expected_density).mean() < (
+        0.01 * expected_density.max()
+    )
+    assert density.sum() == pytest.approx(expected_density.sum(), rel=0.01)
+
+    expected_speed = np.array(expected_speed)
+    speed = np.array(speed)
+    assert speed.shape == expected_speed.shape
+    assert np.abs(speed - expected_speed).mean() < 0.02 * expected_speed.max()
+
+
+def test_compute_profiles_raster_converges_to_exact(
+    individual_voronoi_speed_data, walkable_area
+):
+    expected_density, _ = compute_profiles(
+        individual_voronoi_speed_data=individual_voronoi_speed_data,
+        walkable_area=walkable_area,
+        grid_size=0.5,
+        speed_method=SpeedMethod.VORONOI,
+    )
+
+    errors = []
+    for supersampling in [1, 4, 16]:
+        density, _ = compute_profiles(
+            individual_voronoi_speed_data=individual_voronoi_speed_data,
+            walkable_area=walkable_area,
+            grid_size=0.5,
+            speed_method=SpeedMethod.VORONOI,
+            grid_intersection_method=GridIntersectionMethod.RASTER,
+            supersampling=supersampling,
+        )
+        errors.append(
+            np.abs(np.array(density) - np.array(expected_density)).mean()
+        )
+
+    assert errors[0] > errors[1] > errors[2]
+
+
+def test_compute_profiles_raster_arithmetic_speed(
+    individual_voronoi_speed_data, walkable_area
+):
+    _, expected_speed = compute_profiles(
+        individual_voronoi_speed_data=individual_voronoi_speed_data,
+        walkable_area=walkable_area,
+        grid_size=0.4,
+        speed_method=SpeedMethod.ARITHMETIC,
+    )
+    _, speed = compute_profiles(
+        individual_voronoi_speed_data=individual_voronoi_speed_data,
+        walkable_area=walkable_area,
+        grid_size=0.4,
+        speed_method=SpeedMethod.ARITHMETIC,
+        grid_intersection_method=GridIntersectionMethod.RASTER,
+    )
+
+    expected_speed = np.array(expected_speed)
+    speed = np.array(speed)
+    assert np.abs(speed - expected_speed).mean() < 0.05 * expected_speed.max()
+
+
+def test_compute_profiles_raster_invalid_supersampling(
+    individual_voronoi_speed_data, walkable_area
+):
+    with pytest.raises(ValueError, match="supersampling"):
+        compute_profiles(
+            individual_voronoi_speed_data=individual_voronoi_speed_data,
+            walkable_area=walkable_area,
+            grid_size=0.4,
+            speed_method=SpeedMethod.VORONOI,
+            grid_intersection_method=GridIntersectionMethod.RASTER,
+            supersampling=0,
+        )
+
+
+@pytest.mark.parametrize("frame_bin_size", [None, 1, 4, 6, 100])
+@pytest.mark.parametrize(
+    "speed_method", [SpeedMethod.VORONOI, SpeedMethod.ARITHMETIC]
+)
+def test_compute_profile_statistics_equals_profiles(
+    individual_voronoi_speed_data, walkable_area, frame_bin_size, speed_method
+):
+    frames = np.unique(individual_voronoi_speed_data[FRAME_COL])
+    density_profiles, speed_profiles = compute_profiles(
+        individual_voronoi_speed_data=individual_voronoi_speed_data,
+        walkable_area=walkable_area,
+        grid_size=0.5,
+        speed_method=speed_method,
+    )
+
+    density_statistics, speed_statistics = compute_profile_statistics(
+        individual_voronoi_speed_data=individual_voronoi_speed_data,
+        walkable_area=walkable_area,
+        grid_size=0.5,
+        speed_method=speed_method,
+        frame_bin_size=frame_bin_size,
+        track_min_max=True,
+    )
+
+    bin_size = len(frames) if frame_bin_size is None else frame_bin_size
+    bins = [
+        slice(start, start + bin_size)
+        for start in range(0, len(frames), bin_size)
+    ]
+    assert len(density_statistics) == len(bins)
+    assert len(speed_statistics) == len(bins)
+
+    for frame_bin, density, speed in zip(
+        bins, density_statistics, speed_statistics
+    ):
+        for statistics, profiles in [
+            (density, np.array(density_profiles[frame_bin])),
+            (speed, np.array(speed_profiles[frame_bin])),
+        ]:
+            assert statistics.first_frame == frames[frame_bin][0]
+            assert statistics.last_frame == frames[frame_bin][-1]
+            assert statistics.num_frames == len(profiles)
+            assert np.allclose(statistics.mean, profiles.mean(axis=0))
+            assert np.allclose(
+                statistics.variance, profiles.var(axis=0), atol=1e-10
+            )
+            assert np.array_equal(statistics.minimum, profiles.min(axis=0))
+            assert np.array_equal(statistics.maximum, profiles.max(axis=0))
+
+
+def test_profile_accumulator_without_min_max():
+    accumulator = ProfileAccumulator(shape=(2, 3))
+    profiles = np.arange(24, dtype=float).reshape(4, 2, 3) ** 2
+
+    for frame, profile in zip([7, 5, 6, 8], profiles):
+        accumulator.add(frame=frame, profile=profile)
+
+    statistics = accumulator.statistics()
+    assert accumulator.num_frames == 4
+    assert statistics.first_frame == 5
+    assert statistics.last_frame == 8
+    assert np.allclose(statistics.mean, profiles.mean(axis=0))
+    assert np.allclose(statistics.variance, profiles.var(axis=0))
+    assert statistics.minimum is None
+    assert statistics.maximum is None
+
+
+def test_profile_accumulator_wrong_shape():
+    accumulator = ProfileAccumulator(shape=(2, 3))
+
+    with pytest.raises(ValueError, match="shape"):
+        accumulator.add(frame=0, profile=np.zeros((3, 2)))
+
+
+def test_profile_accumulator_empty():
+    accumulator = ProfileAccumulator(shape=(2, 3))
+
+    with pytest.raises(ValueError, match="no profile"):
+        accumulator.statistics()
+
+
+def test_compute_profile_statistics_invalid_frame_bin_size(
+    individual_voronoi_speed_data, walkable_area
+):
+    with pytest.raises(ValueError, match="frame bin size"):
+        compute_profile_statistics(
+            individual_voronoi_speed_data=individual_voronoi_speed_data,
+            walkable_area=walkable_area,
+            grid_size=0.5,
+            speed_method=SpeedMethod.VORONOI,
+            frame_bin_size=0,
+        )
+
+
+@pytest.mark.parametrize("grid_size", [0.25, 0.4, 0.7])
+def test_profile_grid_cells(grid_size):
+    walkable_area = WalkableArea(
+        shapely.Polygon([(-6, -4), (6, -4), (6, 4), (0, 4), (0, 0), (-6, 0)])
+    )
+    profile_grid = ProfileGrid(walkable_area=walkable_area, grid_size=grid_size)
+
+    min_x, min_y, max_x, max_y = walkable_area.bounds
+    x_coords = np.arange(min_x, max_x + grid_size, grid_size)
+    y_coords = np.arange(max_y, min_y - grid_size, -grid_size)
+    expected_cells = [
+        shapely.box(x_coords[i], y_coords[j], x_coords[i + 1], y_coords[j + 1])
+        for j in range(len(y_coords) - 1)
+        for i in range(len(x_coords) - 1)
+    ]
+
+    assert profile_grid.shape == (len(y_coords) - 1, len(x_coords) - 1)
+    assert len(profile_grid.cells) == len(expected_cells)
+    assert all(
+        shapely.equals_exact(cell, expected_cell, tolerance=0)
+        for cell, expected_cell in zip(profile_grid.cells, expected_cells)
+    )
+    assert profile_grid.cell_area == pytest.approx(grid_size**2)
+
+    # the coverage is only computed on first access
+    assert "coverage" not in vars(profile_grid)
+    expected_coverage = [
+        shapely.area(shapely.intersection(cell, walkable_area.polygon))
+        / grid_size**2
+        for cell in expected_cells
+    ]
+    assert np.allclose(
+        profile_grid.coverage.ravel(), expected_coverage, rtol=0, atol=1e-12
+    )
+    assert np.sum(profile_grid.coverage) * grid_size**2 == pytest.approx(
+        walkable_area.area
+    )
+    assert profile_grid.coverage is profile_grid.coverage
+
+
+@pytest.mark.parametrize(
+    "grid_intersection_method",
+    [
+        GridIntersectionMethod.EXACT,
+        GridIntersectionMethod.BOUNDING_BOX,
+        GridIntersectionMethod.RASTER,
+    ],
+)
+def test_compute_profiles_with_profile_grid(
+    individual_voronoi_speed_data, walkable_area, grid_intersection_method
+):
+    profile_grid = ProfileGrid(walkable_area=walkable_area, grid_size=0.5)
+
+    expected_density, expected_speed = compute_profiles(
+        individual_voronoi_speed_data=individual_voronoi_speed_data,
+        walkable_area=walkable_area,
+        grid_size=0.5,
+        speed_method=SpeedMethod.VORONOI,
+        grid_intersection_method=grid_intersection_method,
+    )
+
+    for _ in range(2):
+        density, speed = compute_profiles(
+            individual_voronoi_speed_data=individual_voronoi_speed_data,
+            speed_method=SpeedMethod.VORONOI,
+            grid_intersection_method=grid_intersection_method,
+            profile_grid=profile_grid,
+        )
+        assert np.array_equal(density, expected_density)
+        assert np.array_equal(speed, expected_speed)
+
+
+def test_compute_profiles_with_profile_grid_and_walkable_area(
+    individual_voronoi_speed_data, walkable_area
+):
+    with pytest.raises(ValueError, match="not both"):
+        compute_profiles(
+            individual_voronoi_speed_data=individual_voronoi_speed_data,
+            walkable_area=walkable_area,
+            grid_size=0.5,
+            speed_method=SpeedMethod.VORONOI,
+            profile_grid=ProfileGrid(
+                walkable_area=walkable_area, grid_size=0.5
+            ),
+        )
+
+
+def test_compute_profiles_without_grid(individual_voronoi_speed_data):
+    with pytest.raises(ValueError, match="walkable area and a grid size"):
+        compute_profiles(
+            individual_voronoi_speed_data=individual_voronoi_speed_data,
+            grid_size=0.5,
+            speed_method=SpeedMethod.VORONOI,
+        )
+
+
+def test_profile_grid_invalid_grid_size(walkable_area):
+    with pytest.raises(ValueError, match="grid size"):
+        ProfileGrid(walkable_area=walkable_area, grid_size=0)
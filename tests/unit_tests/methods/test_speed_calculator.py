@@ -15,9 +15,10 @@ from pedpy.methods.speed_calculator import (
     SpeedError,
     compute_individual_speed,
     compute_mean_speed_per_frame,
+    compute_mean_speed_per_frame_multi,
     compute_voronoi_speed,
 )
-from tests.utils.utils import get_trajectory
+from tests.utils.utils import get_trajectory, get_trajectory_data
 
 
 def test_mean_speed_needs_same_length_speed_and_polygon_data():
@@ -91,3 +92,99 @@ def test_voronoi_speed_needs_same_length_speed_and_polygon_data():
             individual_voronoi_intersection=intersection,
             measurement_area=measurement_area,
         )
+
+
+def test_compute_mean_speed_per_frame_multi_equals_single_areas():
+    trajectory_data = get_trajectory_data(
+        grid_shape=[4, 5],
+        number_frames=60,
+        movement_direction=np.array([0.2, 0.01]),
+        start_position=np.array([-8, -2]),
+        ped_distance=1.0,
+    )
+    measurement_areas = [
+        MeasurementArea([(-2, -1), (2, -1), (2, 1), (-2, 1)]),
+        MeasurementArea([(0, -3), (3, -3), (3, 3), (0, 3)]),
+        MeasurementArea([(-6, -4), (-1, 0), (-6, 4)]),
+        MeasurementArea([(20, 20), (21, 20), (21, 21), (20, 21)]),
+    ]
+    speed = compute_individual_speed(
+        traj_data=trajectory_data,
+        frame_step=5,
+        speed_calculation=SpeedCalculation.BORDER_SINGLE_SIDED,
+    )
+
+    mean_speed = compute_mean_speed_per_frame_multi(
+        traj_data=trajectory_data,
+        individual_speed=speed,
+        measurement_areas=measurement_areas,
+    )
+
+    assert mean_speed.index.names == [AREA_COL, FRAME_COL]
+    for area, measurement_area in enumerate(measurement_areas):
+        pd.testing.assert_series_equal(
+            mean_speed.loc[area],
+            compute_mean_speed_per_frame(
+                traj_data=trajectory_data,
+                individual_speed=speed,
+                measurement_area=measurement_area,
+            ),
+        )
+
+    with pytest.raises(SpeedError, match=".*mean speed.*"):
+        compute_mean_speed_per_frame_multi(
+            traj_data=trajectory_data,
+            individual_speed=speed.iloc[1:],
+            measurement_areas=measurement_areas,
+        )
+    with pytest.raises(ValueError, match="measurement area"):
+        compute_mean_speed_per_frame_multi(
+            traj_data=trajectory_data,
+            individual_speed=speed,
+            measurement_areas=[],
+        )
+
+
+def test_compute_speed_lazy_points():
+    traj_data = get_trajectory_data(
+        grid_shape=[5, 5],
+        number_frames=50,
+        start_position=np.array([-3, -2]),
+        movement_direction=np.array([0.1, 0.02]),
+        ped_distance=0.5,
+    )
+    lazy_traj_data = TrajectoryData(
+        data=traj_data.data,
+        frame_rate=traj_data.frame_rate,
+        lazy_points=True,
+    )
+    measurement_area = MeasurementArea([(-1, -1), (-1, 1), (1, 1), (1, -1)])
+
+    for speed_calculation in list(SpeedCalculation):
+        individual_speed = compute_individual_speed(
+            traj_data=traj_data,
+            frame_step=5,
+            compute_velocity=True,
+            speed_calculation=speed_calculation,
+        )
+        lazy_individual_speed = compute_individual_speed(
+            traj_data=lazy_traj_data,
+            frame_step=5,
+            compute_velocity=True,
+            speed_calculation=speed_calculation,
+        )
+        pd.testing.assert_frame_equal(lazy_individual_speed, individual_speed)
+
+    pd.testing.assert_series_equal(
+        compute_mean_speed_per_frame(
+            traj_data=lazy_traj_data,
+            individual_speed=lazy_individual_speed,
+            measurement_area=measurement_area,
+        ),
+        compute_mean_speed_per_frame(
+            traj_data=traj_data,
+            individual_speed=individual_speed,
+            measurement_area=measurement_area,
+        ),
+    )
+    assert lazy_traj_data._points is None
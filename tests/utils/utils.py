@@ -7,8 +7,8 @@ import pandas as pd
 import shapely
 
 from helper.create_trajectories import get_grid_trajectory
-from pedpy.column_identifier import X_COL, Y_COL
-from pedpy.data.trajectory_data import TrajectoryData
+from pedpy.column_identifier import FRAME_COL, ID_COL, X_COL, Y_COL
+from pedpy.data.trajectory_data import TrajectoryChunk, TrajectoryData
 
 
 def get_trajectory(
@@ -51,3 +51,34 @@ def get_trajectory_data(
     )
     grid = grid.rename(columns={"FR": "frame"})
     return TrajectoryData(data=grid, frame_rate=fps)
+
+
+def get_trajectory_chunks(
+    *,
+    traj_data: TrajectoryData,
+    frames_per_chunk: int,
+    overlap_frames: int,
+) -> List[TrajectoryChunk]:
+    data = traj_data.data[[ID_COL, FRAME_COL, X_COL, Y_COL]]
+    first_frame = data.frame.min()
+    last_frame = data.frame.max()
+
+    chunks = []
+    for chunk_start in range(first_frame, last_frame + 1, frames_per_chunk):
+        chunk_end = min(chunk_start + frames_per_chunk - 1, last_frame)
+        chunks.append(
+            TrajectoryChunk(
+                traj_data=TrajectoryData(
+                    data=data[
+                        data.frame.between(
+                            chunk_start - overlap_frames,
+                            chunk_end + overlap_frames,
+                        )
+                    ],
+                    frame_rate=traj_data.frame_rate,
+                ),
+                first_frame=chunk_start,
+                last_frame=chunk_end,
+            )
+        )
+    return chunks